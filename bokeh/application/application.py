@@ -152,6 +152,12 @@ class Application(object):
         if settings.perform_document_validation():
             doc.validate()
 
+    def initialize_session_document(self, doc):
+        ''' Fills in the session-specific parts of a copy of a document
+        created by ``create_document``, using the Application's handlers. '''
+        for h in self._handlers:
+            h.modify_session_document(doc)
+
     def add(self, handler):
         ''' Add a handler to the pipeline used to initialize new documents.
 
@@ -7,6 +7,7 @@ import os
 import sys
 
 from bokeh.io import set_curdoc, curdoc
+from bokeh.util.callback_manager import _check_callback
 
 from .code_runner import _CodeRunner
 from .handler import Handler
@@ -14,6 +15,10 @@ from .handler import Handler
 class CodeHandler(Handler):
     """ Run source code which modifies a Document
 
+    When the server uses one document as a template for all sessions, the
+    code is only run once, and an ``on_session_document(doc)`` function it
+    defines (if any) is called with each session's copy of the document.
+
     Args:
         source (str) : python source code
         filename (str) : a filename to use in any debugging or error output
@@ -37,6 +42,8 @@ class CodeHandler(Handler):
 
         self._runner = _CodeRunner(source, filename, argv)
 
+        self._on_session_document = None
+
         self._loggers = {}
         for f in CodeHandler._io_functions:
             self._loggers[f] = self._make_io_logger(f)
@@ -72,11 +79,26 @@ class CodeHandler(Handler):
                 # script is supposed to edit the doc not replace it
                 if newdoc is not doc:
                     raise RuntimeError("%s at '%s' replaced the output document" % (self._origin, self._runner.path))
+                on_session_document = module.__dict__.get('on_session_document')
+                if on_session_document is not None:
+                    _check_callback(on_session_document, ('doc',), what="on_session_document")
+                self._on_session_document = on_session_document
             self._runner.run(module, post_check)
         finally:
             self._unmonkeypatch_io(old_io)
             set_curdoc(old_doc)
 
+    def modify_session_document(self, doc):
+        if self.failed or self._on_session_document is None:
+            return
+
+        old_doc = curdoc()
+        set_curdoc(doc)
+        try:
+            self._on_session_document(doc)
+        finally:
+            set_curdoc(old_doc)
+
     # subclassess must define self._logger_text
     def _make_io_logger(self, name):
         def logger(*args, **kwargs):
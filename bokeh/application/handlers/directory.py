@@ -82,6 +82,9 @@ class DirectoryHandler(Handler):
         # This internal handler should never add a template
         self._main_handler.modify_document(doc)
 
+    def modify_session_document(self, doc):
+        self._main_handler.modify_session_document(doc)
+
     @property
     def failed(self):
         return self._main_handler.failed or self._lifecycle_handler.failed
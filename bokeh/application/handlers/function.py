@@ -4,18 +4,33 @@ from .handler import Handler
 from bokeh.util.callback_manager import _check_callback
 
 class FunctionHandler(Handler):
-    """ Run a function which modifies a Document """
+    """ Run a function which modifies a Document
 
-    def __init__(self, func):
+    Args:
+        func (callable) : a function which modifies a Document
+        session_func (callable, optional) :
+            a function which modifies each session's copy of the Document,
+            when the server uses one document as a template for all sessions
+
+    """
+
+    def __init__(self, func, session_func=None):
         super(FunctionHandler, self).__init__()
         _check_callback(func, ('doc',))
+        if session_func is not None:
+            _check_callback(session_func, ('doc',))
         self._func = func
+        self._session_func = session_func
         self._safe_to_fork = True
 
     def modify_document(self, doc):
         self._func(doc)
         self._safe_to_fork = False
 
+    def modify_session_document(self, doc):
+        if self._session_func is not None:
+            self._session_func(doc)
+
     @property
     def safe_to_fork(self):
         return self._safe_to_fork
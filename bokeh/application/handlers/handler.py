@@ -24,6 +24,16 @@ class Handler(object):
         """Modifies the application document however the spelling specifies."""
         pass
 
+    def modify_session_document(self, doc):
+        """Modifies each session's copy of the application document, when
+        the server uses one document as a template for all sessions.
+
+        Only session-specific setup, such as adding Python callbacks, should
+        be done here. The template document has already been built by
+        ``modify_document``.
+        """
+        pass
+
     @property
     def failed(self):
         """True if the handler failed to modify the doc"""
@@ -100,3 +100,35 @@ class TestCodeHandler(unittest.TestCase):
         if handler.failed:
             raise RuntimeError(handler.error)
         assert not handler.safe_to_fork
+
+    def test_script_on_session_document(self):
+        doc = Document()
+        handler = CodeHandler(source="""
+from bokeh.io import curdoc
+curdoc().title = "Template"
+
+def on_session_document(doc):
+    doc.title = "Session of %s" % curdoc().title
+""", filename="path/to/test_filename")
+        handler.modify_document(doc)
+        if handler.failed:
+            raise RuntimeError(handler.error)
+        assert doc.title == "Template"
+
+        handler.modify_session_document(doc)
+        assert doc.title == "Session of Template"
+
+    def test_script_bad_on_session_document(self):
+        doc = Document()
+        handler = CodeHandler(source="def on_session_document(): pass", filename="path/to/test_filename")
+        handler.modify_document(doc)
+
+        assert handler.failed
+        assert "on_session_document must have signature func(doc)" in handler.error
+
+    def test_script_without_on_session_document(self):
+        doc = Document()
+        handler = CodeHandler(source="# This script does nothing", filename="path/to/test_filename")
+        handler.modify_document(doc)
+        handler.modify_session_document(doc)
+        assert not doc.roots
@@ -71,6 +71,28 @@ class TestDirectoryHandler(unittest.TestCase):
 
         assert len(doc.roots) == 2
 
+    def test_directory_on_session_document(self):
+        doc = Document()
+        def load(filename):
+            handler = DirectoryHandler(filename=filename)
+            handler.modify_document(doc)
+            if handler.failed:
+                raise RuntimeError(handler.error)
+            assert doc.title == "Template"
+            handler.modify_session_document(doc)
+
+        with_directory_contents({
+            'main.py' : """
+from bokeh.io import curdoc
+curdoc().title = "Template"
+
+def on_session_document(doc):
+    doc.title = "Session of %s" % curdoc().title
+"""
+        }, load)
+
+        assert doc.title == "Session of Template"
+
     def test_directory_has_theme_file(self):
         doc = Document()
         def load(filename):
@@ -17,14 +17,16 @@ from tornado.concurrent import Future
 from bokeh.server.exceptions import MessageError, ProtocolError, ValidationError
 from bokeh.server.protocol.receiver import Receiver
 from bokeh.server.protocol import Protocol
+from bokeh.util.tornado import write_websocket_message
 
 class _WebSocketClientConnectionWrapper(object):
     ''' Used for compat across Tornado versions and to add write_lock'''
 
-    def __init__(self, socket):
+    def __init__(self, socket, compression_min_bytes=0):
         if socket is None:
             raise ValueError("socket must not be None")
         self._socket = socket
+        self._compression_min_bytes = compression_min_bytes
         # write_lock allows us to lock the connection to send multiple
         # messages atomically.
         self.write_lock = locks.Lock()
@@ -41,7 +43,8 @@ class _WebSocketClientConnectionWrapper(object):
                 # is closed.
                 raise WebSocketError("Connection to the server has been closed")
 
-            future = self._socket.write_message(message, binary)
+            future = write_websocket_message(self._socket.protocol, message, binary,
+                                             self._compression_min_bytes)
             if future is None:
                 # tornado >= 4.3 gives us a Future, simulate that
                 # with this fake Future on < 4.3
@@ -105,11 +108,19 @@ class ClientConnection(object):
             else:
                 yield connection._next()
 
-    def __init__(self, session, websocket_url, io_loop=None):
+    def __init__(self, session, websocket_url, io_loop=None, websocket_compression=False,
+                 websocket_compression_min_bytes=1024):
         '''
           Opens a websocket connection to the server.
+
+          If websocket_compression is True, per-message compression is
+          offered to the server, and used if the server has it enabled.
+          Messages shorter than websocket_compression_min_bytes are always
+          sent uncompressed.
         '''
         self._url = websocket_url
+        self._websocket_compression = websocket_compression
+        self._websocket_compression_min_bytes = websocket_compression_min_bytes
         self._session = session
         self._protocol = Protocol("1.0")
         self._receiver = Receiver(self._protocol)
@@ -317,9 +328,10 @@ class ClientConnection(object):
     def _connect_async(self):
         versioned_url = "%s?bokeh-protocol-version=1.0&bokeh-session-id=%s" % (self._url, self._session.id)
         request = HTTPRequest(versioned_url)
+        compression_options = {} if self._websocket_compression else None
         try:
-            socket = yield websocket_connect(request)
-            self._socket = _WebSocketClientConnectionWrapper(socket)
+            socket = yield websocket_connect(request, compression_options=compression_options)
+            self._socket = _WebSocketClientConnectionWrapper(socket, self._websocket_compression_min_bytes)
         except Exception as e:
             log.info("Failed to connect to server: %r", e)
 
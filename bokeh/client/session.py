@@ -38,7 +38,7 @@ def server_url_for_websocket_url(url):
 
 DEFAULT_SERVER_WEBSOCKET_URL = websocket_url_for_server_url(DEFAULT_SERVER_HTTP_URL)
 
-def push_session(document, session_id=None, url='default', app_path=None, io_loop=None):
+def push_session(document, session_id=None, url='default', app_path=None, io_loop=None, websocket_compression=False):
     ''' Create a session by pushing the given document to the server,
     overwriting any existing server-side document.
 
@@ -72,6 +72,10 @@ def push_session(document, session_id=None, url='default', app_path=None, io_loo
         io_loop : (tornado.ioloop.IOLoop, optional)
             The IOLoop to use for the websocket
 
+        websocket_compression : (bool, optional)
+            Whether to use per-message websocket compression, if the server
+            has it enabled (default: False)
+
     Returns:
         ClientSession
             A new ClientSession connected to the server
@@ -82,11 +86,12 @@ def push_session(document, session_id=None, url='default', app_path=None, io_loo
         url = url + app_path
 
     coords = _SessionCoordinates(session_id=session_id, url=url)
-    session = ClientSession(session_id=coords.session_id, websocket_url=websocket_url_for_server_url(coords.url), io_loop=io_loop)
+    session = ClientSession(session_id=coords.session_id, websocket_url=websocket_url_for_server_url(coords.url), io_loop=io_loop,
+                            websocket_compression=websocket_compression)
     session.push(document)
     return session
 
-def pull_session(session_id=None, url='default', app_path=None, io_loop=None):
+def pull_session(session_id=None, url='default', app_path=None, io_loop=None, websocket_compression=False):
     ''' Create a session by loading the current server-side document.
 
     ``session.document`` will be a fresh document loaded from
@@ -125,6 +130,11 @@ def pull_session(session_id=None, url='default', app_path=None, io_loop=None):
 
         io_loop (``tornado.ioloop.IOLoop``, optional) :
             The IOLoop to use for the websocket
+
+        websocket_compression (bool, optional) :
+            Whether to use per-message websocket compression, if the server
+            has it enabled (default: False)
+
     Returns:
         ClientSession :
             A new ClientSession connected to the server
@@ -135,7 +145,8 @@ def pull_session(session_id=None, url='default', app_path=None, io_loop=None):
         url = url + app_path
 
     coords = _SessionCoordinates(session_id=session_id, url=url)
-    session = ClientSession(session_id=session_id, websocket_url=websocket_url_for_server_url(coords.url), io_loop=io_loop)
+    session = ClientSession(session_id=session_id, websocket_url=websocket_url_for_server_url(coords.url), io_loop=io_loop,
+                            websocket_compression=websocket_compression)
     session.pull()
     return session
 
@@ -210,7 +221,7 @@ class ClientSession(object):
 
     '''
 
-    def __init__(self, session_id=None, websocket_url=DEFAULT_SERVER_WEBSOCKET_URL, io_loop=None):
+    def __init__(self, session_id=None, websocket_url=DEFAULT_SERVER_WEBSOCKET_URL, io_loop=None, websocket_compression=False):
         '''
         A connection which attaches to a particular named session on the server.
 
@@ -230,12 +241,17 @@ class ClientSession(object):
 
             io_loop (``tornado.ioloop.IOLoop``, optional) :
                 The IOLoop to use for the websocket
+
+            websocket_compression (bool, optional) :
+                Whether to use per-message websocket compression, if the
+                server has it enabled (default: False)
         '''
         self._document = None
         self._id = self._ensure_session_id(session_id)
 
         from ._connection import ClientConnection
-        self._connection = ClientConnection(session=self, io_loop=io_loop, websocket_url=websocket_url)
+        self._connection = ClientConnection(session=self, io_loop=io_loop, websocket_url=websocket_url,
+                                            websocket_compression=websocket_compression)
 
         from ..server.callbacks import _DocumentCallbackGroup
         self._callbacks = _DocumentCallbackGroup(self._connection.io_loop)
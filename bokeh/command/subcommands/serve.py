@@ -153,6 +153,79 @@ To control how often statistic logs are written, set the
 The value is specified in milliseconds. The default interval for
 logging stats is 15 seconds. Only positive integer values are accepted.
 
+Changes that an application makes to a document are collected and sent to
+the browser together, once the callback that made them has finished. To
+collect changes for longer, and send them at most once per interval, set
+the ``--patch-interval`` option:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --patch-interval 50
+
+The value is specified in milliseconds. The default of 0 sends the changes
+as soon as each callback has finished. To send changes as soon as a given
+number of them have been collected, set the ``--patch-max-events`` option.
+
+Browsers send UI events, such as ``mousemove`` or ``pan``, and changes to
+model attributes, such as the ``start`` and ``end`` of a range, as often as
+the user interacts with a plot. When the Python callbacks they trigger are
+slower than that, the messages queue up. To apply only the latest of the
+queued messages for given events or model attributes, and drop the older
+ones, set the ``--coalesce`` option:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --coalesce mousemove pan Range1d.start Range1d.end
+
+Event names are those of the classes in ``bokeh.events``, and attributes are
+given as ``ModelType.attribute``. Messages are never reordered with respect
+to any other messages.
+
+Normally the application code is run again for every new session. For
+applications which build large documents, this can be slow. To run the
+application code only once, and give every session a copy of the document
+it created, set the ``--session-template`` option:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --session-template
+
+Only the document itself is copied. Python callbacks that an application
+adds to its models or document are not copied, so in this mode they should
+be added in a function ``on_session_document(doc)`` defined by the app
+script, which is called with each session's copy of the document.
+
+Messages between the Bokeh server and browsers are not compressed by
+default. Documents with a lot of data can be sent much faster over slow
+connections by enabling per-message websocket compression, with the
+``--websocket-compression-level`` option:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --websocket-compression-level 6
+
+The value is a zlib compression level from 1 (fastest) to 9 (smallest).
+Small messages, such as acknowledgements, are not worth compressing, and are
+sent uncompressed. The size below which messages are sent uncompressed can
+be set with the ``--websocket-compression-min-bytes`` option. It defaults
+to 1024 bytes.
+
+Timing and size metrics of the server, such as the time spent handling each
+type of message, can be served in the `Prometheus`_ text format by setting a
+path for them with the ``--metrics-path`` option:
+
+.. code-block:: sh
+
+    bokeh serve app_script.py --metrics-path /metrics
+
+The metrics are not served by default. They are served without any
+authentication, so the path should only be reachable from trusted networks,
+e.g. by blocking it in a reverse proxy. The path must not be used by an
+application (e.g. an app script named ``metrics.py`` is served at
+``/metrics``), otherwise the server does not start.
+
+.. _Prometheus: https://prometheus.io/docs/instrumenting/exposition_formats/
+
 To have the Bokeh server override the remote IP and URI scheme/protocol for
 all requests with ``X-Real-Ip``, ``X-Forwarded-For``, ``X-Scheme``,
 ``X-Forwarded-Proto``  headers (if they are provided), set the
@@ -436,6 +509,54 @@ class Serve(Subcommand):
             default=None,
         )),
 
+        ('--patch-interval', dict(
+            metavar='MILLISECONDS',
+            type=int,
+            help="How long to collect document changes for before sending them to clients",
+            default=None,
+        )),
+
+        ('--patch-max-events', dict(
+            metavar='N',
+            type=int,
+            help="How many document changes to collect before sending them to clients, 0 for no limit",
+            default=None,
+        )),
+
+        ('--coalesce', dict(
+            metavar='NAME',
+            nargs='+',
+            type=str,
+            help="UI events and model attributes (ModelType.attribute) for which only the latest received message is applied",
+            default=None,
+        )),
+
+        ('--session-template', dict(
+            action='store_true',
+            help="Run the application code once and give each session a copy of its document",
+        )),
+
+        ('--websocket-compression-level', dict(
+            metavar='LEVEL',
+            type=int,
+            help="zlib level (1-9) to compress websocket messages with, 0 to disable compression",
+            default=None,
+        )),
+
+        ('--websocket-compression-min-bytes', dict(
+            metavar='BYTES',
+            type=int,
+            help="Size below which websocket messages are not compressed",
+            default=None,
+        )),
+
+        ('--metrics-path', dict(
+            metavar='PATH',
+            type=str,
+            help="Path at which to serve the server metrics in the Prometheus text format (default: not served)",
+            default=None,
+        )),
+
         ('--use-xheaders', dict(
             action='store_true',
             help="Prefer X-headers for IP/protocol information",
@@ -507,6 +628,11 @@ class Serve(Subcommand):
             # rename to be compatible with Server
             args.stats_log_frequency_milliseconds = args.stats_log_frequency
 
+        if args.patch_interval is not None:
+            log.info("Send document changes at most every %d milliseconds", args.patch_interval)
+            # rename to be compatible with Server
+            args.patch_interval_milliseconds = args.patch_interval
+
         server_kwargs = { key: getattr(args, key) for key in ['port',
                                                               'address',
                                                               'allow_websocket_origin',
@@ -516,6 +642,13 @@ class Serve(Subcommand):
                                                               'check_unused_sessions_milliseconds',
                                                               'unused_session_lifetime_milliseconds',
                                                               'stats_log_frequency_milliseconds',
+                                                              'patch_interval_milliseconds',
+                                                              'patch_max_events',
+                                                              'session_template',
+                                                              'coalesce',
+                                                              'websocket_compression_level',
+                                                              'websocket_compression_min_bytes',
+                                                              'metrics_path',
                                                               'use_xheaders',
                                                             ]
                           if getattr(args, key, None) is not None }
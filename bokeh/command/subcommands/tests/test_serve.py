@@ -132,6 +132,54 @@ def test_args():
             default=None,
         )),
 
+        ('--patch-interval', dict(
+            metavar='MILLISECONDS',
+            type=int,
+            help="How long to collect document changes for before sending them to clients",
+            default=None,
+        )),
+
+        ('--patch-max-events', dict(
+            metavar='N',
+            type=int,
+            help="How many document changes to collect before sending them to clients, 0 for no limit",
+            default=None,
+        )),
+
+        ('--coalesce', dict(
+            metavar='NAME',
+            nargs='+',
+            type=str,
+            help="UI events and model attributes (ModelType.attribute) for which only the latest received message is applied",
+            default=None,
+        )),
+
+        ('--session-template', dict(
+            action='store_true',
+            help="Run the application code once and give each session a copy of its document",
+        )),
+
+        ('--websocket-compression-level', dict(
+            metavar='LEVEL',
+            type=int,
+            help="zlib level (1-9) to compress websocket messages with, 0 to disable compression",
+            default=None,
+        )),
+
+        ('--websocket-compression-min-bytes', dict(
+            metavar='BYTES',
+            type=int,
+            help="Size below which websocket messages are not compressed",
+            default=None,
+        )),
+
+        ('--metrics-path', dict(
+            metavar='PATH',
+            type=str,
+            help="Path at which to serve the server metrics in the Prometheus text format (default: not served)",
+            default=None,
+        )),
+
         ('--use-xheaders', dict(
             action='store_true',
             help="Prefer X-headers for IP/protocol information",
@@ -487,7 +487,7 @@ class HasProps(with_metaclass(MetaHasProps, object)):
         '''
         return accumulate_dict_from_superclasses(cls, "__dataspecs__")
 
-    def properties_with_values(self, include_defaults=True):
+    def properties_with_values(self, include_defaults=True, buffers=None):
         ''' Collect a dict mapping property names to their values.
 
         This method *always* traverses the class hierarchy and includes
@@ -504,11 +504,16 @@ class HasProps(with_metaclass(MetaHasProps, object)):
                 Whether to include properties that haven't been explicitly set
                 since the object was created. (default: True)
 
+            buffers (list, optional) :
+                If binary buffers are desired, a list may be provided, and
+                any array data that may be sent as binary buffers will be
+                added to it (default: None)
+
         Returns:
            dict : mapping from property names to their values
 
         '''
-        return self.query_properties_with_values(lambda prop: prop.serialized, include_defaults)
+        return self.query_properties_with_values(lambda prop: prop.serialized, include_defaults, buffers=buffers)
 
     @classmethod
     def _overridden_defaults(cls):
@@ -519,7 +524,7 @@ class HasProps(with_metaclass(MetaHasProps, object)):
         '''
         return accumulate_dict_from_superclasses(cls, "__overridden_defaults__")
 
-    def query_properties_with_values(self, query, include_defaults=True):
+    def query_properties_with_values(self, query, include_defaults=True, buffers=None):
         ''' Query the properties values of |HasProps| instances with a
         predicate.
 
@@ -532,6 +537,11 @@ class HasProps(with_metaclass(MetaHasProps, object)):
                 Whether to include properties that have not been explicitly
                 set by a user (default: True)
 
+            buffers (list, optional) :
+                If binary buffers are desired, a list may be provided, and
+                any array data that may be sent as binary buffers will be
+                added to it (default: None)
+
         Returns:
             dict : mapping of property names and values for matching properties
 
@@ -555,7 +565,7 @@ class HasProps(with_metaclass(MetaHasProps, object)):
             if not query(descriptor):
                 continue
 
-            value = descriptor.serializable_value(self)
+            value = descriptor.serializable_value(self, buffers=buffers)
             if not include_defaults and key not in themed_keys:
                 if isinstance(value, PropertyValueContainer) and key in self._unstable_default_values:
                     continue
@@ -573,15 +583,17 @@ class HasProps(with_metaclass(MetaHasProps, object)):
             dict or None
 
         '''
-        return getattr(self, '__themed_values__', None)
+        return getattr(self, '__themed_values__', None) or None
 
     def apply_theme(self, property_values):
         ''' Apply a set of theme values which will be used rather than
         defaults, but will not override application-set values.
 
-        The passed-in dictionary may be kept around as-is and shared with
-        other instances to save memory (so neither the caller nor the
-        |HasProps| instance should modify it).
+        The passed-in dictionary is kept around as-is and may be shared with
+        other instances to save memory, so the |HasProps| instance should
+        not modify it. The caller may update it in place later, to change
+        the themed values of all the instances sharing it at once, but is
+        then responsible for any change notifications.
 
         Args:
             property_values (dict) : theme values to use in place of defaults
@@ -590,15 +602,13 @@ class HasProps(with_metaclass(MetaHasProps, object)):
             None
 
         '''
-        old_dict = self.themed_values()
+        old_dict = getattr(self, '__themed_values__', None)
 
         # if the same theme is set again, it should reuse the same dict
         if old_dict is property_values:
             return
 
         removed = set()
-        # we're doing a little song-and-dance to avoid storing __themed_values__ or
-        # an empty dict, if there's no theme that applies to this HasProps instance.
         if old_dict is not None:
             removed.update(set(old_dict.keys()))
         added = set(property_values.keys())
@@ -606,10 +616,9 @@ class HasProps(with_metaclass(MetaHasProps, object)):
         for k in added.union(removed):
             old_values[k] = getattr(self, k)
 
-        if len(property_values) > 0:
-            setattr(self, '__themed_values__', property_values)
-        elif hasattr(self, '__themed_values__'):
-            delattr(self, '__themed_values__')
+        # the dict is stored even if it is empty, because it may be updated
+        # in place later (see Document.theme)
+        setattr(self, '__themed_values__', property_values)
 
         # Property container values might be cached even if unmodified. Invalidate
         # any cached values that are not modified at this point.
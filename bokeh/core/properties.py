@@ -106,7 +106,7 @@ from six import string_types, iteritems
 
 from ..colors import RGB
 from ..util.dependencies import import_optional
-from ..util.serialization import convert_datetime_type, decode_base64_dict, transform_column_source_data
+from ..util.serialization import convert_datetime_type, decode_base64_dict, decode_ragged_dict, transform_column_source_data
 from ..util.string import nice_join, format_docstring
 
 from .property.bases import ContainerProperty, DeserializationError, ParameterizedProperty, Property, PrimitiveProperty
@@ -1137,6 +1137,12 @@ class TimeDelta(Property):
 # Container properties
 #------------------------------------------------------------------------------
 
+# NumPy dtype kinds of arrays whose items are all valid values of a property
+_array_item_kinds = {
+    Int   : 'iu',
+    Float : 'iuf',
+}
+
 class Seq(ContainerProperty):
     ''' Accept non-string ordered sequences of values, e.g. list, tuple, array.
 
@@ -1157,6 +1163,9 @@ class Seq(ContainerProperty):
         if json is None:
             return None
         elif isinstance(json, list):
+            if type(self.item_type) is Any:
+                # items would be returned unchanged
+                return self._new_instance(json)
             return self._new_instance([ self.item_type.from_json(item, models) for item in json ])
         else:
             raise DeserializationError("%s expected a list or None, got %s" % (self, json))
@@ -1165,6 +1174,8 @@ class Seq(ContainerProperty):
         super(Seq, self).validate(value)
 
         if value is not None:
+            if self._is_seq(value) and self._has_valid_items(value):
+                return
             if not (self._is_seq(value) and all(self.item_type.is_valid(item) for item in value)):
                 if self._is_seq(value):
                     invalid = []
@@ -1175,6 +1186,17 @@ class Seq(ContainerProperty):
                 else:
                     raise ValueError("expected an element of %s, got %r" % (self, value))
 
+    def _has_valid_items(self, value):
+        # Whether all items are known to be valid without checking each of
+        # them, e.g. for large NumPy arrays. If False, they have to be checked.
+        item_type = type(self.item_type)
+        if item_type is Any:
+            return True
+        if item_type in _array_item_kinds:
+            import numpy as np
+            return isinstance(value, np.ndarray) and value.dtype.kind in _array_item_kinds[item_type]
+        return False
+
     @classmethod
     def _is_seq(cls, value):
         return ((isinstance(value, collections.Sequence) or cls._is_seq_like(value)) and
@@ -1274,6 +1296,7 @@ class ColumnData(Dict):
     def from_json(self, json, models=None):
         ''' Decodes column source data encoded as lists or base64 strings.
         '''
+        import numpy as np
         if json is None:
             return None
         elif not isinstance(json, dict):
@@ -1283,22 +1306,52 @@ class ColumnData(Dict):
             key = self.keys_type.from_json(key, models)
             if isinstance(value, dict) and '__ndarray__' in value:
                 new_data[key] = decode_base64_dict(value)
-            elif isinstance(value, list) and any(isinstance(el, dict) and '__ndarray__' in el for el in value):
-                new_list = []
-                for el in value:
-                    if isinstance(el, dict) and '__ndarray__' in el:
-                        el = decode_base64_dict(el)
-                    elif isinstance(el, list):
-                        el = self.values_type.from_json(el)
-                    new_list.append(el)
-                new_data[key] = new_list
+            elif isinstance(value, dict) and '__ragged__' in value:
+                new_data[key] = decode_ragged_dict(value)
+            elif isinstance(value, np.ndarray):
+                # binary buffers are decoded to arrays when a message is assembled
+                new_data[key] = value
+            elif isinstance(value, list) and self._has_arrays(value):
+                new_data[key] = self._decode_arrays(value)
             else:
                 new_data[key] = self.values_type.from_json(value, models)
         return new_data
 
+    def _has_arrays(self, value):
+        import numpy as np
+        for el in value:
+            if isinstance(el, np.ndarray) or (isinstance(el, dict) and '__ndarray__' in el):
+                return True
+            if isinstance(el, list) and len(el) > 0 and self._has_arrays(el):
+                return True
+        return False
+
+    def _decode_arrays(self, value):
+        # encoded arrays may be nested in lists at any depth
+        new_list = []
+        for el in value:
+            if isinstance(el, dict) and '__ndarray__' in el:
+                el = decode_base64_dict(el)
+            elif isinstance(el, list):
+                if self._has_arrays(el):
+                    el = self._decode_arrays(el)
+                else:
+                    el = self.values_type.from_json(el)
+            new_list.append(el)
+        return new_list
+
+    def changed_columns(self, new, old):
+        ''' Return the names of the columns of ``new`` that are not in
+        ``old``, or do not match the column of the same name in ``old``.
+
+        Columns that are the same object in both are not compared.
+
+        '''
+        return [name for name in new
+                if name not in old or not (new[name] is old[name] or self.matches(new[name], old[name]))]
 
-    def serialize_value(self, value):
-        return transform_column_source_data(value)
+    def serialize_value(self, value, buffers=None):
+        return transform_column_source_data(value, buffers=buffers)
 
 class Tuple(ContainerProperty):
     ''' Accept Python tuple values.
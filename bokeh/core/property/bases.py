@@ -211,9 +211,17 @@ class Property(PropertyDescriptorFactory):
         '''
         return json
 
-    def serialize_value(self, value):
+    def serialize_value(self, value, buffers=None):
         ''' Change the value into a JSON serializable format.
 
+        Args:
+            value (obj) : the value to serialize
+
+            buffers (list, optional) :
+                If binary buffers are desired, a list may be provided, and
+                properties that can encode values as binary buffers may add
+                them to it (default: None)
+
         '''
         return value
 
@@ -324,15 +324,31 @@ class PropertyValueDict(PropertyValueContainer, dict):
         # For arrays is reports the actual old value. For lists, the old value
         # is actually the already updated value. This is because the method
         # self._saved_copy() makes a shallow copy.
+        from ...util.datatypes import RingBuffer
+
+        # all the new values are converted before any column is changed, so
+        # that a column that fails (e.g. with values of the wrong dtype)
+        # does not leave the other columns extended
+        updates = []
         for k, v in new_data.items():
-            if isinstance(self[k], np.ndarray):
-                data = np.append(self[k], new_data[k])
+            if isinstance(self[k], RingBuffer):
+                updates.append((k, np.asarray(v, dtype=self[k].dtype)))
+            elif isinstance(self[k], np.ndarray):
+                data = np.append(self[k], v)
                 if rollover and len(data) > rollover:
                     data = data[-rollover:]
-                super(PropertyValueDict, self).__setitem__(k, data)
+                updates.append((k, data))
+            else:
+                updates.append((k, list(v)))
+
+        for k, v in updates:
+            if isinstance(self[k], RingBuffer):
+                self[k].extend(v, rollover)
+            elif isinstance(self[k], np.ndarray):
+                super(PropertyValueDict, self).__setitem__(k, v)
             else:
                 L = self[k]
-                L.extend(new_data[k])
+                L.extend(v)
                 if rollover is not None:
                     del L[:-rollover]
 
@@ -371,10 +387,17 @@ class PropertyValueDict(PropertyValueContainer, dict):
         old = self._saved_copy()
 
         for name, patch in patches.items():
+            # read-only arrays may be shared with other documents, so copy
+            # them before changing them in place
+            if isinstance(self[name], np.ndarray) and not self[name].flags.writeable:
+                super(PropertyValueDict, self).__setitem__(name, self[name].copy())
             for ind, value in patch:
                 if isinstance(ind, (int, slice)):
                     self[name][ind] = value
                 else:
+                    column = self[name]
+                    if isinstance(column[ind[0]], np.ndarray) and not column[ind[0]].flags.writeable:
+                        column[ind[0]] = column[ind[0]].copy()
                     shape = self[name][ind[0]][ind[1:]].shape
                     self[name][ind[0]][ind[1:]] = np.array(value, copy=False).reshape(shape)
 
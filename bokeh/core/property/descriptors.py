@@ -236,7 +236,7 @@ class PropertyDescriptor(object):
         '''
         raise NotImplementedError("Implement class_default()")
 
-    def serializable_value(self, obj):
+    def serializable_value(self, obj, buffers=None):
         ''' Produce the value as it should be serialized.
 
         Sometimes it is desirable for the serialized value to differ from
@@ -246,12 +246,20 @@ class PropertyDescriptor(object):
         Args:
             obj (HasProps) : the object to get the serialized attribute for
 
+            buffers (list, optional) :
+                If binary buffers are desired, a list may be provided, and
+                any array data that may be sent as binary buffers will be
+                added to it (default: None)
+
         Returns:
             JSON-like
 
         '''
         value = self.__get__(obj, obj.__class__)
-        return self.property.serialize_value(value)
+        if buffers is None:
+            # avoid requiring Property subclasses to accept buffers
+            return self.property.serialize_value(value)
+        return self.property.serialize_value(value, buffers=buffers)
 
     def set_from_json(self, obj, json, models, setter=None):
         '''Sets the value of this property from a JSON value.
@@ -657,20 +665,28 @@ class BasicPropertyDescriptor(PropertyDescriptor):
             # this shouldn't happen because we should have checked before _get_default()
             raise RuntimeError("Bokeh internal error, does not handle the case of self.name already in _property_values")
 
-        is_themed = obj.themed_values() is not None and self.name in obj.themed_values()
-
-        default = self.instance_default(obj)
+        themed_values = obj.themed_values()
+        is_themed = themed_values is not None and self.name in themed_values
 
         if is_themed:
+            # the themed values of models in a Document are updated in place
+            # when the Document theme changes, so cached values are only used
+            # if they were made from the current themed value
+            themed_value = themed_values[self.name]
             if self.name in obj._unstable_themed_values:
-                return obj._unstable_themed_values[self.name]
+                source, value = obj._unstable_themed_values[self.name]
+                if source is themed_value:
+                    return value
 
+            default = self.instance_default(obj)
             if self.property._may_have_unstable_default():
                 if isinstance(default, PropertyValueContainer):
                     default._register_owner(obj, self)
-                obj._unstable_themed_values[self.name] = default
+                obj._unstable_themed_values[self.name] = (themed_value, default)
             return default
 
+        default = self.instance_default(obj)
+
         if self.name in obj._unstable_default_values:
             return obj._unstable_default_values[self.name]
 
@@ -745,8 +761,9 @@ class BasicPropertyDescriptor(PropertyDescriptor):
 
         '''
         # As of Bokeh 0.11.1, all hinted events modify in place. However this
-        # may need refining later if this assumption changes.
-        unchanged = self.property.matches(value, old) and (hint is None)
+        # may need refining later if this assumption changes. Checking the
+        # hint first avoids comparing possibly large values needlessly.
+        unchanged = (hint is None) and self.property.matches(value, old)
         if unchanged:
             return
 
@@ -809,8 +826,11 @@ class BasicPropertyDescriptor(PropertyDescriptor):
         value = self.__get__(obj, obj.__class__)
 
         # re-validate because the contents of 'old' have changed,
-        # in some cases this could give us a new object for the value
-        value = self.property.prepare_value(obj, self.name, value)
+        # in some cases this could give us a new object for the value.
+        # Hinted updates (e.g. streaming) are expected to have validated
+        # just the data they add, so re-validating everything is avoided.
+        if hint is None:
+            value = self.property.prepare_value(obj, self.name, value)
 
         self._real_set(obj, old, value, hint)
 
@@ -861,7 +881,7 @@ class DataSpecPropertyDescriptor(BasicPropertyDescriptor):
 
     '''
 
-    def serializable_value(self, obj):
+    def serializable_value(self, obj, buffers=None):
         '''
 
         '''
@@ -1254,6 +1254,20 @@ class TestProperties(unittest.TestCase):
         self.assertTrue(prop.is_valid(df.index))
         self.assertTrue(prop.is_valid(df.iloc[0]))
 
+    def test_Seq_arrays(self):
+        prop = Seq(Int)
+        self.assertTrue(prop.is_valid(np.arange(3, dtype=np.uint8)))
+        self.assertFalse(prop.is_valid(np.array([1.5])))
+
+        prop = Seq(Float)
+        self.assertTrue(prop.is_valid(np.arange(3)))
+        self.assertTrue(prop.is_valid(np.arange(3.0)))
+        self.assertFalse(prop.is_valid(np.array(["a"])))
+
+        prop = Seq(Any)
+        self.assertTrue(prop.is_valid(np.array(["a", None], dtype=object)))
+        self.assertEqual(prop.from_json([1, "a"]), [1, "a"])
+
     def test_List(self):
         with self.assertRaises(TypeError):
             prop = List()
@@ -23,23 +23,28 @@ from json import loads
 import sys
 
 import jinja2
-from six import string_types
+from six import iteritems, string_types
 
 from .core.json_encoder import serialize_json
+from .core.properties import ColumnData
 from .core.query import find
 from .core.templates import FILE
 from .core.validation import check_integrity
-from .model import collect_models, get_class
+from .model import _clone_models, _visit_immediate_value_references, collect_models, get_class
+from .settings import settings
 from .themes import default as default_theme
 from .themes import Theme
 from .util.callback_manager import _check_callback
 from .util.datatypes import MultiValuedDict
+from .util.serialization import transform_column_source_data
 from .util.future import wraps
 from .util.version import __version__
 from .events import Event
 
 DEFAULT_TITLE = "Bokeh Application"
 
+_MISSING = object()
+
 def without_document_lock(func):
     ''' Wrap a callback function to execute without first obtaining the
     document lock.
@@ -74,10 +79,37 @@ def without_document_lock(func):
 
 
 class EventManager(object):
+    ''' Keep track of the models of a document subscribed to UI events, and
+    dispatch events to them.
+
+    '''
 
     def __init__(self, document):
         self.document = document
         self.subscribed_models = set() # Models subscribed to events
+        # subscribed models indexed by (model id, event name)
+        self._subscriptions = dict()
+
+    def subscribe(self, model, event_name):
+        ''' Subscribe a model to events with the given name. '''
+        self.subscribed_models.add(model)
+        self._subscriptions[(model._id, event_name)] = model
+
+    def unsubscribe(self, model):
+        ''' Remove all subscriptions of a model. '''
+        self.subscribed_models.discard(model)
+        for event_name in model._event_callbacks:
+            if self._subscriptions.get((model._id, event_name)) is model:
+                del self._subscriptions[(model._id, event_name)]
+
+    def trigger_event(self, event):
+        ''' Trigger the callbacks of the model an event is for, if the model
+        is subscribed to the event.
+
+        '''
+        model = self._subscriptions.get((event._model_id, event.event_name))
+        if model is not None:
+            model._trigger_event(event)
 
 
 class Document(object):
@@ -94,12 +126,23 @@ class Document(object):
     def __init__(self, **kwargs):
         self._roots = list()
         self._theme = kwargs.pop('theme', default_theme)
+        # themed values for each model class, shared by the models in this
+        # document and updated in place when the theme changes
+        self._themed_values = {}
         # use _title directly because we don't need to trigger an event
         self._title = kwargs.pop('title', DEFAULT_TITLE)
         self._template = FILE
         self._all_models_freeze_count = 0
+        self._batch_count = 0
+        # events collected during a batch, and the indices of the model
+        # changes among them that later changes may be combined with
+        self._batch_events = None
+        self._batch_changes = None
         self._all_models = dict()
         self._all_models_by_name = MultiValuedDict()
+        self._all_models_refcounts = dict()
+        self._all_models_suspects = dict()
+        self._newly_attached = set()
         self._all_former_model_ids = set()
         self._callbacks = {}
         self._session_callbacks = {}
@@ -166,7 +209,8 @@ class Document(object):
         never returns ``None``.)
 
         Changing theme may trigger model change events on the models in the
-        document if the theme modifies any model properties.
+        document if the theme modifies any model properties. The events are
+        only triggered if the document, or the model, has Python callbacks.
 
         '''
         return self._theme
@@ -180,8 +224,34 @@ class Document(object):
         if self._theme is theme:
             return
         self._theme = theme
+
+        # The models of each class share a dict of themed values, so the
+        # new theme is applied by updating one dict per class, and values
+        # are looked up in it whenever they are used.
+        changed = {}
+        for cls, themed_values in self._themed_values.items():
+            new_values = theme._for_class(cls)
+            keys = set(themed_values) | set(new_values)
+            keys = set(k for k in keys if themed_values.get(k, _MISSING) != new_values.get(k, _MISSING))
+            if keys:
+                changed[cls] = (new_values, keys)
+
+        # Nobody can observe the changes of models without callbacks, so
+        # there is no need to look up their old values for change events
+        old_values = []
         for model in self._all_models.values():
-            self._theme.apply_to_model(model)
+            if model.__class__ in changed and (self._callbacks or model._callbacks):
+                keys = changed[model.__class__][1]
+                old_values.append((model, dict((k, getattr(model, k)) for k in keys)))
+
+        for cls, (new_values, keys) in changed.items():
+            themed_values = self._themed_values[cls]
+            themed_values.clear()
+            themed_values.update(new_values)
+
+        for model, values in old_values:
+            for k, v in values.items():
+                model.lookup(k).trigger_if_changed(model, v)
 
     @property
     def title(self):
@@ -276,9 +346,10 @@ class Document(object):
         # well. But in embedded cases, you may well want more than one.
         try:
             self._roots.append(model)
+            self._add_model_references([model])
         finally:
             self._pop_all_models_freeze()
-        self._trigger_on_change(RootAddedEvent(self, model, setter))
+        self._trigger_on_change(RootAddedEvent(self, model, setter, self._take_newly_attached()))
 
     def add_timeout_callback(self, callback, timeout_milliseconds):
         ''' Add callback to be invoked once, after a specified timeout passes.
@@ -306,11 +377,24 @@ class Document(object):
         return self._add_session_callback(cb, callback, one_shot=True)
 
     def apply_json_event(self, json):
-        for obj in self.event_manager.subscribed_models:
-            event = loads(json, object_hook=Event.decode_json)
-            if not isinstance(event, Event):
-                logger.warn('Could not decode event json: %s' % json)
-            obj._trigger_event(event)
+        event = loads(json, object_hook=Event.decode_json)
+        if not isinstance(event, Event):
+            logger.warn('Could not decode event json: %s' % json)
+            return
+        self.apply_event(event)
+
+    def apply_event(self, event):
+        ''' Trigger the Python callbacks of the model a decoded UI event is
+        for.
+
+        Args:
+            event (Event) : an event decoded with ``Event.decode_json``
+
+        Returns:
+            None
+
+        '''
+        self.event_manager.trigger_event(event)
 
     def apply_json_patch(self, patch, setter=None):
         ''' Apply a JSON patch object and process any resulting events.
@@ -338,10 +422,15 @@ class Document(object):
         events_json = patch['events']
         references = self._instantiate_references_json(references_json)
 
-        # Use our existing model instances whenever we have them
-        for obj in references.values():
-            if obj._id in self._all_models:
-                references[obj._id] = self._all_models[obj._id]
+        # Use our existing model instances whenever we have them. Like
+        # BokehJS, only the new models are initialized from the references,
+        # existing models are only updated by the events.
+        new_references_json = []
+        for obj in references_json:
+            if obj['id'] in self._all_models:
+                references[obj['id']] = self._all_models[obj['id']]
+            else:
+                new_references_json.append(obj)
 
         # The model being changed isn't always in references so add it in
         for event_json in events_json:
@@ -350,7 +439,7 @@ class Document(object):
                 if model_id in self._all_models:
                     references[model_id] = self._all_models[model_id]
 
-        self._initialize_references_json(references_json, references)
+        self._initialize_references_json(new_references_json, references)
 
         for event_json in events_json:
             if event_json['kind'] == 'ModelChanged':
@@ -370,7 +459,8 @@ class Document(object):
                 if source_id not in self._all_models:
                     raise RuntimeError("Cannot stream to %s which is not in the document" % (str(source_id)))
                 source = self._all_models[source_id]
-                data = event_json['data']
+                # e.g. arrays and ragged lists may be encoded
+                data = source.lookup('data').property.from_json(event_json['data'])
                 rollover = event_json['rollover']
                 source._stream(data, rollover, setter)
             elif event_json['kind'] == 'ColumnsPatched':
@@ -380,6 +470,16 @@ class Document(object):
                 source = self._all_models[source_id]
                 patches = event_json['patches']
                 source.patch(patches, setter)
+            elif event_json['kind'] == 'ColumnDataChanged':
+                source_id = event_json['column_source']['id']
+                if source_id not in self._all_models:
+                    raise RuntimeError("Cannot change columns of %s which is not in the document" % (str(source_id)))
+                source = self._all_models[source_id]
+                descriptor = source.lookup('data')
+                new_data = descriptor.property.from_json(event_json['new'])
+                data = dict((name, new_data[name] if name in new_data else source.data[name])
+                            for name in event_json['cols'])
+                descriptor._internal_set(source, data, setter=setter)
             elif event_json['kind'] == 'RootAdded':
                 root_id = event_json['model']['id']
                 root_obj = references[root_id]
@@ -406,6 +506,38 @@ class Document(object):
         json_parsed = loads(patch)
         self.apply_json_patch(json_parsed)
 
+    def batch(self):
+        ''' Collect the changes made to this document, and process them
+        together at the end of the batch.
+
+        Returns a context manager, which can also be used as a decorator:
+
+        .. code-block:: python
+
+            with doc.batch():
+                for renderer in renderers:
+                    renderer.glyph.fill_color = "firebrick"
+
+            @doc.batch()
+            def update():
+                ...
+
+        Until the outermost batch ends, changes are not passed to the
+        callbacks added with ``on_change`` (e.g. the Bokeh server session
+        that sends them to the browser), and models that are no longer
+        referred to are only looked for once. Repeated changes to the same
+        attribute of a model are combined into one change, and the value
+        sent for it is only serialized once. The changes are then passed to
+        the callbacks in the order they were made. Callbacks added with
+        ``on_change`` of the models themselves are still called as soon as
+        their attribute changes.
+
+        Returns:
+            _DocumentBatch
+
+        '''
+        return _DocumentBatch(self)
+
     def clear(self):
         ''' Remove all content from the document but do not reset title.
 
@@ -421,37 +553,117 @@ class Document(object):
         finally:
             self._pop_all_models_freeze()
 
-    def create_json_patch_string(self, events):
+    def clone(self, share_arrays=False):
+        ''' Create a copy of this document, containing copies of all of its
+        models.
+
+        This is much faster than a round trip through JSON, because property
+        values are copied directly and are not validated again. The copied
+        models have new ids. Python callbacks on the document or on its
+        models are not copied.
+
+        Args:
+            share_arrays (bool, optional) :
+                Whether the copy should share NumPy arrays with this document,
+                rather than copy them (default: False)
+
+                Shared arrays are read-only in the copy, and
+                ``ColumnDataSource.patch`` copies a shared column before
+                changing it. Arrays in this document should not be modified
+                in place either, since the changes would show in the copy.
+
+        Returns:
+            Document
+
+        '''
+        clones = _clone_models(self._all_models.values(), share_arrays=share_arrays)
+
+        doc = Document(title=self._title, theme=self._theme)
+        doc._template = self._template
+        doc._template_variables = dict(self._template_variables)
+
+        # the copies refer to each other exactly as the originals do, so
+        # the reference counts can be copied instead of found again
+        doc._roots = [clones[root._id] for root in self._roots]
+        for model_id, count in iteritems(self._all_models_refcounts):
+            model = clones[model_id]
+            # the copy has the same themed values, so don't apply them again
+            setattr(model, '__themed_values__', doc._themed_values_for_class(model.__class__))
+            doc._all_models_refcounts[model._id] = count
+            doc._all_models[model._id] = model
+            if model.name is not None:
+                doc._all_models_by_name.add_value(model.name, model)
+            model._attach_document(doc)
+
+        if settings.validate_all_models():
+            doc._check_all_models()
+
+        return doc
+
+    def create_json_patch_string(self, events, buffers=None):
         ''' Create a JSON string describing a patch to be applied.
 
+        Values are serialized from the current state of the document. Only
+        the last of several changes to the same attribute is included, and
+        streams or patches to a column data source whose entire data is also
+        included are omitted. When only some columns of a column data source
+        were replaced, added or removed, only those columns are included.
+
         Args:
           events : list of events to be translated into patches
 
+          buffers (list, optional) :
+            If binary buffers are desired, a list may be provided, and any
+            array data that may be sent as binary buffers will be added to
+            it, rather than base64 encoded in the JSON (default: None)
+
         Returns:
           str :  JSON string which can be applied to make the given updates to obj
 
         '''
-        from .server.events import (ColumnsPatchedEvent, ColumnsStreamedEvent, ModelChangedEvent,
-                                    RootAddedEvent, RootRemovedEvent, TitleChangedEvent)
+        from .server.events import (ColumnDataChangedEvent, ColumnsPatchedEvent, ColumnsStreamedEvent,
+                                    ModelChangedEvent, RootAddedEvent, RootRemovedEvent, TitleChangedEvent)
+
+        # values are serialized from the current state of the document, so
+        # only the last of several changes to the same attribute needs sending
+        latest = {}
+        # models added by these changes are new to the remote doc, which
+        # initializes them from their current state in the references
+        attached = set()
+        for index, event in enumerate(events):
+            if isinstance(event, ModelChangedEvent) and event.hint is None:
+                latest[(event.model._id, event.attr)] = index
+                attached.update(event.attached)
+            elif isinstance(event, RootAddedEvent):
+                attached.update(event.attached)
+            elif isinstance(event, TitleChangedEvent):
+                latest[(None, 'title')] = index
+
         references = set()
         json_events = []
-        for event in events:
+        deltas = []
+        for index, event in enumerate(events):
             if event.document is not self:
                 raise ValueError("Cannot create a patch using events from a different document " + repr(event))
 
             if isinstance(event, ModelChangedEvent):
-                if isinstance(event.hint, ColumnsStreamedEvent):
-                    json_events.append({ 'kind' : 'ColumnsStreamed',
-                                         'column_source' : event.hint.column_source.ref,
-                                         'data' : event.hint.data,
-                                         'rollover' : event.hint.rollover })
-
-                elif isinstance(event.hint, ColumnsPatchedEvent):
-                    json_events.append({ 'kind' : 'ColumnsPatched',
-                                         'column_source' : event.hint.column_source.ref,
-                                         'patches' : event.hint.patches })
+                # e.g. a model that was added and removed again by these
+                # changes, which the remote doc never gets
+                if event.model._id not in self._all_models:
+                    continue
+                if isinstance(event.hint, (ColumnsStreamedEvent, ColumnsPatchedEvent, ColumnDataChangedEvent)):
+                    # filled in below, once all the references are known
+                    deltas.append((len(json_events), event.hint))
+                    json_events.append(None)
                 else:
-                    value = event.serializable_new
+                    if latest[(event.model._id, event.attr)] != index:
+                        continue
+
+                    descriptor = event.model.lookup(event.attr)
+                    if isinstance(descriptor.property, ColumnData):
+                        value = descriptor.serializable_value(event.model, buffers=buffers)
+                    else:
+                        value = event.serializable_new
 
                     # the new value is an object that may have
                     # not-yet-in-the-remote-doc references, and may also
@@ -464,32 +676,95 @@ class Document(object):
                     # remote could need, even though it could be inefficient.
                     # If it turns out we need to fix this we could probably
                     # do it by adding some complexity.
-                    value_refs = set(collect_models(value))
+                    # Properties that cannot refer to models (e.g. column
+                    # data) do not need to be searched.
+                    if descriptor.has_ref:
+                        value_refs = set(collect_models(value))
 
-                    # we know we don't want a whole new copy of the obj we're patching
-                    # unless it's also the new value
-                    if event.model != value:
-                        value_refs.discard(event.model)
-                    references = references.union(value_refs)
+                        # we know we don't want a whole new copy of the obj we're patching
+                        # unless it's also the new value
+                        if event.model != value:
+                            value_refs.discard(event.model)
+                        references.update(value_refs)
 
                     json_events.append({ 'kind' : 'ModelChanged',
                                          'model' : event.model.ref,
                                          'attr' : event.attr,
                                          'new' : value })
             elif isinstance(event, RootAddedEvent):
-                references = references.union(event.model.references())
+                references.update(event.model.references())
                 json_events.append({ 'kind' : 'RootAdded',
                                      'model' : event.model.ref })
             elif isinstance(event, RootRemovedEvent):
                 json_events.append({ 'kind' : 'RootRemoved',
                                      'model' : event.model.ref })
             elif isinstance(event, TitleChangedEvent):
+                if latest[(None, 'title')] != index:
+                    continue
                 json_events.append({ 'kind' : 'TitleChanged',
                                      'title' : event.title })
 
+        # streams and patches to a source whose whole data is also being sent
+        # are already included in that data, and must not be applied twice.
+        # Other sources in the references are already in the remote doc, which
+        # ignores their references, so their changes are still sent.
+        full = set(model_id for model_id in attached if model_id in self._all_models)
+        full.update(model_id for (model_id, attr) in latest if attr == 'data')
+
+        # the columns changed by several column data changes are sent together,
+        # from the current data, with the last of them. If a source was also
+        # streamed to or patched, its changed columns may already include the
+        # new values, so it is sent in full instead, with the first of them.
+        last_column_change = {}
+        changed_cols = {}
+        streamed = set()
+        for position, hint in deltas:
+            source_id = hint.column_source._id
+            if isinstance(hint, ColumnDataChangedEvent):
+                last_column_change[source_id] = position
+                changed_cols.setdefault(source_id, set()).update(hint.cols)
+            else:
+                streamed.add(source_id)
+        sent_in_full = set()
+
+        for position, hint in deltas:
+            source = hint.column_source
+            if source._id in full or source._id in sent_in_full:
+                continue
+            if source._id in streamed and source._id in last_column_change:
+                if isinstance(hint, ColumnDataChangedEvent):
+                    sent_in_full.add(source._id)
+                    json_events[position] = { 'kind' : 'ModelChanged',
+                                              'model' : source.ref,
+                                              'attr' : 'data',
+                                              'new' : source.lookup('data').serializable_value(source, buffers=buffers) }
+                continue
+            if isinstance(hint, ColumnDataChangedEvent):
+                if last_column_change[source._id] != position:
+                    continue
+                data = dict((name, column) for name, column in source.data.items() if name in changed_cols[source._id])
+                json_events[position] = { 'kind' : 'ColumnDataChanged',
+                                          'column_source' : source.ref,
+                                          'new' : transform_column_source_data(data, buffers=buffers),
+                                          'cols' : list(source.data) }
+            elif isinstance(hint, ColumnsStreamedEvent):
+                data = hint.data
+                if buffers is not None:
+                    data = transform_column_source_data(data, buffers=buffers)
+                json_events[position] = { 'kind' : 'ColumnsStreamed',
+                                          'column_source' : hint.column_source.ref,
+                                          'data' : data,
+                                          'rollover' : hint.rollover }
+            else:
+                json_events[position] = { 'kind' : 'ColumnsPatched',
+                                          'column_source' : hint.column_source.ref,
+                                          'patches' : hint.patches }
+        if deltas:
+            json_events = [json_event for json_event in json_events if json_event is not None]
+
         json = {
             'events' : json_events,
-            'references' : self._references_json(references)
+            'references' : self._references_json(references, buffers=buffers)
             }
 
         return serialize_json(json)
@@ -642,6 +917,7 @@ class Document(object):
         self._push_all_models_freeze()
         try:
             self._roots.remove(model)
+            self._remove_model_references([model])
         finally:
             self._pop_all_models_freeze()
         self._trigger_on_change(RootRemovedEvent(self, model, setter))
@@ -726,9 +1002,15 @@ class Document(object):
             for key, val in updates.items():
                 setattr(obj, key, val)
 
-    def to_json(self):
+    def to_json(self, buffers=None):
         ''' Convert this document to a JSON object.
 
+        Args:
+            buffers (list, optional) :
+                If binary buffers are desired, a list may be provided, and
+                any array data that may be sent as binary buffers will be
+                added to it, rather than base64 encoded (default: None)
+
         Return:
             JSON-data
 
@@ -736,16 +1018,21 @@ class Document(object):
 
         # this is a total hack to go via a string, needed because
         # our BokehJSONEncoder goes straight to a string.
-        doc_json = self.to_json_string()
+        doc_json = self.to_json_string(buffers=buffers)
         return loads(doc_json)
 
-    def to_json_string(self, indent=None):
+    def to_json_string(self, indent=None, buffers=None):
         ''' Convert the document to a JSON string.
 
         Args:
             indent (int or None, optional) : number of spaces to indent, or
                 None to suppress all newlines and indentation (default: None)
 
+            buffers (list, optional) :
+                If binary buffers are desired, a list may be provided, and
+                any array data that may be sent as binary buffers will be
+                added to it, rather than base64 encoded (default: None)
+
         Returns:
             str
 
@@ -760,7 +1047,7 @@ class Document(object):
             'title' : self.title,
             'roots' : {
                 'root_ids' : root_ids,
-                'references' : self._references_json(root_references)
+                'references' : self._references_json(root_references, buffers=buffers)
             },
             'version' : __version__
         }
@@ -1028,15 +1315,6 @@ class Document(object):
 
         return references
 
-    def _invalidate_all_models(self):
-        '''
-
-        '''
-
-        # if freeze count is > 0, we'll recompute on unfreeze
-        if self._all_models_freeze_count == 0:
-            self._recompute_all_models()
-
     def _is_single_string_selector(self, selector, field):
         '''
 
@@ -1062,11 +1340,119 @@ class Document(object):
             if new is not None:
                 self._all_models_by_name.add_value(new, model)
 
+        attached = self._take_newly_attached()
+
+        if self._batch_events is not None:
+            self._batch_change(model, attr, old, new, hint, setter, attached)
+            return
+
         if hint is None:
-            serializable_new = model.lookup(attr).serializable_value(model)
+            event = self._model_changed_event(model, attr, old, new, setter, attached)
         else:
-            serializable_new = None
-        self._trigger_on_change(ModelChangedEvent(self, model, attr, old, new, serializable_new, hint, setter))
+            event = ModelChangedEvent(self, model, attr, old, new, None, hint, setter)
+        self._trigger_on_change(event)
+
+    def _take_newly_attached(self):
+        ''' Return the ids of the models added to the document since this was
+        last called, i.e. by the change being notified.
+
+        '''
+        attached = self._newly_attached
+        if not attached:
+            return ()
+        self._newly_attached = set()
+        return attached
+
+    def _model_changed_event(self, model, attr, old, new, setter, attached=()):
+        ''' Create the event for a change of a model attribute, with its
+        serialized new value.
+
+        If only some of the columns of column data changed, the event has a
+        ``ColumnDataChangedEvent`` hint instead, so that only those columns
+        are serialized and sent.
+
+        '''
+        from .server.events import ColumnDataChangedEvent, ModelChangedEvent
+
+        descriptor = model.lookup(attr)
+        # if the old and new data are the same object, its columns may have
+        # been changed in place, and are all sent
+        if isinstance(descriptor.property, ColumnData) and isinstance(old, dict) and isinstance(new, dict) and old is not new:
+            cols = descriptor.property.changed_columns(new, old)
+            # otherwise every column is sent anyway
+            if len(cols) < len(new):
+                hint = ColumnDataChangedEvent(self, model, cols, setter)
+                return ModelChangedEvent(self, model, attr, old, new, None, hint, setter, attached)
+        return ModelChangedEvent(self, model, attr, old, new, descriptor.serializable_value(model), None, setter, attached)
+
+    def _batch_change(self, model, attr, old, new, hint, setter, attached):
+        ''' Collect a change made during a batch, combining it with an
+        earlier change to the same attribute, if possible.
+
+        '''
+        from .server.events import ModelChangedEvent
+
+        key = (model._id, attr)
+        if hint is not None:
+            # changes made before a stream or patch are not combined with
+            # the changes made after it
+            self._batch_changes.pop(key, None)
+            self._batch_events.append(ModelChangedEvent(self, model, attr, old, new, None, hint, setter))
+            return
+
+        index = self._batch_changes.get(key)
+        if index is not None and old is new:
+            # e.g. column data changed in place, which a combined change of
+            # column data would not include
+            index = None
+        if index is not None:
+            event = self._batch_events[index]
+            if event.setter is setter:
+                # the combined change is moved to where the last change was
+                # made, after any changes to the models that it refers to
+                self._batch_events[index] = None
+                event.new = new
+                if attached:
+                    event.attached = set(event.attached) | attached
+                self._batch_changes[key] = len(self._batch_events)
+                self._batch_events.append(event)
+                return
+
+        # the event is created, and its value serialized, when the batch ends
+        self._batch_changes[key] = len(self._batch_events)
+        self._batch_events.append(ModelChangedEvent(self, model, attr, old, new, None, None, setter, attached))
+
+    def _push_batch(self):
+        '''
+
+        '''
+        if self._batch_count == 0:
+            self._batch_events = []
+            self._batch_changes = {}
+        self._batch_count += 1
+        self._push_all_models_freeze()
+
+    def _pop_batch(self):
+        '''
+
+        '''
+        from .server.events import ModelChangedEvent
+
+        try:
+            self._batch_count -= 1
+            if self._batch_count == 0:
+                events = self._batch_events
+                self._batch_events = None
+                self._batch_changes = None
+                for event in events:
+                    if event is None:
+                        continue
+                    if isinstance(event, ModelChangedEvent) and event.hint is None:
+                        event = self._model_changed_event(event.model, event.attr, event.old, event.new, event.setter,
+                                                          event.attached)
+                    self._trigger_on_change(event)
+        finally:
+            self._pop_all_models_freeze()
 
     def _push_all_models_freeze(self):
         '''
@@ -1080,35 +1466,138 @@ class Document(object):
         '''
         self._all_models_freeze_count -= 1
         if self._all_models_freeze_count == 0:
-            self._recompute_all_models()
+            self._remove_unreachable_models()
+            if settings.validate_all_models():
+                self._check_all_models()
+
+    def _add_model_references(self, models):
+        ''' Count a new reference to each of the given models, attaching any
+        model (and, in turn, the models it refers to) that was not in the
+        document yet.
+
+        '''
+        stack = list(models)
+        while stack:
+            model = stack.pop()
+            count = self._all_models_refcounts.get(model._id, 0)
+            self._all_models_refcounts[model._id] = count + 1
+            if count == 0:
+                self._all_models[model._id] = model
+                self._newly_attached.add(model._id)
+                if model.name is not None:
+                    self._all_models_by_name.add_value(model.name, model)
+                model._attach_document(self)
+                _visit_immediate_value_references(model, stack.append)
+
+    def _remove_model_references(self, models):
+        ''' Remove a reference to each of the given models, detaching any
+        model (and, in turn, the models it refers to) that is no longer
+        referred to.
+
+        Models that are still referred to may only be referred to by a cycle
+        of models that is itself unreachable. These are checked for by
+        ``_remove_unreachable_models``.
+
+        '''
+        stack = list(models)
+        while stack:
+            model = stack.pop()
+            count = self._all_models_refcounts.get(model._id)
+            if count is None:
+                continue
+            if count > 1:
+                self._all_models_refcounts[model._id] = count - 1
+                self._all_models_suspects[model._id] = model
+            else:
+                del self._all_models_refcounts[model._id]
+                self._all_models_suspects.pop(model._id, None)
+                self._detach_model(model)
+                _visit_immediate_value_references(model, stack.append)
+
+    def _update_model_references(self, old_models, new_models):
+        ''' Update the models in the document after a property that referred
+        to ``old_models`` was changed to refer to ``new_models`` instead.
+
+        '''
+        self._push_all_models_freeze()
+        try:
+            # add first, so that models in both are not detached in between
+            self._add_model_references(new_models)
+            self._remove_model_references(old_models)
+        finally:
+            self._pop_all_models_freeze()
+
+    def _remove_unreachable_models(self):
+        ''' Detach any cycles of models that are only referred to by each
+        other, by checking the part of the model graph that can be reached
+        from models that lost a reference.
+
+        '''
+        if not self._all_models_suspects:
+            return
+        suspects = self._all_models_suspects
+        self._all_models_suspects = dict()
+
+        graph = dict()
+        stack = [model for model in suspects.values() if model._id in self._all_models_refcounts]
+        while stack:
+            model = stack.pop()
+            if model._id in graph:
+                continue
+            children = []
+            _visit_immediate_value_references(model, children.append)
+            graph[model._id] = (model, children)
+            stack.extend(children)
+
+        internal = dict()
+        for model, children in graph.values():
+            for child in children:
+                internal[child._id] = internal.get(child._id, 0) + 1
+
+        # models with references from roots, or from models outside of this
+        # part of the graph, are reachable, and so is everything they refer to
+        reachable = set()
+        stack = [model for (model_id, (model, children)) in graph.items()
+                 if self._all_models_refcounts[model_id] > internal.get(model_id, 0)]
+        while stack:
+            model = stack.pop()
+            if model._id in reachable:
+                continue
+            reachable.add(model._id)
+            stack.extend(graph[model._id][1])
+
+        for model_id, (model, children) in graph.items():
+            if model_id in reachable:
+                continue
+            del self._all_models_refcounts[model_id]
+            self._detach_model(model)
+            for child in children:
+                if child._id in reachable:
+                    self._all_models_refcounts[child._id] -= 1
 
-    def _recompute_all_models(self):
+    def _detach_model(self, model):
         '''
 
         '''
-        new_all_models_set = set()
-        for r in self.roots:
-            new_all_models_set = new_all_models_set.union(r.references())
-        old_all_models_set = set(self._all_models.values())
-        to_detach = old_all_models_set - new_all_models_set
-        to_attach = new_all_models_set - old_all_models_set
-
-        recomputed = {}
-        recomputed_by_name = MultiValuedDict()
-        for m in new_all_models_set:
-            recomputed[m._id] = m
-            if m.name is not None:
-                recomputed_by_name.add_value(m.name, m)
-        for d in to_detach:
-            self._all_former_model_ids.add(d._id)
-            d._detach_document()
-        for a in to_attach:
-            a._attach_document(self)
-        self._all_models = recomputed
-        self._all_models_by_name = recomputed_by_name
+        del self._all_models[model._id]
+        if model.name is not None:
+            self._all_models_by_name.remove_value(model.name, model)
+        self._all_former_model_ids.add(model._id)
+        model._detach_document()
+
+    def _check_all_models(self):
+        ''' Check that the incrementally maintained models of the document are
+        the same as those found by a full traversal from the roots.
+
+        '''
+        expected = dict((model._id, model) for model in collect_models(*self.roots))
+        if set(expected) != set(self._all_models):
+            missing = [expected[k] for k in set(expected) - set(self._all_models)]
+            extra = [self._all_models[k] for k in set(self._all_models) - set(expected)]
+            raise RuntimeError("Document models are out of date (missing: %r, extra: %r)" % (missing, extra))
 
     @classmethod
-    def _references_json(cls, references):
+    def _references_json(cls, references, buffers=None):
         ''' Given a list of all models in a graph, return JSON representing
         them and their properties.
 
@@ -1117,7 +1606,7 @@ class Document(object):
         references_json = []
         for r in references:
             ref = r.ref
-            ref['attributes'] = r._to_json_like(include_defaults=False)
+            ref['attributes'] = r._to_json_like(include_defaults=False, buffers=buffers)
             references_json.append(ref)
 
         return references_json
@@ -1157,12 +1646,25 @@ class Document(object):
         '''
 
         '''
+        if self._batch_events is not None:
+            self._batch_events.append(event)
+            return
 
         def invoke_callbacks():
             for cb in self._callbacks.values():
                 cb(event)
         self._with_self_as_curdoc(invoke_callbacks)
 
+    def _themed_values_for_class(self, cls):
+        ''' The themed values shared by the models of a class in this
+        document.
+
+        '''
+        themed_values = self._themed_values.get(cls)
+        if themed_values is None:
+            themed_values = self._themed_values[cls] = dict(self._theme._for_class(cls))
+        return themed_values
+
     @classmethod
     def _value_record_references(cls, all_references, v, result):
         '''
@@ -1211,6 +1713,32 @@ class Document(object):
             return doc._with_self_as_curdoc(invoke)
         return wrapper
 
+class _DocumentBatch(object):
+    ''' A context manager, and decorator, that collects the changes made to
+    a Document while it is active (see ``Document.batch``).
+
+    '''
+
+    def __init__(self, doc):
+        '''
+
+        '''
+        self._doc = doc
+
+    def __enter__(self):
+        self._doc._push_batch()
+        return self._doc
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._doc._pop_batch()
+
+    def __call__(self, func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with self:
+                return func(*args, **kwargs)
+        return wrapper
+
 class _UnlockedDocumentProxy(object):
     ''' Wrap a Document object so that only methods that can safely be used
     from unlocked callbacks or threads are exposed. Attempts to otherwise
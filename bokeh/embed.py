@@ -16,8 +16,11 @@ from __future__ import absolute_import
 from contextlib import contextmanager
 from collections import Sequence
 from warnings import warn
+import base64
 import re
+import uuid
 
+import numpy as np
 from six import string_types
 from six.moves.urllib.parse import urlparse
 
@@ -26,14 +29,16 @@ from .core.templates import (
     FILE, NOTEBOOK_DIV, PLOT_DIV, DOC_JS, SCRIPT_TAG
 )
 from .core.json_encoder import serialize_json
+from .core.properties import ColumnData
 from .document import Document, DEFAULT_TITLE
 from .model import Model
 from .resources import BaseResources, DEFAULT_SERVER_HTTP_URL, _SessionCoordinates
 from .settings import settings
 from .util.deprecation import deprecated
-from .util.string import encode_utf8, format_docstring
+from .util.string import encode_utf8, decode_utf8, format_docstring
 from .util.serialization import make_id
 from .util.compiler import bundle_all_models
+from .util.version import __version__
 
 def _indent(text, n=2):
     return "\n".join([ " "*n + line for line in text.split("\n") ])
@@ -295,15 +300,18 @@ def _bundle_for_objs_and_resources(objs, resources):
     else:
         raise ValueError("expected Resources or a pair of optional Resources, got %r" % resources)
 
-    from copy import deepcopy
+    from copy import copy
 
     # XXX: force all components on server and in notebook, because we don't know in advance what will be used
     use_widgets =  _use_widgets(objs) if objs else True
     use_tables  =  _use_tables(objs)  if objs else True
     use_gl      =  _use_gl(objs)      if objs else True
 
+    # only the lists of components are changed, so shallow copies of the
+    # resources with copies of those lists are enough
     if js_resources:
-        js_resources = deepcopy(js_resources)
+        js_resources = copy(js_resources)
+        js_resources.js_components = list(js_resources.js_components)
         if not use_widgets and "bokeh-widgets" in js_resources.js_components:
             js_resources.js_components.remove("bokeh-widgets")
         if not use_tables and "bokeh-tables" in js_resources.js_components:
@@ -315,7 +323,8 @@ def _bundle_for_objs_and_resources(objs, resources):
         bokeh_js = None
 
     if css_resources:
-        css_resources = deepcopy(css_resources)
+        css_resources = copy(css_resources)
+        css_resources.css_components = list(css_resources.css_components)
         if not use_widgets and "bokeh-widgets" in css_resources.css_components:
             css_resources.css_components.remove("bokeh-widgets")
         if not use_tables and "bokeh-tables" in css_resources.css_components:
@@ -390,13 +399,19 @@ def file_html(models,
               title=None,
               template=FILE,
               template_variables={},
-              theme=FromCurdoc):
+              theme=FromCurdoc,
+              fileobj=None):
     ''' Return an HTML document that embeds Bokeh Model or Document objects.
 
     The data for the plot is stored directly in the returned HTML, with
     support for customizing the JS/CSS resources independently and
     customizing the jinja2 template.
 
+    For very large documents, the HTML can be written to a file instead,
+    without building it in memory first. The JSON for the document is then
+    written one model at a time, and the data of column data sources one
+    chunk at a time.
+
     Args:
         models (Model or Document or list) : Bokeh object or objects to render
             typically a Model or Document
@@ -414,17 +429,24 @@ def file_html(models,
             Setting this to ``None`` uses the default theme or the theme
             already specified in the document. Any other value must be an
             instance of the ``Theme`` class.
+        fileobj (file-like, optional) : a text file to write the HTML to (default: None)
+            If None, the HTML is returned instead.
 
     Returns:
-        UTF-8 encoded HTML
+        UTF-8 encoded HTML, or None if ``fileobj`` is given
 
     '''
     models = _check_models(models)
 
     with _ModelInDocument(models, apply_theme=theme):
-        (docs_json, render_items) = _standalone_docs_json_and_render_items(models)
         title = _title_from_models(models, title)
         bundle = _bundle_for_objs_and_resources(models, resources)
+        if fileobj is not None:
+            (docs, render_items) = _standalone_docs_and_render_items(models)
+            _write_html_page_for_render_items(fileobj, bundle, docs, render_items, title=title,
+                                              template=template, template_variables=template_variables)
+            return None
+        (docs_json, render_items) = _standalone_docs_json_and_render_items(models)
         return _html_page_for_render_items(bundle, docs_json, render_items, title=title,
                                            template=template, template_variables=template_variables)
 
@@ -720,6 +742,131 @@ def _html_page_for_render_items(bundle, docs_json, render_items, title,
     html = template.render(template_variables_full)
     return encode_utf8(html)
 
+def _write_html_page_for_render_items(fileobj, bundle, docs, render_items, title,
+                                      template=FILE, template_variables={}):
+    # render the page around a placeholder, and write the JSON for the
+    # documents in its place
+    placeholder = _new_placeholder()
+    html = decode_utf8(_html_page_for_render_items(bundle, placeholder, render_items, title,
+                                                   template=template, template_variables=template_variables))
+    pieces = html.split(serialize_json(placeholder))
+    fileobj.write(pieces[0])
+    for piece in pieces[1:]:
+        for chunk in _docs_json_chunks(docs):
+            fileobj.write(decode_utf8(chunk))
+        fileobj.write(piece)
+
+# bytes of array data to base64 encode at a time, a multiple of 3 so
+# that the encoded chunks can be concatenated
+_BASE64_CHUNK_SIZE = 3 * 2**18
+
+# items of list columns to serialize at a time
+_LIST_CHUNK_SIZE = 10000
+
+_placeholder_re = re.compile(r'"(__bokeh_placeholder_[0-9a-f]{32}__)"')
+
+def _new_placeholder():
+    return "__bokeh_placeholder_%s__" % uuid.uuid4().hex
+
+def _json_chunks(obj, streams):
+    ''' Serialize obj to JSON in pieces, replacing the JSON strings of
+    placeholders in obj by the chunks that ``streams`` maps them to.
+
+    '''
+    for i, piece in enumerate(_placeholder_re.split(serialize_json(obj))):
+        if i % 2 == 0:
+            yield piece
+        elif piece in streams:
+            for chunk in streams[piece]:
+                yield chunk
+        else:
+            yield serialize_json(piece)
+
+def _docs_json_chunks(docs):
+    streams = {}
+    docs_json = {}
+    for docid, doc in docs.items():
+        docs_json[docid] = placeholder = _new_placeholder()
+        streams[placeholder] = _doc_json_chunks(doc)
+    return _json_chunks(docs_json, streams)
+
+def _doc_json_chunks(doc):
+    # this is the same JSON as Document.to_json_string() produces
+    placeholder = _new_placeholder()
+    doc_json = {
+        'title' : doc.title,
+        'roots' : {
+            'root_ids' : [r._id for r in doc.roots],
+            'references' : placeholder,
+        },
+        'version' : __version__
+    }
+    for chunk in _json_chunks(doc_json, {placeholder: _references_json_chunks(doc._all_models.values())}):
+        yield chunk
+
+def _references_json_chunks(models):
+    yield "["
+    for i, model in enumerate(models):
+        if i > 0:
+            yield ","
+        for chunk in _model_json_chunks(model):
+            yield chunk
+    yield "]"
+
+def _model_json_chunks(model):
+    # arrays are collected as binary buffers rather than base64 encoded,
+    # so that they can be encoded a chunk at a time
+    buffers = []
+    ref = model.ref
+    ref['attributes'] = attributes = model._to_json_like(include_defaults=False, buffers=buffers)
+    payloads = dict((header['id'], payload) for header, payload in buffers)
+    streams = {}
+    for name, value in attributes.items():
+        if isinstance(value, dict) and isinstance(model.lookup(name).property, ColumnData):
+            for key, column in value.items():
+                value[key] = _column_json(column, payloads, streams)
+    return _json_chunks(ref, streams)
+
+def _column_json(column, payloads, streams):
+    if isinstance(column, dict) and '__buffer__' in column:
+        placeholder = _new_placeholder()
+        streams[placeholder] = _base64_chunks(payloads[column['__buffer__']])
+        result = {
+            '__ndarray__' : placeholder,
+            'shape'       : column['shape'],
+            'dtype'       : column['dtype'],
+        }
+        if 'original_dtype' in column:
+            result['original_dtype'] = column['original_dtype']
+        return result
+    if isinstance(column, dict):
+        # ragged lists, whose values and offsets may be binary buffers
+        return dict((key, _column_json(value, payloads, streams)) for key, value in column.items())
+    if isinstance(column, list):
+        # lists of arrays, some of which may be binary buffers
+        if len(column) > 0 and isinstance(column[0], (dict, list)):
+            return [_column_json(item, payloads, streams) for item in column]
+        if len(column) > _LIST_CHUNK_SIZE:
+            placeholder = _new_placeholder()
+            streams[placeholder] = _list_chunks(column)
+            return placeholder
+    return column
+
+def _base64_chunks(payload):
+    data = np.frombuffer(payload, dtype=np.uint8)
+    yield '"'
+    for i in range(0, len(data), _BASE64_CHUNK_SIZE):
+        yield base64.b64encode(data[i:i+_BASE64_CHUNK_SIZE].tobytes()).decode('utf-8')
+    yield '"'
+
+def _list_chunks(values):
+    yield "["
+    for i in range(0, len(values), _LIST_CHUNK_SIZE):
+        if i > 0:
+            yield ","
+        yield serialize_json(values[i:i+_LIST_CHUNK_SIZE])[1:-1]
+    yield "]"
+
 def _check_models(models, allow_dict=False):
     input_type_valid = False
 
@@ -776,6 +923,15 @@ def _title_from_models(models, title):
     return DEFAULT_TITLE
 
 def _standalone_docs_json_and_render_items(models):
+    (docs_by_id, render_items) = _standalone_docs_and_render_items(models)
+
+    docs_json = {}
+    for k, v in docs_by_id.items():
+        docs_json[k] = v.to_json()
+
+    return (docs_json, render_items)
+
+def _standalone_docs_and_render_items(models):
     models = _check_models(models)
 
     render_items = []
@@ -806,11 +962,7 @@ def _standalone_docs_json_and_render_items(models):
             'modelid' : modelid
             })
 
-    docs_json = {}
-    for k, v in docs_by_id.items():
-        docs_json[k] = v.to_json()
-
-    return (docs_json, render_items)
+    return (docs_by_id, render_items)
 
 # TODO this is a theory about what file_html() "should" be,
 # with a more explicit name similar to the server names below,
@@ -36,7 +36,6 @@ import bokeh.util.browser as browserlib  # full import needed for test mocking t
 from .util.dependencies import import_required, detect_phantomjs
 from .util.deprecation import deprecated
 from .util.notebook import get_comms, load_notebook, publish_display_data, watch_server_cells
-from .util.string import decode_utf8
 from .util.serialization import make_id
 
 #-----------------------------------------------------------------------------
@@ -439,10 +438,8 @@ def _get_save_args(state, filename, resources, title):
     return filename, resources, title
 
 def _save_helper(obj, filename, resources, title):
-    html = file_html(obj, resources, title=title)
-
     with io.open(filename, mode="w", encoding="utf-8") as f:
-        f.write(decode_utf8(html))
+        file_html(obj, resources, title=title, fileobj=f)
 
 def push_notebook(document=None, state=None, handle=None):
     ''' Update Bokeh plots in a Jupyter notebook output cells with new data
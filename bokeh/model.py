@@ -7,6 +7,7 @@ from __future__ import absolute_import, print_function
 import logging
 logger = logging.getLogger(__file__)
 
+from collections import deque
 from json import loads
 from operator import itemgetter
 
@@ -42,7 +43,7 @@ def collect_models(*input_values):
 
     ids = set([])
     collected = []
-    queued = []
+    queued = deque()
 
     def queue_one(obj):
         if obj._id not in ids:
@@ -52,7 +53,7 @@ def collect_models(*input_values):
         _visit_value_and_its_immediate_references(value, queue_one)
 
     while queued:
-        obj = queued.pop(0)
+        obj = queued.popleft()
         if obj._id not in ids:
             ids.add(obj._id)
             collected.append(obj)
@@ -171,6 +172,10 @@ class MetaModel(MetaHasProps):
 
     model_class_reverse_map = {}
 
+    # incremented whenever a class is added to model_class_reverse_map, so
+    # that results which depend on the set of Model classes can be cached
+    model_class_generation = 0
+
     def __new__(meta_cls, class_name, bases, class_dict):
         '''
 
@@ -195,6 +200,7 @@ class MetaModel(MetaHasProps):
                           (entry, class_name,
                            MetaModel.model_class_reverse_map[entry]))
         MetaModel.model_class_reverse_map[entry] = newcls
+        MetaModel.model_class_generation += 1
 
         return newcls
 
@@ -418,20 +424,36 @@ class Model(with_metaclass(MetaModel, HasProps, PropertyCallbackManager, EventCa
         except:
             return []
 
-    def on_change(self, attr, *callbacks):
+    def on_change(self, attr, *callbacks, **kwargs):
         ''' Add a callback on this object to trigger when ``attr`` changes.
 
         Args:
             attr (str) : an attribute name on this object
             callback (callable) : a callback function to register
 
+        Keyword Args:
+            debounce (int, optional) :
+                If given, only call the callbacks once ``attr`` has not
+                changed for this many milliseconds (default: None)
+
+            throttle (int, optional) :
+                If given, call the callbacks as soon as ``attr`` changes, and
+                then at most once every this many milliseconds (default: None)
+
+        Debouncing and throttling only apply in a Bokeh server session, e.g.
+        to run an expensive callback only once a ``Slider`` is released:
+
+        .. code-block:: python
+
+            slider.on_change('value', update, debounce=200)
+
         Returns:
             None
 
         '''
         if attr not in self.properties():
             raise ValueError("attempted to add a callback on nonexistent %s.%s property" % (self.__class__.__name__, attr))
-        super(Model, self).on_change(attr, *callbacks)
+        super(Model, self).on_change(attr, *callbacks, **kwargs)
 
     def references(self):
         ''' Returns all ``Models`` that this object has references to.
@@ -547,15 +569,14 @@ class Model(with_metaclass(MetaModel, HasProps, PropertyCallbackManager, EventCa
         # this may need to be further refined in the future, if the a
         # assumption does not hold for future hinted events (e.g. the hint
         # could specify explicitly whether to do normal invalidation or not)
-        if not hint:
-            dirty = { 'count' : 0 }
-            def mark_dirty(obj):
-                dirty['count'] += 1
+        if not hint and attr in self.properties_with_refs():
             if self._document is not None:
-                _visit_value_and_its_immediate_references(new, mark_dirty)
-                _visit_value_and_its_immediate_references(old, mark_dirty)
-                if dirty['count'] > 0:
-                    self._document._invalidate_all_models()
+                old_models = []
+                new_models = []
+                _visit_value_and_its_immediate_references(old, old_models.append)
+                _visit_value_and_its_immediate_references(new, new_models.append)
+                if old_models or new_models:
+                    self._document._update_model_references(old_models, new_models)
         # chain up to invoke callbacks
         super(Model, self).trigger(attr, old, new, hint, setter)
 
@@ -568,7 +589,7 @@ class Model(with_metaclass(MetaModel, HasProps, PropertyCallbackManager, EventCa
         '''
         if self._document is not None and self._document is not doc:
             raise RuntimeError("Models must be owned by only a single document, %r is already in a doc" % (self))
-        doc.theme.apply_to_model(self)
+        self.apply_theme(doc._themed_values_for_class(self.__class__))
         self._document = doc
         self._update_event_callbacks()
 
@@ -579,10 +600,12 @@ class Model(with_metaclass(MetaModel, HasProps, PropertyCallbackManager, EventCa
         implementation to unset the private ._document field properly
 
         '''
+        if self._document is not None:
+            self._document.event_manager.unsubscribe(self)
         self._document = None
         default_theme.apply_to_model(self)
 
-    def _to_json_like(self, include_defaults):
+    def _to_json_like(self, include_defaults, buffers=None):
         ''' Returns a dictionary of the attributes of this object, in
         a layout corresponding to what BokehJS expects at unmarshalling time.
 
@@ -599,8 +622,13 @@ class Model(with_metaclass(MetaModel, HasProps, PropertyCallbackManager, EventCa
             include_defaults (bool) : whether to include attributes
                 that haven't been changed from the default.
 
+            buffers (list, optional) :
+                If binary buffers are desired, a list may be provided, and
+                any array data that may be sent as binary buffers will be
+                added to it (default: None)
+
         '''
-        all_attrs = self.properties_with_values(include_defaults=include_defaults)
+        all_attrs = self.properties_with_values(include_defaults=include_defaults, buffers=buffers)
 
         # If __subtype__ is defined, then this model may introduce properties
         # that don't exist on __view_model__ in bokehjs. Don't serialize such
@@ -711,26 +739,136 @@ _common_types = {int, float, str}
 
 
 def _visit_value_and_its_immediate_references(obj, visitor):
-    ''' Recurse down Models, HasProps, and Python containers
+    ''' Visit Models inside HasProps and Python containers
 
     The ordering in this function is to optimize performance.  We check the
     most comomn types (int, float, str) first so that we can quickly return in
     the common case.  We avoid isinstance and issubclass checks in a couple
     places with `type` checks because isinstance checks can be slow.
+
+    Containers are traversed with an explicit stack rather than by recursion,
+    visiting Models in the same order that a depth-first recursion would.
     '''
-    typ = type(obj)
-    if typ in _common_types:  # short circuit on common base types
-        return
-    if typ is list or issubclass(typ, (list, tuple)):  # check common containers
-        for item in obj:
-            _visit_value_and_its_immediate_references(item, visitor)
-    elif issubclass(typ, dict):
-        for key, value in iteritems(obj):
-            _visit_value_and_its_immediate_references(key, visitor)
-            _visit_value_and_its_immediate_references(value, visitor)
-    elif issubclass(typ, HasProps):
-        if issubclass(typ, Model):
-            visitor(obj)
-        else:
-            # this isn't a Model, so recurse into it
-            _visit_immediate_value_references(obj, visitor)
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        typ = type(obj)
+        if typ in _common_types:  # short circuit on common base types
+            continue
+        if typ is list or issubclass(typ, (list, tuple)):  # check common containers
+            stack.extend(item for item in reversed(obj) if type(item) not in _common_types)
+        elif issubclass(typ, dict):
+            items = []
+            for key, value in iteritems(obj):
+                items.append(key)
+                items.append(value)
+            items.reverse()
+            stack.extend(items)
+        elif issubclass(typ, HasProps):
+            if issubclass(typ, Model):
+                visitor(obj)
+            else:
+                # this isn't a Model, so look inside it
+                stack.extend(getattr(obj, attr) for attr in obj.properties_with_refs())
+
+
+def _clone_models(models, share_arrays=False):
+    ''' Copy a complete graph of Models, giving every copy a new id.
+
+    Property values are copied directly, without serializing or validating
+    them again, and without running the models' constructors. References
+    between the given models are replaced with references between their
+    copies, so every Model referenced by one of ``models`` must be included
+    in ``models``. Callbacks are not copied.
+
+    Args:
+        models (seq[Model]) : the models to copy
+
+        share_arrays (bool, optional) :
+            Whether copies should refer to read-only views of NumPy arrays,
+            instead of copies of them (default: False)
+
+    Returns:
+        dict : mapping from the ids of the given models to their copies
+
+    '''
+    clones = {}
+    for model in models:
+        clone = _new_instance_like(model)
+        clone._id = make_id()
+        clone._document = None
+        clone._callbacks = {}
+        clone._event_callbacks = {}
+        clones[model._id] = clone
+    for model in models:
+        _copy_property_values(model, clones[model._id], clones, share_arrays)
+    return clones
+
+
+def _new_instance_like(obj):
+    ''' Create an instance of the class of a HasProps, sharing its private
+    attributes (such as applied theme values), without calling ``__init__``.
+
+    '''
+    instance = obj.__class__.__new__(obj.__class__)
+    instance.__dict__.update(obj.__dict__)
+    return instance
+
+
+def _copy_property_values(source, target, clones, share_arrays):
+    ''' Replace the property values of ``target`` with copies of the values
+    of ``source``, and register ``target`` as the owner of copied containers.
+
+    '''
+    from .core.property.containers import PropertyValueContainer
+
+    for attr in ('_property_values', '_unstable_default_values'):
+        values = {}
+        for name, value in iteritems(getattr(source, attr)):
+            value = _copy_value(value, clones, share_arrays)
+            if isinstance(value, PropertyValueContainer):
+                value._register_owner(target, target.lookup(name))
+            values[name] = value
+        setattr(target, attr, values)
+    target._unstable_themed_values = {}
+
+
+def _copy_value(value, clones, share_arrays):
+    ''' Copy a property value, replacing Models with their copies from
+    ``clones``. Containers and arrays are copied, other values are immutable
+    in practice and are shared.
+
+    '''
+    import numpy as np
+    from .core.property.containers import PropertyValueDict
+    from .util.datatypes import RingBuffer
+
+    typ = type(value)
+    if typ in _common_types:
+        return value
+    if issubclass(typ, (list, tuple)):
+        items = [item if type(item) in _common_types else _copy_value(item, clones, share_arrays)
+                 for item in value]
+        if issubclass(typ, tuple) and typ is not tuple:
+            # namedtuple
+            return typ(*items)
+        return typ(items)
+    if issubclass(typ, dict):
+        items = [(_copy_value(key, clones, share_arrays), _copy_value(item, clones, share_arrays))
+                 for key, item in iteritems(value)]
+        return PropertyValueDict(items) if typ is PropertyValueDict else dict(items)
+    if issubclass(typ, np.ndarray):
+        if share_arrays:
+            view = value.view()
+            view.flags.writeable = False
+            return view
+        return value.copy()
+    if typ is RingBuffer:
+        return RingBuffer(value.capacity, value.dtype, data=value.array)
+    if issubclass(typ, Model):
+        return clones[value._id]
+    if issubclass(typ, HasProps):
+        copy = _new_instance_like(value)
+        _copy_property_values(value, copy, clones, share_arrays)
+        return copy
+    return value
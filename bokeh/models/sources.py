@@ -247,6 +247,18 @@ class ColumnDataSource(ColumnarDataSource):
 
             source.stream(new_data)
 
+        When streaming with a rollover, columns may be created as a
+        :class:`~bokeh.util.datatypes.RingBuffer` with a capacity equal to
+        the rollover, so that each stream only copies the new data instead
+        of the whole column:
+
+        .. code-block:: python
+
+            from bokeh.util.datatypes import RingBuffer
+
+            source = ColumnDataSource(data=dict(foo=RingBuffer(1000), bar=RingBuffer(1000)))
+            source.stream(new_data, rollover=1000)
+
         '''
         # calls internal implementation
         self._stream(new_data, rollover)
@@ -328,6 +340,10 @@ class ColumnDataSource(ColumnarDataSource):
         if len(lengths) > 1:
             raise ValueError("All streaming column updates must be the same length")
 
+        # only the new data is validated, the existing columns have already
+        # been validated and are not re-validated after streaming
+        self.lookup('data').property.validate(new_data)
+
         self.data._stream(self.document, self, new_data, rollover, setter)
 
     def patch(self, patches, setter=None):
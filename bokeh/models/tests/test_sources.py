@@ -4,6 +4,8 @@ import unittest
 from unittest import skipIf
 import warnings
 
+import mock
+
 import numpy as np
 try:
     import pandas as pd
@@ -119,6 +121,47 @@ class TestColumnDataSource(unittest.TestCase):
             str(cm.exception).startswith("stream(...) only supports 1d sequences, got ndarray with size (")
         )
 
+    def test_stream_invalid_data(self):
+        ds = ColumnDataSource(data=dict(a=[10], b=[20]))
+        with self.assertRaises(ValueError):
+            ds.stream(dict(a="xy", b="zw"))
+        self.assertEqual(ds.data, dict(a=[10], b=[20]))
+
+    def test_stream_validates_only_new_data(self):
+        ds = ColumnDataSource(data=dict(a=list(range(1000)), b=np.arange(1000)))
+        prop = ds.lookup('data').property
+        new_data = dict(a=[1000, 1001], b=np.array([1000, 1001]))
+        with mock.patch.object(prop, 'validate', wraps=prop.validate) as validate:
+            with mock.patch.object(prop, 'matches', wraps=prop.matches) as matches:
+                ds.stream(new_data)
+        validate.assert_called_once_with(new_data)
+        self.assertFalse(matches.called)
+        self.assertEqual(len(ds.data['a']), 1002)
+        self.assertEqual(len(ds.data['b']), 1002)
+
+    def test_stream_ring_buffer(self):
+        from bokeh.util.datatypes import RingBuffer
+        ds = ColumnDataSource(data=dict(a=RingBuffer(3), b=[]))
+        for i in range(5):
+            ds.stream(dict(a=[i], b=[i]), rollover=3)
+        self.assertIsInstance(ds.data['a'], RingBuffer)
+        self.assertEqual(list(ds.data['a']), [2, 3, 4])
+        self.assertEqual(ds.data['b'], [2, 3, 4])
+        out = transform_column_source_data(ds.data)
+        self.assertEqual(out['a']['shape'], (3,))
+
+    def test_stream_failure_leaves_data_unchanged(self):
+        from collections import OrderedDict
+        from bokeh.util.datatypes import RingBuffer
+        ds = ColumnDataSource(data=dict(a=[1], b=np.array([2.0]), c=RingBuffer(3, data=[3.0])))
+        # the last column fails, after the others were converted
+        new_data = OrderedDict([('a', [4]), ('b', [5.0]), ('c', ["x"])])
+        with self.assertRaises(ValueError):
+            ds.stream(new_data)
+        self.assertEqual(ds.data['a'], [1])
+        self.assertEqual(ds.data['b'].tolist(), [2.0])
+        self.assertEqual(list(ds.data['c']), [3.0])
+
     def test__stream_good_data(self):
         ds = ColumnDataSource(data=dict(a=[10], b=[20]))
         ds._document = "doc"
@@ -268,6 +311,24 @@ class TestColumnDataSource(unittest.TestCase):
         ds.set_from_json('data', json)
         self.assertTrue(np.array_equal(ds.data["foo"], data["foo"]))
 
+    def test_set_data_from_json_base64_patch(self):
+        ds = ColumnDataSource()
+        ds.set_from_json('data', transform_column_source_data({"foo": np.arange(3.0)}))
+        ds.patch(dict(foo=[(0, 10)]))
+        self.assertEqual(ds.data["foo"].tolist(), [10, 1, 2])
+        # decoded arrays may also be changed in place
+        ds.data["foo"][1] = 11
+        self.assertEqual(ds.data["foo"].tolist(), [10, 11, 2])
+
+    def test_set_data_from_json_keeps_dtype(self):
+        ds = ColumnDataSource()
+        data = {"i": np.arange(3, dtype=np.int64), "b": np.array([True, False])}
+        ds.set_from_json('data', transform_column_source_data(data))
+        self.assertEqual(ds.data["i"].dtype, np.int64)
+        self.assertEqual(ds.data["i"].tolist(), [0, 1, 2])
+        self.assertEqual(ds.data["b"].dtype, np.bool_)
+        self.assertEqual(ds.data["b"].tolist(), [True, False])
+
     def test_set_data_from_json_nested_base64(self):
         ds = ColumnDataSource()
         data = {"foo": [[np.arange(3)]]}
@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 
 import re
 import json
-from os.path import basename, join, relpath
+from os.path import basename, getmtime, join, relpath
 
 from six import string_types
 
@@ -27,7 +27,7 @@ from .settings import settings
 
 from .util.paths import bokehjsdir
 from .util.session_id import generate_session_id
-from .model import Model
+from .model import MetaModel, Model
 
 DEFAULT_SERVER_HOST = "localhost"
 DEFAULT_SERVER_PORT = 5006
@@ -131,6 +131,25 @@ def _get_server_urls(root_url, minified=True, path_versioner=None):
     }
 
 
+# Rendering resources is done for every page, so the parts that only change
+# when files or Model classes change are cached:
+#
+# * inlined files, by path and modification time
+# * external resources of Model classes, by MetaModel.model_class_generation
+# * rendered templates, by the raw code and the files they include
+_inline_cache = {}
+_external_resources_cache = {}
+_render_cache = {}
+
+def _cached_render(template, **kwargs):
+    key = (template.name,) + tuple((name, tuple(value)) for (name, value) in sorted(kwargs.items()))
+    result = _render_cache.get(key)
+    if result is None:
+        if len(_render_cache) >= 100:
+            _render_cache.clear()
+        result = _render_cache[key] = template.render(**kwargs)
+    return result
+
 class BaseResources(object):
     _default_root_dir = "."
     _default_root_url = DEFAULT_SERVER_HTTP_URL
@@ -219,6 +238,15 @@ class BaseResources(object):
     def _collect_external_resources(self, resource_attr):
         """ Collect external resources set on resource_attr attribute of all models."""
 
+        generation = (id(MetaModel.model_class_reverse_map), MetaModel.model_class_generation)
+        cached_generation, external_resources = _external_resources_cache.get(resource_attr, (None, None))
+        if cached_generation != generation:
+            external_resources = self._find_external_resources(resource_attr)
+            _external_resources_cache[resource_attr] = (generation, external_resources)
+
+        return list(external_resources)
+
+    def _find_external_resources(self, resource_attr):
         external_resources = []
 
         for _, cls in sorted(Model.model_class_reverse_map.items(), key=lambda arg: arg[0]):
@@ -261,6 +289,15 @@ class BaseResources(object):
         return (files, raw)
 
     def _inline(self, path):
+        try:
+            mtime = getmtime(path)
+        except OSError:
+            mtime = None
+
+        cached = _inline_cache.get(path)
+        if cached is not None and mtime is not None and cached[0] == mtime:
+            return cached[1]
+
         begin = "/* BEGIN %s */" % basename(path)
         try:
             with open(path, 'rb') as f:
@@ -268,7 +305,11 @@ class BaseResources(object):
         except IOError:
             middle = ""
         end = "/* END %s */"  % basename(path)
-        return "%s\n%s\n%s" % (begin, middle, end)
+        inline = "%s\n%s\n%s" % (begin, middle, end)
+
+        if mtime is not None:
+            _inline_cache[path] = (mtime, inline)
+        return inline
 
 class JSResources(BaseResources):
     ''' The Resources class encapsulates information relating to loading or embedding Bokeh Javascript.
@@ -342,7 +383,7 @@ class JSResources(BaseResources):
         return raw
 
     def render_js(self):
-        return JS_RESOURCES.render(js_raw=self.js_raw, js_files=self.js_files)
+        return _cached_render(JS_RESOURCES, js_raw=self.js_raw, js_files=self.js_files)
 
 class CSSResources(BaseResources):
     ''' The CSSResources class encapsulates information relating to loading or embedding Bokeh client-side CSS.
@@ -406,7 +447,7 @@ class CSSResources(BaseResources):
         return [ json.dumps(css) for css in self.css_raw ]
 
     def render_css(self):
-        return CSS_RESOURCES.render(css_raw=self.css_raw, css_files=self.css_files)
+        return _cached_render(CSS_RESOURCES, css_raw=self.css_raw, css_files=self.css_files)
 
 class Resources(JSResources, CSSResources):
     ''' The Resources class encapsulates information relating to loading or
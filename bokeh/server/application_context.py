@@ -10,6 +10,7 @@ from tornado import gen
 
 from .session import ServerSession
 from .exceptions import ProtocolError
+from .metrics import now
 
 from bokeh.application.application import ServerContext, SessionContext
 from bokeh.document import Document
@@ -96,11 +97,24 @@ class ApplicationContext(object):
     ''' Server-side holder for bokeh.application.Application plus any associated data.
         This holds data that's global to all sessions, while ServerSession holds
         data specific to an "instance" of the application.
+
+        If ``session_template`` is True, the application's handlers are only
+        run once, to build a template document, and every new session gets a
+        copy of that document (plus whatever session-specific setup the
+        handlers do in ``modify_session_document``). The copy replaces
+        anything ``on_session_created`` added to the session's document.
     '''
 
-    def __init__(self, application, io_loop=None, url=None):
+    def __init__(self, application, io_loop=None, url=None, patch_interval_milliseconds=0, patch_max_events=0,
+                 session_template=False, coalesce=(), metrics=None):
         self._application = application
+        self._metrics = metrics
         self._loop = io_loop
+        self._patch_interval_milliseconds = patch_interval_milliseconds
+        self._patch_max_events = patch_max_events
+        self._session_template = session_template
+        self._coalesce = coalesce
+        self._template_document = None
         self._sessions = dict()
         self._pending_sessions = dict()
         self._session_contexts = dict()
@@ -129,6 +143,34 @@ class ApplicationContext(object):
     def sessions(self):
         return self._sessions.values()
 
+    @property
+    def session_template(self):
+        return self._session_template
+
+    def _get_template_document(self):
+        if self._template_document is None:
+            template = Document()
+            self._application.initialize_document(template)
+            if template.session_callbacks or \
+               any(model._callbacks or model._event_callbacks for model in template._all_models.values()):
+                log.warning("Application at %r added Python callbacks to its session template document; "
+                            "these are not copied to sessions and should be added in on_session_document instead",
+                            self._url)
+            self._template_document = template
+        return self._template_document
+
+    def _initialize_session_document(self, doc):
+        if not self._session_template:
+            self._application.initialize_document(doc)
+            return
+
+        copy = self._get_template_document().clone()
+        doc.theme = copy.theme
+        doc.template = copy.template
+        doc.template_variables.update(copy.template_variables)
+        copy._destructively_move(doc)
+        self._application.initialize_session_document(doc)
+
     def run_load_hook(self):
         try:
             result = self._application.on_server_loaded(self.server_context)
@@ -159,6 +201,7 @@ class ApplicationContext(object):
         if session_id not in self._sessions and \
            session_id not in self._pending_sessions:
             future = self._pending_sessions[session_id] = gen.Future()
+            start = now()
 
             doc = Document()
 
@@ -179,14 +222,21 @@ class ApplicationContext(object):
             except Exception as e:
                 log.error("Failed to run session creation hooks %r", e, exc_info=True)
 
-            self._application.initialize_document(doc)
+            self._initialize_session_document(doc)
 
-            session = ServerSession(session_id, doc, io_loop=self._loop)
+            session = ServerSession(session_id, doc, io_loop=self._loop,
+                                    patch_interval_milliseconds=self._patch_interval_milliseconds,
+                                    patch_max_events=self._patch_max_events,
+                                    coalesce=self._coalesce,
+                                    metrics=self._metrics)
             del self._pending_sessions[session_id]
             self._sessions[session_id] = session
             session_context._set_session(session)
             self._session_contexts[session_id] = session_context
 
+            if self._metrics is not None:
+                self._metrics.session_creation_seconds.observe(now() - start)
+
             # notify anyone waiting on the pending session
             future.set_result(session)
 
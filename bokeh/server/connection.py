@@ -40,7 +40,24 @@ class ServerConnection(object):
     def send_patch_document(self, event):
         """ Sends a PATCH-DOC message, returning a Future that's completed when it's written out. """
         msg = self.protocol.create('PATCH-DOC', [event])
-        return self._socket.send_message(msg)
+        return self.send_message(msg)
+
+    def send_message(self, message):
+        """ Sends an already created message, returning a Future that's completed when it's written out.
+
+        The same message may be sent on several connections, its wire fragments are only serialized once.
+        """
+        return self._socket.send_message(message)
+
+    @property
+    def bytes_sent(self):
+        """ The number of bytes sent to the client so far. """
+        return self._socket.bytes_sent
+
+    @property
+    def pending_writes(self):
+        """ The number of messages waiting to be written, or being written, to the client. """
+        return self._socket.pending_writes
 
     def send_ping(self):
         self._socket.ping(codecs.encode(str(self._ping_count), "utf-8"))
@@ -40,11 +40,11 @@ class ModelChangedEvent(DocumentPatchedEvent):
 
     '''
 
-    def __init__(self, document, model, attr, old, new, serializable_new, hint=None, setter=None):
+    def __init__(self, document, model, attr, old, new, serializable_new, hint=None, setter=None, attached=()):
         '''
 
         '''
-        if setter is None and isinstance(hint, (ColumnsStreamedEvent, ColumnsPatchedEvent)):
+        if setter is None and isinstance(hint, (ColumnsStreamedEvent, ColumnsPatchedEvent, ColumnDataChangedEvent)):
             setter = hint.setter
         super(ModelChangedEvent, self).__init__(document, setter)
         self.model = model
@@ -53,6 +53,8 @@ class ModelChangedEvent(DocumentPatchedEvent):
         self.new = new
         self.serializable_new = serializable_new
         self.hint = hint
+        # the ids of the models that the change added to the document
+        self.attached = attached
 
     def dispatch(self, receiver):
         '''
@@ -105,6 +107,29 @@ class ColumnsPatchedEvent(DocumentPatchedEvent):
         if hasattr(receiver, '_columns_patched'):
             receiver._columns_patched(self)
 
+class ColumnDataChangedEvent(DocumentPatchedEvent):
+    ''' Some columns of the data of a column data source were replaced,
+    added or removed.
+
+    '''
+
+    def __init__(self, document, column_source, cols, setter=None):
+        '''
+
+        '''
+        super(ColumnDataChangedEvent, self).__init__(document, setter)
+        self.column_source = column_source
+        # the names of the replaced and added columns
+        self.cols = cols
+
+    def dispatch(self, receiver):
+        '''
+
+        '''
+        super(ColumnDataChangedEvent, self).dispatch(receiver)
+        if hasattr(receiver, '_column_data_changed'):
+            receiver._column_data_changed(self)
+
 class TitleChangedEvent(DocumentPatchedEvent):
     '''
 
@@ -122,12 +147,14 @@ class RootAddedEvent(DocumentPatchedEvent):
 
     '''
 
-    def __init__(self, document, model, setter=None):
+    def __init__(self, document, model, setter=None, attached=()):
         '''
 
         '''
         super(RootAddedEvent, self).__init__(document, setter)
         self.model = model
+        # the ids of the models that the change added to the document
+        self.attached = attached
 
 class RootRemovedEvent(DocumentPatchedEvent):
     '''
@@ -0,0 +1,247 @@
+''' Provide timing and size metrics of a Bokeh server.
+
+The metrics of a running server are available from its ``metrics``
+property, and are served in the `Prometheus`_ text format at the path given
+by its ``metrics_path`` option (``--metrics-path`` of ``bokeh serve``), if
+any, e.g.:
+
+.. code-block:: python
+
+    server.metrics.message_seconds.labels('PATCH-DOC', 'send').count
+
+The collected metrics are:
+
+``bokeh_message_seconds`` (histogram, labels ``msgtype`` and ``stage``)
+    Time spent on each stage of processing messages:
+
+    * ``receive``: from the first to the last fragment of a received message
+    * ``parse``: assembling a received message from its fragments
+    * ``handle``: handling a received message, including waiting for the
+      document lock and running any Python callbacks
+    * ``serialize``: creating and encoding a message to send
+    * ``send``: writing a message to the socket, including waiting for
+      other messages being written on the same connection
+
+``bokeh_document_lock_wait_seconds`` (histogram)
+    Time spent waiting for the document lock of a session
+
+``bokeh_document_lock_hold_seconds`` (histogram)
+    Time the document lock of a session was held
+
+``bokeh_coalesced_messages_total`` (counter, label ``msgtype``)
+    Received messages that were dropped because a newer message superseded
+    them (see the ``coalesce`` option of the server)
+
+``bokeh_session_creation_seconds`` (histogram)
+    Time to create a session, including running the application handlers
+
+``bokeh_sent_bytes_total`` (counter)
+    Bytes sent on all connections
+
+``bokeh_connection_sent_bytes`` (histogram)
+    Bytes sent on each connection, observed when it closes
+
+``bokeh_pending_writes`` (gauge)
+    Messages waiting to be written, or being written, on all connections
+
+``bokeh_write_queue_depth`` (histogram)
+    Messages waiting to be written on a connection, observed when a new
+    message is queued
+
+``bokeh_connections`` (gauge)
+    Open websocket connections
+
+.. _Prometheus: https://prometheus.io/docs/instrumenting/exposition_formats/
+
+'''
+from __future__ import absolute_import, division
+
+from bisect import bisect_left
+from collections import OrderedDict
+import time
+
+#: Return the time in seconds of a monotonic clock, if available
+now = getattr(time, 'monotonic', time.time)
+
+# seconds
+TIME_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# bytes, from 1kB to 1GB
+SIZE_BUCKETS = tuple(2**i for i in range(10, 31, 2))
+
+# number of messages
+DEPTH_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+class Counter(object):
+    ''' A value that only increases. '''
+
+    kind = "counter"
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self):
+        yield "", (), self.value
+
+class Gauge(object):
+    ''' A value that may increase and decrease. '''
+
+    kind = "gauge"
+
+    def __init__(self):
+        self.value = 0
+
+    def set(self, value):
+        self.value = value
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def dec(self, amount=1):
+        self.value -= amount
+
+    def samples(self):
+        yield "", (), self.value
+
+class Histogram(object):
+    ''' Counts of observed values, in buckets with the given upper bounds,
+    and their sum.
+
+    '''
+
+    kind = "histogram"
+
+    def __init__(self, buckets=TIME_BUCKETS):
+        self.buckets = tuple(buckets)
+        # the last count is of values above all the bounds
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            yield "_bucket", (("le", _format_value(bound)),), cumulative
+        yield "_sum", (), self.sum
+        yield "_count", (), self.count
+
+class MetricFamily(object):
+    ''' A named metric, with a separate Counter, Gauge or Histogram for each
+    combination of values of its labels.
+
+    Args:
+        name (str) : the name of the metric
+
+        help (str) : a description of the metric
+
+        metric_type (type) : Counter, Gauge or Histogram
+
+        labels (seq[str], optional) : names of the labels of the metric
+
+        **kwargs : arguments of ``metric_type``
+
+    '''
+
+    def __init__(self, name, help, metric_type, labels=(), **kwargs):
+        self.name = name
+        self.help = help
+        self.metric_type = metric_type
+        self.label_names = tuple(labels)
+        self._kwargs = kwargs
+        self._metrics = OrderedDict()
+
+    def labels(self, *values):
+        ''' Return the metric for the given label values, creating it if it
+        does not exist yet.
+
+        '''
+        if len(values) != len(self.label_names):
+            raise ValueError("%s expects values for labels %r, got %r" % (self.name, self.label_names, values))
+        metric = self._metrics.get(values)
+        if metric is None:
+            metric = self._metrics[values] = self.metric_type(**self._kwargs)
+        return metric
+
+    def __getattr__(self, name):
+        # metrics without labels can be used directly
+        if name.startswith("_") or self.label_names:
+            raise AttributeError(name)
+        return getattr(self.labels(), name)
+
+    def to_prometheus(self):
+        ''' Return the metric in the Prometheus text format. '''
+        lines = [
+            "# HELP %s %s" % (self.name, self.help),
+            "# TYPE %s %s" % (self.name, self.metric_type.kind),
+        ]
+        for values, metric in self._metrics.items():
+            labels = tuple(zip(self.label_names, values))
+            for suffix, extra_labels, value in metric.samples():
+                lines.append("%s%s%s %s" % (self.name, suffix, _format_labels(labels + extra_labels), _format_value(value)))
+        return "\n".join(lines) + "\n"
+
+class ServerMetrics(object):
+    ''' The metrics of a Bokeh server (see the module documentation).
+
+    '''
+
+    def __init__(self):
+        self.message_seconds = MetricFamily("bokeh_message_seconds",
+            "Time spent on each stage of processing messages", Histogram, labels=("msgtype", "stage"))
+        self.document_lock_wait_seconds = MetricFamily("bokeh_document_lock_wait_seconds",
+            "Time spent waiting for the document lock of a session", Histogram)
+        self.document_lock_hold_seconds = MetricFamily("bokeh_document_lock_hold_seconds",
+            "Time the document lock of a session was held", Histogram)
+        self.coalesced_messages = MetricFamily("bokeh_coalesced_messages_total",
+            "Received messages dropped because a newer message superseded them", Counter, labels=("msgtype",))
+        self.session_creation_seconds = MetricFamily("bokeh_session_creation_seconds",
+            "Time to create a session", Histogram)
+        self.sent_bytes = MetricFamily("bokeh_sent_bytes_total",
+            "Bytes sent on all connections", Counter)
+        self.connection_sent_bytes = MetricFamily("bokeh_connection_sent_bytes",
+            "Bytes sent on each connection", Histogram, buckets=SIZE_BUCKETS)
+        self.pending_writes = MetricFamily("bokeh_pending_writes",
+            "Messages waiting to be written, or being written, on all connections", Gauge)
+        self.write_queue_depth = MetricFamily("bokeh_write_queue_depth",
+            "Messages waiting to be written on a connection when a new message is queued", Histogram,
+            buckets=DEPTH_BUCKETS)
+        self.connections = MetricFamily("bokeh_connections",
+            "Open websocket connections", Gauge)
+
+        # create the metrics without labels, so that they are always reported
+        for family in self.families:
+            if not family.label_names:
+                family.labels()
+
+    @property
+    def families(self):
+        return [value for value in self.__dict__.values() if isinstance(value, MetricFamily)]
+
+    def observe_message(self, msgtype, stage, seconds):
+        self.message_seconds.labels(msgtype, stage).observe(seconds)
+
+    def to_prometheus(self):
+        ''' Return all the metrics in the Prometheus text format. '''
+        return "".join(family.to_prometheus() for family in sorted(self.families, key=lambda family: family.name))
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{%s}" % ",".join('%s="%s"' % (name, _escape(value)) for name, value in labels)
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
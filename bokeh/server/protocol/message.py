@@ -3,7 +3,10 @@
 '''
 from __future__ import absolute_import, print_function
 
-from tornado.escape import json_decode, json_encode
+from json import loads
+
+from six import string_types
+from tornado.escape import json_decode, json_encode, to_basestring
 from tornado import gen
 
 import bokeh.util.serialization as bkserial
@@ -33,6 +36,7 @@ class Message(object):
         self.metadata = metadata
         self.content = content
         self._buffers = []
+        self._buffers_wire = None
 
     def __repr__(self):
         return "Message %r (revision %d)" % (self.msgtype, self.revision)
@@ -82,7 +86,7 @@ class Message(object):
 
         Args:
             buf_header (JSON) : a buffer header
-            buf_payload (JSON or bytes) : a buffer payload
+            buf_payload (JSON, bytes or memoryview) : a buffer payload
 
         Returns:
             None
@@ -97,8 +101,9 @@ class Message(object):
             self._header['num_buffers'] = 1
 
         self._header_json = None
+        self._buffers_wire = None
 
-        self._buffers.add((buf_header, buf_payload))
+        self._buffers.append((buf_header, buf_payload))
 
     def assemble_buffer(self, buf_header, buf_payload):
         ''' Add a buffer header and payload that we read from the socket.
@@ -106,6 +111,10 @@ class Message(object):
         This differs from add_buffer() because we're validating vs.
         the header's num_buffers, instead of filling in the header.
 
+        Binary payloads are kept as a ``bytearray``. The websocket layer
+        delivers them as immutable bytes, and this is the one copy made of
+        them: arrays decoded from the message are writeable views of it.
+
         Args:
             buf_header (JSON) : a buffer header
             buf_payload (JSON or bytes) : a buffer payload
@@ -118,6 +127,8 @@ class Message(object):
         '''
         if self.header['num_buffers'] <= len(self._buffers):
             raise ProtocolError("too many buffers received expecting " + str(self.header['num_buffers']))
+        if isinstance(buf_payload, bytes):
+            buf_payload = bytearray(buf_payload)
         self._buffers.append((buf_header, buf_payload))
 
     @gen.coroutine
@@ -135,12 +146,44 @@ class Message(object):
         if conn is None:
             raise ValueError("Cannot write_buffers to connection None")
         sent = 0
-        for header, payload in self._buffers:
+        for header, payload in self.buffers_wire:
             yield conn.write_message(header, locked=locked)
             yield conn.write_message(payload, binary=True, locked=locked)
             sent += (len(header) + len(payload))
         raise gen.Return(sent)
 
+    def content_with_buffers(self):
+        ''' Return the message content, with any references to binary
+        buffers replaced by the NumPy arrays they encode.
+
+        If the message has no buffers, the content is returned unchanged.
+
+        Returns:
+            dict
+
+        Raises:
+            ValueError, if the content refers to a buffer that is missing
+
+        '''
+        if not self._buffers:
+            return self.content
+
+        buffers = {}
+        for header, payload in self._buffers:
+            if isinstance(header, string_types):
+                header = json_decode(header)
+            buffers[header['id']] = payload
+
+        def decode_buffer(obj):
+            if '__buffer__' in obj:
+                return bkserial.decode_binary_dict(obj, buffers)
+            return obj
+
+        # array data is carried by the buffers, so the content JSON is
+        # small, and parsing it again with a hook is cheaper than walking
+        # the decoded content looking for buffer references
+        return loads(to_basestring(self.content_json), object_hook=decode_buffer)
+
     @classmethod
     def create_header(cls, request_id=None):
         ''' Return a message header fragment dict.
@@ -160,6 +203,24 @@ class Message(object):
             header['reqid'] = request_id
         return header
 
+    def encode(self):
+        ''' Compute the fragments of the message sent on the wire, unless
+        they were computed already (e.g. to send the message on another
+        connection).
+
+        Returns:
+            bool : whether any fragment had to be computed
+
+        '''
+        computed = not (self._header_json and self._metadata_json and self._content_json) or self._buffers_wire is None
+        if computed:
+            # the properties keep the fragments they compute
+            self.header_json
+            self.metadata_json
+            self.content_json
+            self.buffers_wire
+        return computed
+
     @gen.coroutine
     def send(self, conn):
         ''' Send the message on the given connection.
@@ -267,3 +328,24 @@ class Message(object):
     @buffers.setter
     def buffers(self, value):
         self._buffers = list(value)
+        self._buffers_wire = None
+
+    @property
+    def buffers_wire(self):
+        ''' The buffers as (header JSON, payload bytes) pairs ready to be
+        written out, computed once so that the same message may be sent on
+        several connections.
+
+        '''
+        if self._buffers_wire is None:
+            buffers_wire = []
+            for header, payload in self._buffers:
+                if not isinstance(header, string_types):
+                    header = json_encode(header)
+                if isinstance(payload, (memoryview, bytearray)):
+                    # the websocket layer only accepts bytes, so this is the
+                    # only point at which array data is copied
+                    payload = bytes(payload)
+                buffers_wire.append((header, payload))
+            self._buffers_wire = buffers_wire
+        return self._buffers_wire
@@ -3,7 +3,11 @@
 '''
 from __future__ import absolute_import
 
+import logging
+log = logging.getLogger(__name__)
+
 from json import loads
+from ....events import Event
 from ..message import Message
 from . import register
 
@@ -20,7 +24,7 @@ class patch_doc_1(Message):
         super(patch_doc_1, self).__init__(header, metadata, content)
 
     @classmethod
-    def create(cls, events, **metadata):
+    def create(cls, events, use_buffers=True, **metadata):
         '''
 
         '''
@@ -30,7 +34,8 @@ class patch_doc_1(Message):
             raise ValueError("PATCH-DOC message requires at least one event")
         document = events[0].document
 
-        patch_json = document.create_json_patch_string(events)
+        buffers = [] if use_buffers else None
+        patch_json = document.create_json_patch_string(events, buffers=buffers)
         # this is a total hack, the need for it is because we have magic
         # type conversions in our BokehJSONEncoder which keep us from
         # easily generating non-string JSON.
@@ -38,10 +43,16 @@ class patch_doc_1(Message):
 
         msg = cls(header, metadata, content)
 
+        # we already have the content JSON, don't encode it a second time
+        msg._content_json = patch_json
+
+        for buf_header, buf_payload in buffers or []:
+            msg.add_buffer(buf_header, buf_payload)
+
         return msg
 
     def apply_to_document(self, doc, setter=None):
-        doc.apply_json_patch(self.content, setter)
+        doc.apply_json_patch(self.content_with_buffers(), setter)
 
 
 @register
@@ -53,5 +64,25 @@ class event_1(Message):
     msgtype  = 'EVENT'
     revision = 1
 
+    def __init__(self, header, metadata, content):
+        super(event_1, self).__init__(header, metadata, content)
+        self._event = None
+
+    @property
+    def event(self):
+        ''' The Event in this message, decoded only once.
+
+        Raises:
+            ValueError, if the event name is unknown
+
+        '''
+        if self._event is None:
+            self._event = loads(self.content, object_hook=Event.decode_json)
+        return self._event
+
     def notify_event(self, document):
-        document.apply_json_event(self.content)
+        event = self.event
+        if not isinstance(event, Event):
+            log.warn('Could not decode event json: %s' % self.content)
+            return
+        document.apply_event(event)
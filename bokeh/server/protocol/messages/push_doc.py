@@ -23,19 +23,23 @@ class push_doc_1(Message):
         super(push_doc_1, self).__init__(header, metadata, content)
 
     @classmethod
-    def create(cls, document, **metadata):
+    def create(cls, document, use_buffers=True, **metadata):
         '''
 
         '''
         header = cls.create_header()
 
-        content = { 'doc' : document.to_json() }
+        buffers = [] if use_buffers else None
+        content = { 'doc' : document.to_json(buffers=buffers) }
 
         msg = cls(header, metadata, content)
 
+        for buf_header, buf_payload in buffers or []:
+            msg.add_buffer(buf_header, buf_payload)
+
         return msg
 
     def push_to_document(self, doc):
         if 'doc' not in self.content:
             raise ProtocolError("No doc in PUSH-DOC")
-        doc.replace_with_json(self.content['doc'])
+        doc.replace_with_json(self.content_with_buffers()['doc'])
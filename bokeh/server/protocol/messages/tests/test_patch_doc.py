@@ -101,3 +101,67 @@ class TestPatchDocument(unittest.TestCase):
                                    hint=ColumnsPatchedEvent(sample, cds, {"a": [(0, 11)]}))
         msg5 = Protocol("1.0").create("PATCH-DOC", [event5])
         msg5.apply_to_document(sample, mock_session)
+
+    def test_create_model_changed_data_with_buffers(self):
+        import numpy as np
+        sample = self._sample_doc()
+        cds = ColumnDataSource(data={'a': np.arange(3, dtype=np.float64)})
+        sample.add_root(cds)
+        event = ModelChangedEvent(sample, cds, 'data', cds.data, cds.data, cds.lookup('data').serializable_value(cds))
+
+        msg = Protocol("1.0").create("PATCH-DOC", [event])
+        assert msg.header['num_buffers'] == 1
+        assert '__buffer__' in msg.content['events'][0]['new']['a']
+
+        msg = Protocol("1.0").create("PATCH-DOC", [event], use_buffers=False)
+        assert 'num_buffers' not in msg.header
+        assert '__ndarray__' in msg.content['events'][0]['new']['a']
+
+    def test_create_then_apply_model_changed_data_with_buffers(self):
+        import numpy as np
+        sample = self._sample_doc()
+        cds = ColumnDataSource(data={'a': np.arange(3, dtype=np.float64)})
+        sample.add_root(cds)
+        copy = document.Document.from_json_string(sample.to_json_string())
+
+        cds.data = {'a': np.arange(5, dtype=np.float64)}
+        event = ModelChangedEvent(sample, cds, 'data', None, cds.data, cds.lookup('data').serializable_value(cds))
+        msg = Protocol("1.0").create("PATCH-DOC", [event])
+        msg.apply_to_document(copy)
+
+        copy_cds = copy.get_model_by_id(cds._id)
+        assert np.array_equal(copy_cds.data['a'], np.arange(5, dtype=np.float64))
+
+    def test_create_then_apply_columns_streamed_with_buffers(self):
+        import numpy as np
+        sample = self._sample_doc()
+        cds = ColumnDataSource(data={'a': np.arange(3, dtype=np.float64)})
+        sample.add_root(cds)
+        copy = document.Document.from_json_string(sample.to_json_string())
+
+        new_data = {'a': np.array([3.0, 4.0])}
+        event = ModelChangedEvent(sample, cds, 'data', None, None, None,
+                                  hint=ColumnsStreamedEvent(sample, cds, new_data, None))
+        msg = Protocol("1.0").create("PATCH-DOC", [event])
+        assert msg.header['num_buffers'] == 1
+        msg.apply_to_document(copy)
+
+        copy_cds = copy.get_model_by_id(cds._id)
+        assert np.array_equal(copy_cds.data['a'], np.arange(5, dtype=np.float64))
+
+    def test_create_then_apply_ragged_columns_streamed(self):
+        for use_buffers in (True, False):
+            sample = self._sample_doc()
+            cds = ColumnDataSource(data={'xs': [[0, 1, 2], [3, 4]], 'y': [1, 2]})
+            sample.add_root(cds)
+            copy = document.Document.from_json_string(sample.to_json_string())
+
+            new_data = {'xs': [[5, 6], [7, 8, 9, 10]], 'y': [3, 4]}
+            event = ModelChangedEvent(sample, cds, 'data', None, None, None,
+                                      hint=ColumnsStreamedEvent(sample, cds, new_data, None))
+            msg = Protocol("1.0").create("PATCH-DOC", [event], use_buffers=use_buffers)
+            msg.apply_to_document(copy)
+
+            copy_cds = copy.get_model_by_id(cds._id)
+            assert [list(xs) for xs in copy_cds.data['xs']] == [[0, 1, 2], [3, 4], [5, 6], [7, 8, 9, 10]]
+            assert list(copy_cds.data['y']) == [1, 2, 3, 4]
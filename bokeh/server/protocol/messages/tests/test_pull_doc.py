@@ -37,3 +37,17 @@ class TestPullDocument(unittest.TestCase):
         msg.push_to_document(copy)
         assert len(sample.roots) == 2
         assert len(copy.roots) == 2
+
+    def test_create_reply_with_buffers_then_parse(self):
+        import numpy as np
+        from bokeh.models import ColumnDataSource
+        sample = self._sample_doc()
+        cds = ColumnDataSource(data={'a': np.arange(3, dtype=np.float64), 'b': [1, 2, 3]})
+        sample.add_root(cds)
+        msg = Protocol("1.0").create("PULL-DOC-REPLY", 'fakereqid', sample)
+        assert msg.header['num_buffers'] == 1
+        copy = document.Document()
+        msg.push_to_document(copy)
+        copy_cds = copy.get_model_by_id(cds._id)
+        assert np.array_equal(copy_cds.data['a'], np.arange(3, dtype=np.float64))
+        assert copy_cds.data['b'] == [1, 2, 3]
@@ -10,3 +10,11 @@ def test_create_header(monkeypatch):
     assert header['msgtype'] == 'msgtype'
     assert header['msgid'] == 'msgid'
     assert header['reqid'] == 'bar'
+
+def test_assemble_buffer_keeps_bytearray():
+    msg = message.Message(dict(num_buffers=1), {}, {})
+    msg.assemble_buffer('{"id": "bufid"}', b"\x01\x02")
+    header, payload = msg.buffers[0]
+    assert isinstance(payload, bytearray)
+    assert msg.buffers_wire == [('{"id": "bufid"}', b"\x01\x02")]
+    assert isinstance(msg.buffers_wire[0][1], bytes)
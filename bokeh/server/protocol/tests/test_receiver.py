@@ -24,3 +24,43 @@ def test_validation_success():
     assert partial.header == msg.header
     assert partial.content == msg.content
     assert partial.metadata == msg.metadata
+
+def test_validation_success_with_buffers():
+    import numpy as np
+    from json import dumps
+    from bokeh.document import Document
+    from bokeh.models import ColumnDataSource
+
+    doc = Document()
+    doc.add_root(ColumnDataSource(data=dict(a=np.arange(3, dtype=np.float64))))
+    msg = _proto.create('PULL-DOC-REPLY', 'reqid', doc)
+    r = receiver.Receiver(_proto)
+
+    partial = r.consume(decode_utf8(msg.header_json)).result()
+    assert partial is None
+
+    partial = r.consume(decode_utf8(msg.metadata_json)).result()
+    assert partial is None
+
+    partial = r.consume(decode_utf8(msg.content_json)).result()
+    assert partial is None
+
+    buf_header, buf_payload = msg.buffers[0]
+    partial = r.consume(decode_utf8(dumps(buf_header))).result()
+    assert partial is None
+
+    partial = r.consume(buf_payload.tobytes()).result()
+    assert partial is not None
+    assert partial.msgtype == msg.msgtype
+
+    copy = Document()
+    partial.push_to_document(copy)
+    a = copy.roots[0].data['a']
+    assert np.array_equal(a, np.arange(3, dtype=np.float64))
+
+    # the array is a writeable view of the received buffer, not a copy
+    _, payload = partial.buffers[0]
+    assert isinstance(payload, bytearray)
+    assert np.shares_memory(a, np.frombuffer(payload, dtype=np.uint8))
+    a[0] = 10
+    assert a.tolist() == [10, 1, 2]
@@ -103,6 +103,13 @@ class Server(object):
                                                         'check_unused_sessions_milliseconds',
                                                         'unused_session_lifetime_milliseconds',
                                                         'stats_log_frequency_milliseconds',
+                                                        'patch_interval_milliseconds',
+                                                        'patch_max_events',
+                                                        'session_template',
+                                                        'coalesce',
+                                                        'websocket_compression_level',
+                                                        'websocket_compression_min_bytes',
+                                                        'metrics_path',
                                                         ]
                            if key in kwargs }
 
@@ -175,6 +182,14 @@ class Server(object):
     def io_loop(self):
         return self._loop
 
+    @property
+    def metrics(self):
+        '''The timing and size metrics of the server (see
+        :class:`~bokeh.server.metrics.ServerMetrics`), which are also
+        served in the Prometheus text format at ``metrics_path``, if set.
+        '''
+        return self._tornado.metrics
+
     def start(self):
         ''' Start the Bokeh Server and its background tasks.
 
@@ -13,6 +13,8 @@ from tornado import gen, locks
 from ..util.tornado import yield_for_all_futures
 
 from .callbacks import _DocumentCallbackGroup
+from .events import ColumnsStreamedEvent, ModelChangedEvent
+from .metrics import now
 
 def current_time():
     '''Return the time in milliseconds since the epoch as a floating
@@ -39,32 +41,199 @@ def _needs_document_lock(func):
         # task.
         self.block_expiration()
         try:
+            wait_start = now()
             with (yield self._lock.acquire()):
-                if self._pending_writes is not None:
-                    raise RuntimeError("internal class invariant violated: _pending_writes " + \
-                                       "should be None if lock is not held")
-                self._pending_writes = []
+                hold_start = now()
                 try:
-                    result = yield yield_for_all_futures(func(self, *args, **kwargs))
+                    if self._pending_writes is not None:
+                        raise RuntimeError("internal class invariant violated: _pending_writes " + \
+                                           "should be None if lock is not held")
+                    self._pending_writes = []
+                    try:
+                        result = yield yield_for_all_futures(func(self, *args, **kwargs))
+                    finally:
+                        try:
+                            self._schedule_patches()
+                        finally:
+                            # we want to be very sure we reset this or we'll
+                            # keep hitting the RuntimeError above as soon as
+                            # any callback goes wrong
+                            pending_writes = self._pending_writes
+                            self._pending_writes = None
+                    for p in pending_writes:
+                        yield p
                 finally:
-                    # we want to be very sure we reset this or we'll
-                    # keep hitting the RuntimeError above as soon as
-                    # any callback goes wrong
-                    pending_writes = self._pending_writes
-                    self._pending_writes = None
-                for p in pending_writes:
-                    yield p
+                    if self._metrics is not None:
+                        self._metrics.document_lock_wait_seconds.observe(hold_start - wait_start)
+                        self._metrics.document_lock_hold_seconds.observe(now() - hold_start)
             raise gen.Return(result)
         finally:
             self.unblock_expiration()
     return _needs_document_lock_wrapper
 
+def _concatenate_column(old, new):
+    import numpy as np
+    if isinstance(old, np.ndarray) or isinstance(new, np.ndarray):
+        return np.concatenate([np.asarray(old), np.asarray(new)])
+    return list(old) + list(new)
+
+class _PatchBatch(object):
+    ''' Collects document change events that are to be sent to the clients
+    of a session together, in a single PATCH-DOC message.
+
+    Consecutive streams to the same column data source are concatenated
+    into one stream as they are added. Streams with any other event in
+    between are kept apart, so that the events stay in order.
+
+    '''
+
+    def __init__(self, suppressed=None):
+        self.suppressed = suppressed
+        self.events = []
+
+    def __len__(self):
+        return len(self.events)
+
+    def add(self, event):
+        if self.events and self._is_stream(event) and self._is_stream(self.events[-1]):
+            last = self.events[-1]
+            hint, previous = event.hint, last.hint
+            if last.model is event.model and previous.rollover == hint.rollover and \
+               set(previous.data) == set(hint.data):
+                self.events[-1] = self._merge_streams(event, previous)
+                return
+        self.events.append(event)
+
+    @staticmethod
+    def _is_stream(event):
+        return isinstance(event, ModelChangedEvent) and isinstance(event.hint, ColumnsStreamedEvent)
+
+    def _merge_streams(self, event, previous):
+        hint = event.hint
+        data = {}
+        for k, v in hint.data.items():
+            merged = _concatenate_column(previous.data[k], v)
+            if hint.rollover and len(merged) > hint.rollover:
+                merged = merged[-hint.rollover:]
+            data[k] = merged
+        streamed = ColumnsStreamedEvent(event.document, hint.column_source, data, hint.rollover, hint.setter)
+        return ModelChangedEvent(event.document, event.model, event.attr, event.old, event.new,
+                                 event.serializable_new, hint=streamed, setter=event.setter)
+
+class _InboundCoalescer(object):
+    ''' Drops inbound EVENT and PATCH-DOC messages that are superseded by a
+    newer message for the same UI event or model attributes while they wait
+    for the document lock.
+
+    Only EVENT messages of the given event names (e.g. ``"mousemove"``) for
+    the same model, and PATCH-DOC messages that only change the same given
+    model attributes (e.g. ``"Range1d.start"``), supersede each other. Any
+    other message ends the window in which messages may be superseded, so
+    that the messages applied before and after it stay in order.
+
+    '''
+
+    def __init__(self, names=()):
+        self.events = set(name for name in names if "." not in name)
+        self.attributes = set(name for name in names if "." in name)
+        self._latest = {}
+        # keep the messages, so that their ids are not reused
+        self._keys = {}
+        self._superseded = {}
+
+    def add(self, message):
+        ''' Record a message as it is received. '''
+        if not (self.events or self.attributes):
+            return
+        key = self._key(message)
+        if key is None:
+            self._latest.clear()
+            return
+        previous = self._latest.get(key)
+        if previous is not None:
+            del self._keys[id(previous)]
+            self._superseded[id(previous)] = previous
+        self._latest[key] = message
+        self._keys[id(message)] = (key, message)
+
+    def take(self, message):
+        ''' Return whether a message should be applied, i.e. it has not been
+        superseded by a newer one.
+
+        '''
+        if self._superseded.pop(id(message), None) is not None:
+            return False
+        key, _ = self._keys.pop(id(message), (None, None))
+        if key is not None and self._latest.get(key) is message:
+            del self._latest[key]
+        return True
+
+    def _key(self, message):
+        if message.msgtype == 'EVENT':
+            try:
+                event = message.event
+            except ValueError:
+                return None
+            if getattr(event, 'event_name', None) not in self.events:
+                return None
+            return ('EVENT', event._model_id, event.event_name)
+
+        if message.msgtype == 'PATCH-DOC':
+            content = message.content
+            if content.get('references') or not content.get('events'):
+                return None
+            attrs = set()
+            for event in content['events']:
+                if event.get('kind') != 'ModelChanged':
+                    return None
+                model = event['model']
+                if "%s.%s" % (model['type'], event['attr']) not in self.attributes:
+                    return None
+                attrs.add((model['id'], event['attr']))
+            return ('PATCH-DOC', frozenset(attrs))
+
+        return None
+
 class ServerSession(object):
     ''' Hosts an application "instance" (an instantiated Document) for one or more connections.
 
+    Changes to the document are not sent to clients immediately. They are
+    collected, and all the changes made while the document is locked are sent
+    together in one PATCH-DOC message when the lock is released (or, if
+    ``patch_interval_milliseconds`` is set, at most once per interval).
+
+    Args:
+        session_id (str) :
+            The id of the session
+
+        document (Document) :
+            The document the session hosts
+
+        io_loop (IOLoop, optional) :
+            The Tornado IOLoop to run callbacks on (default: None)
+
+        patch_interval_milliseconds (int, optional) :
+            If non-zero, the number of milliseconds to collect changes to the
+            document for before sending them to clients (default: 0)
+
+        patch_max_events (int, optional) :
+            If non-zero, changes to the document are sent as soon as this
+            many have been collected (default: 0)
+
+        coalesce (seq[str], optional) :
+            Names of UI events (e.g. ``"mousemove"``) and model attributes
+            (e.g. ``"Range1d.start"``) for which only the latest of the
+            messages received while the document is locked is applied, and
+            older ones are dropped (default: ())
+
+        metrics (ServerMetrics, optional) :
+            Metrics to record document lock and patch timings in
+            (default: None)
+
     '''
 
-    def __init__(self, session_id, document, io_loop=None):
+    def __init__(self, session_id, document, io_loop=None, patch_interval_milliseconds=0, patch_max_events=0,
+                 coalesce=(), metrics=None):
         if session_id is None:
             raise ValueError("Sessions must have an id")
         if document is None:
@@ -79,6 +248,12 @@ class ServerSession(object):
         self._document.on_change_dispatch_to(self)
         self._callbacks = _DocumentCallbackGroup(io_loop)
         self._pending_writes = None
+        self._patch_interval = patch_interval_milliseconds
+        self._patch_max_events = patch_max_events
+        self._patch_batch = _PatchBatch()
+        self._coalescer = _InboundCoalescer(coalesce)
+        self._metrics = metrics
+        self._patch_timeout = None
         self._destroyed = False
         self._expiration_requested = False
         self._expiration_blocked_count = 0
@@ -115,6 +290,9 @@ class ServerSession(object):
         self._document.delete_modules()
         self._document.remove_on_change(self)
         self._callbacks.remove_all_callbacks()
+        if self._patch_timeout is not None:
+            self._loop.remove_timeout(self._patch_timeout)
+            self._patch_timeout = None
 
     def request_expiration(self):
         """ Used in test suite for now. Forces immediate expiration if no connections."""
@@ -177,17 +355,69 @@ class ServerSession(object):
         # because if both sides change the same attribute at the
         # same time, they will each end up with the state of the
         # other and their final states will differ.
+
+        suppressed = self._current_patch_connection if may_suppress else None
+
+        # events that are not sent to the same connections can't share a message
+        if suppressed is not self._patch_batch.suppressed:
+            self._flush_patches()
+            self._patch_batch.suppressed = suppressed
+
+        self._patch_batch.add(event)
+
+        if self._patch_max_events and len(self._patch_batch) >= self._patch_max_events:
+            self._flush_patches()
+
+    def _flush_patches(self):
+        batch = self._patch_batch
+        if len(batch) == 0:
+            return
+        self._patch_batch = _PatchBatch(batch.suppressed)
+
+        # the patch is only serialized once per protocol version, and
+        # the resulting message is shared by all the connections
+        messages = {}
         for connection in self._subscribed_connections:
-            if may_suppress and connection is self._current_patch_connection:
+            if connection is batch.suppressed:
                 pass #log.debug("Not sending notification back to client %r for a change it requested", connection)
             else:
-                self._pending_writes.append(connection.send_patch_document(event))
+                version = connection.protocol.version
+                if version not in messages:
+                    start = now()
+                    messages[version] = connection.protocol.create('PATCH-DOC', batch.events)
+                    messages[version].encode()
+                    if self._metrics is not None:
+                        self._metrics.observe_message('PATCH-DOC', 'serialize', now() - start)
+                self._pending_writes.append(connection.send_message(messages[version]))
+
+    def _schedule_patches(self):
+        if len(self._patch_batch) == 0:
+            return
+        if not self._patch_interval:
+            self._flush_patches()
+        elif self._patch_timeout is None:
+            self._patch_timeout = self._loop.call_later(self._patch_interval / 1000.0, self._flush_patches_on_timeout)
+
+    @_needs_document_lock
+    def _flush_patches_on_timeout(self):
+        self._patch_timeout = None
+        self._flush_patches()
 
     @_needs_document_lock
     def _handle_pull(self, message, connection):
         log.debug("Sending pull-doc-reply from session %r", self.id)
+        # changes that are still waiting to be sent are already part of the
+        # document in the reply, and must arrive before it
+        self._flush_patches()
         return connection.protocol.create('PULL-DOC-REPLY', message.header['msgid'], self.document)
 
+    def _take_message(self, message):
+        if self._coalescer.take(message):
+            return True
+        if self._metrics is not None:
+            self._metrics.coalesced_messages.labels(message.msgtype).inc()
+        return False
+
     def _session_callback_added(self, event):
         wrapped = self._wrap_session_callback(event.callback)
         self._callbacks.add_session_callback(wrapped)
@@ -198,6 +428,7 @@ class ServerSession(object):
     @classmethod
     def pull(cls, message, connection):
         ''' Handle a PULL-DOC, return a Future with work to be scheduled. '''
+        connection.session._coalescer.add(message)
         return connection.session._handle_pull(message, connection)
 
     @_needs_document_lock
@@ -209,10 +440,14 @@ class ServerSession(object):
     @classmethod
     def push(cls, message, connection):
         ''' Handle a PUSH-DOC, return a Future with work to be scheduled. '''
+        connection.session._coalescer.add(message)
         return connection.session._handle_push(message, connection)
 
     @_needs_document_lock
     def _handle_patch(self, message, connection):
+        if not self._take_message(message):
+            return connection.ok(message)
+
         self._current_patch_connection = connection
         try:
             message.apply_to_document(self.document, self)
@@ -223,15 +458,18 @@ class ServerSession(object):
 
     @_needs_document_lock
     def _handle_event(self, message, connection):
-        message.notify_event(self.document)
+        if self._take_message(message):
+            message.notify_event(self.document)
         return connection.ok(message)
 
     @classmethod
     def event(cls, message, connection):
+        connection.session._coalescer.add(message)
         return connection.session._handle_event(message, connection)
 
 
     @classmethod
     def patch(cls, message, connection):
         ''' Handle a PATCH-DOC, return a Future with work to be scheduled. '''
+        connection.session._coalescer.add(message)
         return connection.session._handle_patch(message, connection)
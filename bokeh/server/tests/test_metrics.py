@@ -0,0 +1,66 @@
+from __future__ import absolute_import
+
+import pytest
+
+import bokeh.server.metrics as bsm
+
+def test_histogram():
+    h = bsm.Histogram(buckets=(1, 2))
+    for value in [0.5, 1, 1.5, 3]:
+        h.observe(value)
+    assert h.counts == [2, 1, 1]
+    assert h.count == 4
+    assert h.sum == 6
+    assert list(h.samples()) == [
+        ("_bucket", (("le", "1"),), 2),
+        ("_bucket", (("le", "2"),), 3),
+        ("_bucket", (("le", "+Inf"),), 4),
+        ("_sum", (), 6),
+        ("_count", (), 4),
+    ]
+
+def test_gauge_and_counter():
+    g = bsm.Gauge()
+    g.inc(3)
+    g.dec()
+    assert g.value == 2
+    g.set(5)
+    assert g.value == 5
+
+    c = bsm.Counter()
+    c.inc()
+    c.inc(10)
+    assert c.value == 11
+
+def test_metric_family_labels():
+    family = bsm.MetricFamily("test_seconds", "Test", bsm.Histogram, labels=("msgtype",))
+    family.labels("ACK").observe(0.5)
+    assert family.labels("ACK").count == 1
+    assert family.labels("OK").count == 0
+    with pytest.raises(ValueError):
+        family.labels()
+    with pytest.raises(AttributeError):
+        family.observe(1)
+
+def test_metric_family_without_labels():
+    family = bsm.MetricFamily("test_total", "Test", bsm.Counter)
+    family.inc(2)
+    assert family.value == 2
+    assert family.to_prometheus() == (
+        "# HELP test_total Test\n"
+        "# TYPE test_total counter\n"
+        "test_total 2\n"
+    )
+
+def test_server_metrics_to_prometheus():
+    metrics = bsm.ServerMetrics()
+    metrics.observe_message('PATCH-DOC', 'send', 0.002)
+    metrics.sent_bytes.inc(100)
+    text = metrics.to_prometheus()
+    assert '# TYPE bokeh_message_seconds histogram\n' in text
+    assert 'bokeh_message_seconds_bucket{msgtype="PATCH-DOC",stage="send",le="0.0025"} 1\n' in text
+    assert 'bokeh_message_seconds_bucket{msgtype="PATCH-DOC",stage="send",le="0.001"} 0\n' in text
+    assert 'bokeh_message_seconds_count{msgtype="PATCH-DOC",stage="send"} 1\n' in text
+    assert 'bokeh_sent_bytes_total 100\n' in text
+    assert 'bokeh_connections 0\n' in text
+    assert 'bokeh_session_creation_seconds_count 0\n' in text
@@ -228,6 +228,45 @@ def test__lifecycle_hooks():
     assert client_hook_list.hooks == ["session_created", "modify"]
     assert server_hook_list.hooks == ["session_created", "modify", "session_destroyed"]
 
+class SessionTemplateTestHandler(Handler):
+    def __init__(self):
+        super(SessionTemplateTestHandler, self).__init__()
+        self.documents = []
+        self.session_documents = []
+
+    def modify_document(self, doc):
+        doc.title = "Template"
+        doc.add_root(HookListModel(hooks=["template"]))
+        self.documents.append(doc)
+
+    def modify_session_document(self, doc):
+        doc.roots[0].hooks.append("session")
+        self.session_documents.append(doc)
+
+def test_session_template():
+    handler = SessionTemplateTestHandler()
+    application = Application(handler)
+    with ManagedServerLoop(application, session_template=True) as server:
+        http_get(server.io_loop, url(server))
+        http_get(server.io_loop, url(server))
+
+        assert len(handler.documents) == 1
+        assert len(handler.session_documents) == 2
+
+        sessions = server.get_sessions('/')
+        assert len(sessions) == 2
+        template_root = handler.documents[0].roots[0]
+        for session in sessions:
+            doc = session.document
+            assert doc in handler.session_documents
+            assert doc.title == "Template"
+            assert len(doc.roots) == 1
+            root = next(iter(doc.roots))
+            assert root is not template_root
+            assert root._id != template_root._id
+            assert root.hooks == ["template", "session"]
+        assert template_root.hooks == ["template"]
+
 def test_get_sessions():
     application = Application()
     with ManagedServerLoop(application) as server:
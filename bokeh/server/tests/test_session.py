@@ -39,3 +39,290 @@ def test_destroy():
         s.destroy()
         assert s.destroyed
         docroc.assert_called_with(s)
+
+def test_document_patched_serializes_once():
+    from bokeh.server.protocol import Protocol
+    d = Document()
+    s = bss.ServerSession('some-id', d, 'ioloop')
+    protocol = Protocol("1.0")
+    connections = [mock.Mock(protocol=protocol) for i in range(3)]
+    for c in connections:
+        s.subscribe(c)
+    event = mock.Mock(setter=None)
+    s._pending_writes = []
+    with mock.patch.object(protocol, 'create') as create:
+        s._document_patched(event)
+        s._flush_patches()
+        assert create.call_count == 1
+    assert len(s._pending_writes) == 3
+    sent = [c.send_message.call_args[0][0] for c in connections]
+    assert all(msg is sent[0] for msg in sent)
+
+def test_document_patched_suppresses_setter_connection():
+    from bokeh.server.protocol import Protocol
+    d = Document()
+    s = bss.ServerSession('some-id', d, 'ioloop')
+    protocol = Protocol("1.0")
+    connections = [mock.Mock(protocol=protocol) for i in range(3)]
+    for c in connections:
+        s.subscribe(c)
+    s._current_patch_connection = connections[0]
+    event = mock.Mock(setter=s)
+    s._pending_writes = []
+    with mock.patch.object(protocol, 'create'):
+        s._document_patched(event)
+        s._flush_patches()
+    assert len(s._pending_writes) == 2
+    assert not connections[0].send_message.called
+
+def test_document_patched_collects_events():
+    from bokeh.server.protocol import Protocol
+    d = Document()
+    s = bss.ServerSession('some-id', d, 'ioloop')
+    protocol = Protocol("1.0")
+    connection = mock.Mock(protocol=protocol)
+    s.subscribe(connection)
+    events = [mock.Mock(setter=None) for i in range(3)]
+    s._pending_writes = []
+    with mock.patch.object(protocol, 'create') as create:
+        for event in events:
+            s._document_patched(event)
+        assert create.call_count == 0
+        s._flush_patches()
+        create.assert_called_once_with('PATCH-DOC', events)
+    assert len(s._pending_writes) == 1
+
+def test_document_patched_max_events():
+    from bokeh.server.protocol import Protocol
+    d = Document()
+    s = bss.ServerSession('some-id', d, 'ioloop', patch_max_events=2)
+    protocol = Protocol("1.0")
+    connection = mock.Mock(protocol=protocol)
+    s.subscribe(connection)
+    events = [mock.Mock(setter=None) for i in range(3)]
+    s._pending_writes = []
+    with mock.patch.object(protocol, 'create') as create:
+        for event in events:
+            s._document_patched(event)
+        create.assert_called_once_with('PATCH-DOC', events[:2])
+        s._flush_patches()
+        create.assert_called_with('PATCH-DOC', events[2:])
+    assert len(s._pending_writes) == 2
+
+def test_document_patched_separates_suppressed_events():
+    from bokeh.server.protocol import Protocol
+    d = Document()
+    s = bss.ServerSession('some-id', d, 'ioloop')
+    protocol = Protocol("1.0")
+    connections = [mock.Mock(protocol=protocol) for i in range(2)]
+    for c in connections:
+        s.subscribe(c)
+    s._current_patch_connection = connections[0]
+    events = [mock.Mock(setter=s), mock.Mock(setter=None)]
+    s._pending_writes = []
+    with mock.patch.object(protocol, 'create') as create:
+        for event in events:
+            s._document_patched(event)
+        s._flush_patches()
+        assert create.call_args_list == [mock.call('PATCH-DOC', events[:1]), mock.call('PATCH-DOC', events[1:])]
+    assert len(s._pending_writes) == 3
+    assert connections[0].send_message.call_count == 1
+
+def test_document_patched_merges_streams():
+    import numpy as np
+    from bokeh.server.events import TitleChangedEvent
+    from bokeh.models import ColumnDataSource
+    from bokeh.server.protocol import Protocol
+    d = Document()
+    source = ColumnDataSource(data=dict(a=np.array([1, 2]), b=[1, 2]))
+    other = ColumnDataSource(data=dict(a=[1]))
+    d.add_root(source)
+    d.add_root(other)
+    s = bss.ServerSession('some-id', d, 'ioloop')
+    protocol = Protocol("1.0")
+    connection = mock.Mock(protocol=protocol)
+    s.subscribe(connection)
+    s._pending_writes = []
+    with mock.patch.object(protocol, 'create') as create:
+        source.stream(dict(a=np.array([3]), b=[3]), rollover=3)
+        source.stream(dict(a=np.array([4, 5]), b=[4, 5]), rollover=3)
+        s._flush_patches()
+        (msgtype, events), _ = create.call_args
+    assert len(events) == 1
+    assert list(events[0].hint.data['a']) == [3, 4, 5]
+    assert events[0].hint.data['b'] == [3, 4, 5]
+    assert events[0].hint.rollover == 3
+
+    with mock.patch.object(protocol, 'create') as create:
+        source.stream(dict(a=np.array([6]), b=[6]))
+        source.patch(dict(a=[(0, 10)]))
+        source.stream(dict(a=np.array([7]), b=[7]))
+        s._flush_patches()
+        (msgtype, events), _ = create.call_args
+    assert len(events) == 3
+
+    with mock.patch.object(protocol, 'create') as create:
+        source.stream(dict(a=np.array([8]), b=[8]))
+        other.stream(dict(a=[2]))
+        source.stream(dict(a=np.array([9]), b=[9]))
+        d.title = "title"
+        source.stream(dict(a=np.array([10]), b=[10]))
+        source.stream(dict(a=np.array([11]), b=[11]))
+        s._flush_patches()
+        (msgtype, events), _ = create.call_args
+    assert [e.model for e in events[:3]] == [source, other, source]
+    assert [list(e.hint.data['a']) for e in events[:3]] == [[8], [2], [9]]
+    assert isinstance(events[3], TitleChangedEvent)
+    assert list(events[4].hint.data['b']) == [10, 11]
+    assert len(events) == 5
+
+def test_with_document_locked_sends_one_patch():
+    from tornado.concurrent import Future
+    from tornado.ioloop import IOLoop
+    from bokeh.models import ColumnDataSource
+    from bokeh.server.protocol import Protocol
+    d = Document()
+    source = ColumnDataSource(data=dict(a=[1, 2]))
+    d.add_root(source)
+    loop = IOLoop()
+    try:
+        s = bss.ServerSession('some-id', d, loop)
+        protocol = Protocol("1.0")
+        connection = mock.Mock(protocol=protocol)
+        sent = Future()
+        sent.set_result(None)
+        connection.send_message.return_value = sent
+        s.subscribe(connection)
+        def change():
+            source.data = dict(a=[3, 4])
+            source.stream(dict(a=[5]))
+            d.title = "new title"
+        loop.run_sync(lambda: s.with_document_locked(change))
+    finally:
+        loop.close()
+    assert connection.send_message.call_count == 1
+    msg = connection.send_message.call_args[0][0]
+    assert [e['kind'] for e in msg.content['events']] == ['ModelChanged', 'TitleChanged']
+
+def _event_message(event_name, model_id, **values):
+    import json
+    from bokeh.server.protocol.messages.patch_doc import event_1
+    values['model_id'] = model_id
+    content = json.dumps(dict(event_name=event_name, event_values=values))
+    return event_1(dict(msgtype='EVENT', msgid='1'), {}, content)
+
+def _patch_message(doc, model, **attrs):
+    from bokeh.server.protocol import Protocol
+    events = []
+    def record(event):
+        events.append(event)
+    doc.on_change(record)
+    for attr, value in sorted(attrs.items()):
+        setattr(model, attr, value)
+    doc.remove_on_change(record)
+    return Protocol("1.0").create('PATCH-DOC', events)
+
+def test_inbound_coalescer_events():
+    from bokeh.models import Plot
+    coalescer = bss._InboundCoalescer(["mousemove"])
+    plot1, plot2 = Plot(), Plot()
+    messages = [_event_message('mousemove', plot1._id, sx=i, sy=0, x=i, y=0) for i in range(3)]
+    other = _event_message('mousemove', plot2._id, sx=0, sy=0, x=0, y=0)
+    tap = _event_message('tap', plot1._id, sx=0, sy=0, x=0, y=0)
+    for msg in messages[:2] + [other, tap, messages[2]]:
+        coalescer.add(msg)
+    # the tap keeps the second mousemove from superseding the first one
+    assert [coalescer.take(msg) for msg in messages] == [False, True, True]
+    assert coalescer.take(other)
+    assert coalescer.take(tap)
+    assert coalescer._latest == {} and coalescer._keys == {} and coalescer._superseded == {}
+
+def test_inbound_coalescer_patches():
+    from bokeh.models import Range1d
+    d = Document()
+    r = Range1d()
+    d.add_root(r)
+    coalescer = bss._InboundCoalescer(["Range1d.start", "Range1d.end"])
+    starts = [_patch_message(d, r, start=i + 0.5) for i in range(3)]
+    ends = [_patch_message(d, r, end=i + 10.5) for i in range(3)]
+    both = _patch_message(d, r, start=10, end=20)
+    bounds = _patch_message(d, r, bounds=(0, 100))
+    for msg in [starts[0], ends[0], starts[1], ends[1], both, bounds, starts[2], ends[2]]:
+        coalescer.add(msg)
+    assert [coalescer.take(msg) for msg in starts] == [False, True, True]
+    assert [coalescer.take(msg) for msg in ends] == [False, True, True]
+    assert coalescer.take(both)
+    assert coalescer.take(bounds)
+
+def test_inbound_coalescer_disabled():
+    from bokeh.models import Plot
+    coalescer = bss._InboundCoalescer()
+    messages = [_event_message('mousemove', Plot()._id, sx=i, sy=0, x=i, y=0) for i in range(2)]
+    for msg in messages:
+        coalescer.add(msg)
+    assert all(coalescer.take(msg) for msg in messages)
+
+def test_handle_event_coalesced():
+    from tornado import gen
+    from tornado.ioloop import IOLoop
+    from bokeh import events
+    from bokeh.models import Plot
+    from bokeh.server.metrics import ServerMetrics
+    d = Document()
+    plot = Plot()
+    d.add_root(plot)
+    received = []
+    plot.on_event(events.MouseMove, lambda event: received.append(event.x))
+    metrics = ServerMetrics()
+    loop = IOLoop()
+    try:
+        s = bss.ServerSession('some-id', d, loop, coalesce=["mousemove"], metrics=metrics)
+        connection = mock.Mock(session=s)
+
+        @gen.coroutine
+        def handle():
+            # messages arrive while the document is locked
+            lock = yield s._lock.acquire()
+            with lock:
+                futures = [bss.ServerSession.event(_event_message('mousemove', plot._id, sx=i, sy=0, x=i, y=0),
+                                                   connection)
+                           for i in range(5)]
+            yield futures
+
+        loop.run_sync(handle)
+    finally:
+        loop.close()
+    assert received == [4]
+    assert connection.ok.call_count == 5
+    assert metrics.coalesced_messages.labels('EVENT').value == 4
+
+def test_destroy_cancels_debounced_callbacks():
+    from tornado.ioloop import IOLoop
+    from bokeh.models import Slider
+    d = Document()
+    d._session_context = mock.Mock()
+    slider = Slider(start=0, end=10, value=0, step=1)
+    d.add_root(slider)
+    changes = []
+    slider.on_change('value', lambda attr, old, new: changes.append(new), debounce=50)
+    loop = IOLoop()
+    try:
+        s = bss.ServerSession('some-id', d, loop)
+        def drag():
+            for value in range(1, 5):
+                slider.value = value
+        loop.run_sync(lambda: s.with_document_locked(drag))
+        assert len(s._callbacks._removers) == 1
+        loop.run_sync(lambda: s.with_document_locked(lambda: setattr(slider, 'value', 5)))
+        loop.call_later(0.1, loop.stop)
+        loop.start()
+        assert changes == [5]
+
+        loop.run_sync(lambda: s.with_document_locked(lambda: setattr(slider, 'value', 6)))
+        s.destroy()
+        assert len(s._callbacks._removers) == 0
+        loop.call_later(0.1, loop.stop)
+        loop.start()
+        assert changes == [5]
+    finally:
+        loop.close()
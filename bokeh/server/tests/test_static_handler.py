@@ -0,0 +1,79 @@
+from __future__ import absolute_import
+
+import gzip
+import io
+
+import mock
+import pytest
+
+from tornado.httpclient import HTTPError
+
+import bokeh.server.views.static_handler as static_handler
+from bokeh.application import Application
+from bokeh.settings import settings
+
+from .utils import ManagedServerLoop, url, http_get
+
+@pytest.fixture
+def bokehjsdir(tmpdir, monkeypatch):
+    tmpdir.mkdir("js").join("bokeh.min.js").write("var bokeh = 1;\n" * 1000)
+    tmpdir.mkdir("css").join("bokeh.min.css").write(".bk { color: red; }\n" * 1000)
+    monkeypatch.setattr(static_handler, "_cached_files", {})
+    with mock.patch.object(settings, "bokehjsdir", return_value=str(tmpdir)):
+        yield tmpdir
+
+def test__accepted_encodings():
+    assert static_handler._accepted_encodings("") == set()
+    assert static_handler._accepted_encodings("gzip, deflate, br") == {"gzip", "deflate", "br"}
+    assert static_handler._accepted_encodings("gzip;q=0, br;q=0.5") == {"br"}
+
+def test_preload(bokehjsdir):
+    with mock.patch.object(settings, "js_files", return_value=[str(bokehjsdir.join("js", "bokeh.min.js"))]):
+        with mock.patch.object(settings, "css_files", return_value=[str(bokehjsdir.join("css", "bokeh.min.css"))]):
+            with ManagedServerLoop(Application()):
+                pass
+    assert sorted(static_handler._cached_files) == [str(bokehjsdir.join("css", "bokeh.min.css")),
+                                                    str(bokehjsdir.join("js", "bokeh.min.js"))]
+
+def test_static_gzip(bokehjsdir):
+    with ManagedServerLoop(Application()) as server:
+        plain = http_get(server.io_loop, url(server) + "static/js/bokeh.min.js",
+                         headers={"Accept-Encoding": "identity"}, decompress_response=False)
+        assert plain.body == b"var bokeh = 1;\n" * 1000
+        assert "Content-Encoding" not in plain.headers
+
+        # the first request cached the file
+        assert str(bokehjsdir.join("js", "bokeh.min.js")) in static_handler._cached_files
+        bokehjsdir.join("js", "bokeh.min.js").remove()
+
+        compressed = http_get(server.io_loop, url(server) + "static/js/bokeh.min.js",
+                              headers={"Accept-Encoding": "gzip"}, decompress_response=False)
+        assert compressed.headers["Content-Encoding"] == "gzip"
+        assert compressed.headers["Vary"] == "Accept-Encoding"
+        assert len(compressed.body) < len(plain.body)
+        assert gzip.GzipFile(fileobj=io.BytesIO(compressed.body)).read() == plain.body
+        assert compressed.headers["Etag"] != plain.headers["Etag"]
+
+def test_static_not_modified(bokehjsdir):
+    with ManagedServerLoop(Application()) as server:
+        response = http_get(server.io_loop, url(server) + "static/css/bokeh.min.css",
+                            headers={"Accept-Encoding": "gzip"}, decompress_response=False)
+        etag = response.headers["Etag"]
+
+        with pytest.raises(HTTPError) as e:
+            http_get(server.io_loop, url(server) + "static/css/bokeh.min.css",
+                     headers={"Accept-Encoding": "gzip", "If-None-Match": etag}, decompress_response=False)
+        assert e.value.code == 304
+
+        # a different representation does not match
+        response = http_get(server.io_loop, url(server) + "static/css/bokeh.min.css",
+                            headers={"If-None-Match": etag}, decompress_response=False)
+        assert response.code == 200
+
+def test_static_range(bokehjsdir):
+    with ManagedServerLoop(Application()) as server:
+        http_get(server.io_loop, url(server) + "static/js/bokeh.min.js")
+        response = http_get(server.io_loop, url(server) + "static/js/bokeh.min.js",
+                            headers={"Range": "bytes=0-9"}, decompress_response=False)
+        assert response.code == 206
+        assert response.body == b"var bokeh "
@@ -3,6 +3,9 @@ from __future__ import absolute_import, print_function
 import logging
 import json
 
+import pytest
+from tornado.httpclient import HTTPError
+
 import bokeh.server.tornado as tornado
 
 from bokeh.application import Application
@@ -133,3 +136,46 @@ def test_metadata():
         meta_resp = http_get(server.io_loop, meta_url)
         meta_json = json.loads(meta_resp.buffer.read().decode())
         assert meta_json == {'data': {'name': 'myname', 'value': 'no value'}, 'url': '/'}
+
+def test_metrics():
+    application = Application()
+    with ManagedServerLoop(application, metrics_path='/metrics') as server:
+        session = pull_session(session_id='session1',
+                               url=url(server),
+                               io_loop=server.io_loop)
+        metrics = server.metrics
+        assert metrics.session_creation_seconds.count == 1
+        assert metrics.message_seconds.labels('PULL-DOC-REQ', 'handle').count == 1
+        assert metrics.message_seconds.labels('PULL-DOC-REPLY', 'send').count == 1
+        assert metrics.connections.value == 1
+        assert metrics.sent_bytes.value > 0
+        assert metrics.document_lock_hold_seconds.count > 0
+
+        response = http_get(server.io_loop, url(server) + 'metrics')
+        assert response.headers['Content-Type'].startswith('text/plain')
+        text = response.body.decode('utf-8')
+        assert 'bokeh_message_seconds_count{msgtype="PULL-DOC-REQ",stage="handle"} 1\n' in text
+        assert 'bokeh_connections 1\n' in text
+
+        session.close()
+        session.loop_until_closed()
+
+def test_metrics_not_served_by_default():
+    application = Application()
+    with ManagedServerLoop(application) as server:
+        with pytest.raises(HTTPError) as e:
+            http_get(server.io_loop, url(server) + 'metrics')
+        assert e.value.code == 404
+        # the metrics are still collected
+        assert server.metrics.connections.value == 0
+
+def test_metrics_path_conflicts():
+    app = Application()
+    with pytest.raises(ValueError):
+        tornado.BokehTornado({"/": app, "/metrics": app}, "", [], metrics_path="/metrics")
+    with pytest.raises(ValueError):
+        tornado.BokehTornado({"/": app}, "", [], metrics_path="/ws")
+    with pytest.raises(ValueError):
+        tornado.BokehTornado({"/": app}, "", [], metrics_path="metrics")
+    t = tornado.BokehTornado({"/": app, "/foo": app}, "/prefix", [], metrics_path="/metrics")
+    assert any(r.matcher.regex.pattern == "/prefix/metrics$" for r in t.wildcard_router.rules)
@@ -11,7 +11,7 @@ def url(server, prefix=""):
 def ws_url(server, prefix=""):
     return "ws://localhost:" + str(server.port) + prefix + "/ws"
 
-def http_get(io_loop, url):
+def http_get(io_loop, url, **kwargs):
     result = {}
     def handle_request(response):
         result['response'] = response
@@ -20,8 +20,8 @@ def http_get(io_loop, url):
     # for some reason passing a loop to AsyncHTTPClient is deprecated
     assert io_loop is IOLoop.current()
     http_client = AsyncHTTPClient()
-    headers = dict()
-    http_client.fetch(url, handle_request, headers=headers)
+    kwargs.setdefault('headers', dict())
+    http_client.fetch(url, handle_request, **kwargs)
     io_loop.start()
 
     if 'response' not in result:
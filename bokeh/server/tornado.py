@@ -10,6 +10,7 @@ log = logging.getLogger(__name__)
 from concurrent.futures import ProcessPoolExecutor
 import os
 from pprint import pformat
+import re
 
 from tornado import gen
 from tornado.ioloop import PeriodicCallback
@@ -23,6 +24,8 @@ from .views.root_handler import RootHandler
 from .urls import per_app_patterns, toplevel_patterns
 from .connection import ServerConnection
 from .application_context import ApplicationContext
+from .metrics import ServerMetrics
+from .views.metrics_handler import MetricsHandler
 from .views.static_handler import StaticHandler
 
 def match_host(host, pattern):
@@ -120,6 +123,20 @@ class BokehTornado(TornadoApplication):
         check_unused_sessions_milliseconds (int) : number of milliseconds between check for unused sessions
         unused_session_lifetime_milliseconds (int) : number of milliseconds for unused session lifetime
         stats_log_frequency_milliseconds (int) : number of milliseconds between logging stats
+        patch_interval_milliseconds (int) : number of milliseconds to collect document changes for before sending them
+            Set to 0 to send the changes as soon as the document is unlocked.
+        patch_max_events (int) : number of document changes to collect before sending them immediately
+            Set to 0 for no limit.
+        session_template (boolean) : True to run each application's handlers only once, and give every
+            session a copy of the resulting document
+        coalesce (seq[str]) : names of UI events (e.g. "mousemove") and model attributes (e.g. "Range1d.start")
+            for which only the latest of the messages received while a session's document is locked is applied
+        websocket_compression_level (int) : zlib compression level (1-9) for per-message websocket compression
+            Set to 0 to disable websocket compression.
+        websocket_compression_min_bytes (int) : messages shorter than this many bytes are sent uncompressed
+        metrics_path (str) : path at which to serve the server metrics in the Prometheus text format, e.g. "/metrics"
+            The metrics are not served if None. They are served to anyone who can reach the server, so the
+            path should not be reachable from untrusted networks. It must not be a path of an application.
         use_index (boolean) : True to generate an index of the running apps in the RootHandler
 
     '''
@@ -139,10 +156,27 @@ class BokehTornado(TornadoApplication):
                  unused_session_lifetime_milliseconds=15000,
                  # how often to log stats
                  stats_log_frequency_milliseconds=15000,
+                 # how long to collect document changes for before sending them
+                 patch_interval_milliseconds=0,
+                 # how many document changes to collect before sending them
+                 patch_max_events=0,
+                 # whether to build one document per app and copy it into sessions
+                 session_template=False,
+                 # events and model attributes for which only the latest received message is applied
+                 coalesce=(),
+                 # zlib level for websocket messages, 0 to disable compression
+                 websocket_compression_level=0,
+                 # don't compress websocket messages shorter than this
+                 websocket_compression_min_bytes=1024,
+                 # where to serve the metrics, None to not serve them
+                 metrics_path=None,
                  use_index=True,
                  redirect_root=True):
 
         self._prefix = prefix
+        self._resources = {}
+
+        StaticHandler.preload()
         self.use_index = use_index
 
         if keep_alive_milliseconds < 0:
@@ -158,17 +192,43 @@ class BokehTornado(TornadoApplication):
         if stats_log_frequency_milliseconds <= 0:
             raise ValueError("stats_log_frequency_milliseconds must be > 0")
 
+        if patch_interval_milliseconds < 0:
+            # 0 means "send when the document is unlocked"
+            raise ValueError("patch_interval_milliseconds must be >= 0")
+
+        if patch_max_events < 0:
+            # 0 means "no limit"
+            raise ValueError("patch_max_events must be >= 0")
+
+        if not 0 <= websocket_compression_level <= 9:
+            # 0 means "disable"
+            raise ValueError("websocket_compression_level must be between 0 and 9")
+
+        if websocket_compression_min_bytes < 0:
+            raise ValueError("websocket_compression_min_bytes must be >= 0")
+
+        if metrics_path is not None and not metrics_path.startswith("/"):
+            raise ValueError("metrics_path must start with '/'")
+
         self._websocket_origins = set(extra_websocket_origins)
         self._secret_key = secret_key
         self._sign_sessions = sign_sessions
         self._generate_session_ids = generate_session_ids
+        self._websocket_compression_level = websocket_compression_level
+        self._websocket_compression_min_bytes = websocket_compression_min_bytes
+        self._metrics = ServerMetrics()
 
         log.debug("These host origins can connect to the websocket: %r", list(self._websocket_origins))
 
         # Wrap applications in ApplicationContext
         self._applications = dict()
         for k,v in applications.items():
-            self._applications[k] = ApplicationContext(v,url=k)
+            self._applications[k] = ApplicationContext(v, url=k,
+                                                       patch_interval_milliseconds=patch_interval_milliseconds,
+                                                       patch_max_events=patch_max_events,
+                                                       session_template=session_template,
+                                                       coalesce=coalesce,
+                                                       metrics=self._metrics)
 
         extra_patterns = extra_patterns or []
         all_patterns = []
@@ -214,6 +274,15 @@ class BokehTornado(TornadoApplication):
                 prefixed_pat = (self._prefix + p[0],) + p[1:]
                 all_patterns.append(prefixed_pat)
 
+        if metrics_path is not None:
+            # otherwise either the metrics or the other route would be
+            # silently unreachable
+            route = self._prefix + metrics_path
+            for p in all_patterns:
+                if re.match(p[0] + "$", route):
+                    raise ValueError("metrics_path %r is already a path of the server (%r)" % (route, p[0]))
+            all_patterns.append((route, MetricsHandler))
+
         log.debug("Patterns are:")
         for line in pformat(all_patterns, width=60).split("\n"):
             log.debug("  " + line)
@@ -263,6 +332,21 @@ class BokehTornado(TornadoApplication):
     def websocket_origins(self):
         return self._websocket_origins
 
+    @property
+    def websocket_compression_level(self):
+        return self._websocket_compression_level
+
+    @property
+    def websocket_compression_min_bytes(self):
+        return self._websocket_compression_min_bytes
+
+    @property
+    def metrics(self):
+        ''' The :class:`~bokeh.server.metrics.ServerMetrics` of this server.
+
+        '''
+        return self._metrics
+
     @property
     def secret_key(self):
         return self._secret_key
@@ -276,9 +360,19 @@ class BokehTornado(TornadoApplication):
         return self._generate_session_ids
 
     def resources(self, absolute_url=None):
-        if absolute_url:
-            return Resources(mode="server", root_url=absolute_url + self._prefix, path_versioner=StaticHandler.append_version)
-        return Resources(mode="server", root_url=self._prefix, path_versioner=StaticHandler.append_version)
+        # the resources are the same for every request to the same URL, and
+        # are not modified by their users, so they are created only once
+        # (absolute URLs come from requests, so only a few are kept)
+        resources = self._resources.get(absolute_url)
+        if resources is None:
+            if len(self._resources) >= 100:
+                self._resources.clear()
+            if absolute_url:
+                resources = Resources(mode="server", root_url=absolute_url + self._prefix, path_versioner=StaticHandler.append_version)
+            else:
+                resources = Resources(mode="server", root_url=self._prefix, path_versioner=StaticHandler.append_version)
+            self._resources[absolute_url] = resources
+        return resources
 
     def start(self):
         ''' Start the Bokeh Server application.
@@ -321,10 +415,12 @@ class BokehTornado(TornadoApplication):
     def new_connection(self, protocol, socket, application_context, session):
         connection = ServerConnection(protocol, socket, application_context, session)
         self._clients.add(connection)
+        self._metrics.connections.set(len(self._clients))
         return connection
 
     def client_lost(self, connection):
         self._clients.discard(connection)
+        self._metrics.connections.set(len(self._clients))
         connection.detach_session()
 
     def get_session(self, app_path, session_id):
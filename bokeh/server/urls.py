@@ -14,7 +14,7 @@ from .views.autoload_js_handler import AutoloadJsHandler
 
 toplevel_patterns = [
     (r'/?', RootHandler),
-    (r'/static/(.*)', StaticHandler)
+    (r'/static/(.*)', StaticHandler),
 ]
 
 # these all also get prefixed with the application route
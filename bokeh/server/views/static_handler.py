@@ -6,14 +6,91 @@ from __future__ import absolute_import, print_function
 import logging
 log = logging.getLogger(__name__)
 
+import datetime
+import gzip
+import hashlib
+import io
+import mimetypes
+import os
+
 from tornado.web import StaticFileHandler
 
 from bokeh.settings import settings
+from bokeh.util.dependencies import import_optional
+
+brotli = import_optional('brotli')
+
+# content types that are worth compressing
+_compressible_types = set([
+    "application/javascript",
+    "application/json",
+    "application/x-javascript",
+    "image/svg+xml",
+])
+
+class _CachedFile(object):
+    ''' The content of a static file, along with its version hash and any
+    compressed variants, kept in memory.
+
+    '''
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.content = f.read()
+        self.version = hashlib.md5(self.content).hexdigest()
+        stat = os.stat(path)
+        self.modified = datetime.datetime.utcfromtimestamp(int(stat.st_mtime))
+
+        # compressed variants, by content encoding, in order of preference
+        self.encodings = []
+        content_type, _ = mimetypes.guess_type(path)
+        if content_type is not None and (content_type.startswith("text/") or content_type in _compressible_types):
+            if brotli is not None:
+                self._add_encoding("br", brotli.compress(self.content))
+            self._add_encoding("gzip", _gzip(self.content))
+
+    def _add_encoding(self, encoding, content):
+        if len(content) < len(self.content):
+            self.encodings.append((encoding, content))
+
+def _gzip(content):
+    buf = io.BytesIO()
+    # mtime=0 so that the compressed bytes only depend on the content
+    with gzip.GzipFile(fileobj=buf, mode="wb", compresslevel=9, mtime=0) as f:
+        f.write(content)
+    return buf.getvalue()
+
+def _accepted_encodings(header):
+    ''' Return the content encodings allowed by an Accept-Encoding header. '''
+    accepted = set()
+    for item in header.split(","):
+        params = item.strip().split(";")
+        encoding = params[0].strip().lower()
+        for param in params[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip() == "q":
+                try:
+                    if float(value) == 0:
+                        break
+                except ValueError:
+                    break
+        else:
+            if encoding:
+                accepted.add(encoding)
+    return accepted
+
+_cached_files = {}
 
 class StaticHandler(StaticFileHandler):
     ''' Implements a custom Tornado static file handler for BokehJS
     JavaScript and CSS resources.
 
+    Except in dev mode, files are kept in memory once they have been read,
+    together with gzip (and, if the ``brotli`` package is available, brotli)
+    compressed versions of them. Requests for them, including conditional
+    requests with ``If-None-Match`` headers, are answered without touching
+    the disk. Use ``preload`` to read the BokehJS files in advance.
+
     '''
     def __init__(self, tornado_app, *args, **kw):
         kw['path'] = settings.bokehjsdir()
@@ -21,6 +98,105 @@ class StaticHandler(StaticFileHandler):
         # Note: tornado_app is stored as self.application
         super(StaticHandler, self).__init__(tornado_app, *args, **kw)
 
+        self._cached_file = None
+        self._content_encoding = None
+
+    @classmethod
+    def preload(cls):
+        ''' Read the BokehJS JavaScript and CSS files into memory, and
+        compress them, so that the first requests for them are fast too.
+
+        Does nothing in dev mode, where the files may change.
+
+        '''
+        if settings.dev:
+            return
+        for path in settings.js_files() + settings.css_files():
+            cls._get_cached_file(os.path.abspath(path))
+
+    @classmethod
+    def _get_cached_file(cls, abspath):
+        if settings.dev:
+            return None
+        cached = _cached_files.get(abspath)
+        if cached is None and os.path.isfile(abspath):
+            cached = _cached_files[abspath] = _CachedFile(abspath)
+        return cached
+
+    def get(self, path, include_body=True):
+        absolute_path = self.get_absolute_path(self.root, self.parse_url_path(path))
+        cached = _cached_files.get(absolute_path)
+
+        # partial content is left to StaticFileHandler, which will also
+        # cache any files that are not cached yet, for the next request
+        if cached is None or self.request.headers.get("Range"):
+            return super(StaticHandler, self).get(path, include_body)
+
+        self.path = self.parse_url_path(path)
+        self.absolute_path = absolute_path
+        self._cached_file = cached
+        self.modified = cached.modified
+
+        content = cached.content
+        accepted = _accepted_encodings(self.request.headers.get("Accept-Encoding", ""))
+        for encoding, encoded in cached.encodings:
+            if encoding in accepted:
+                self._content_encoding = encoding
+                content = encoded
+                break
+
+        self.set_headers()
+        if cached.encodings:
+            self.set_header("Vary", "Accept-Encoding")
+        if self._content_encoding is not None:
+            self.set_header("Content-Encoding", self._content_encoding)
+
+        if self.should_return_304():
+            self.set_status(304)
+            return
+
+        self.set_header("Content-Length", len(content))
+        if include_body:
+            self.write(content)
+
+    def validate_absolute_path(self, root, absolute_path):
+        absolute_path = super(StaticHandler, self).validate_absolute_path(root, absolute_path)
+        if absolute_path is not None:
+            self._cached_file = self._get_cached_file(absolute_path)
+        return absolute_path
+
+    def compute_etag(self):
+        # compressed variants are different representations, so they need
+        # their own strong ETags
+        etag = super(StaticHandler, self).compute_etag()
+        if etag is not None and self._content_encoding is not None:
+            etag = '"%s-%s"' % (etag.strip('"'), self._content_encoding)
+        return etag
+
+    @classmethod
+    def get_content(cls, abspath, start=None, end=None):
+        cached = _cached_files.get(abspath)
+        if cached is None:
+            return super(StaticHandler, cls).get_content(abspath, start, end)
+        return cached.content[start:end]
+
+    @classmethod
+    def get_content_version(cls, abspath):
+        cached = _cached_files.get(abspath)
+        if cached is None:
+            return super(StaticHandler, cls).get_content_version(abspath)
+        return cached.version
+
+    def get_content_size(self):
+        if self._cached_file is None:
+            return super(StaticHandler, self).get_content_size()
+        return len(self._cached_file.content)
+
+    def get_modified_time(self):
+        if self._cached_file is None:
+            return super(StaticHandler, self).get_modified_time()
+        return self._cached_file.modified
+
     # We aren't using tornado's built-in static_path function
     # because it relies on TornadoApplication's autoconfigured
     # static handler instead of our custom one. We have a
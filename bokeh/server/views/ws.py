@@ -15,12 +15,14 @@ from tornado.websocket import WebSocketHandler, WebSocketClosedError
 from tornado.concurrent import Future
 
 from ..exceptions import MessageError, ProtocolError, ValidationError
+from ..metrics import now
 from ..protocol import Protocol
 from ..protocol.message import Message
 from ..protocol.receiver import Receiver
 from ..protocol.server_handler import ServerHandler
 
 from bokeh.util.session_id import check_session_id_signature
+from bokeh.util.tornado import write_websocket_message
 
 class WSHandler(WebSocketHandler):
     ''' Implements a custom Tornado WebSocketHandler for the Bokeh Server.
@@ -35,6 +37,12 @@ class WSHandler(WebSocketHandler):
         # write_lock allows us to lock the connection to send multiple
         # messages atomically.
         self.write_lock = locks.Lock()
+        self.bytes_sent = 0
+        self.pending_writes = 0
+        # when the first fragment of the message being received arrived,
+        # and the time spent assembling the message so far
+        self._receive_start = None
+        self._parse_seconds = 0
         # Note: tornado_app is stored as self.application
         super(WSHandler, self).__init__(tornado_app, *args, **kw)
 
@@ -57,6 +65,16 @@ class WSHandler(WebSocketHandler):
                       origin, origin_host, allowed_hosts)
             return False
 
+    def get_compression_options(self):
+        ''' Enable per-message compression if the Bokeh server is
+        configured with a websocket compression level.
+
+        '''
+        level = self.application.websocket_compression_level
+        if level > 0:
+            return dict(compression_level=level)
+        return None
+
     def open(self):
         ''' Initialize a connection to a client.
 
@@ -136,6 +154,12 @@ class WSHandler(WebSocketHandler):
         # do with them other than report them as an unhandled
         # Future
 
+        metrics = self.application.metrics
+
+        start = now()
+        if self._receive_start is None:
+            self._receive_start = start
+
         try:
             message = yield self._receive(fragment)
         except Exception as e:
@@ -144,11 +168,19 @@ class WSHandler(WebSocketHandler):
             log.error("Unhandled exception receiving a message: %r: %r", e, fragment, exc_info=True)
             self._internal_error("server failed to parse a message")
 
+        self._parse_seconds += now() - start
+
         try:
             if message:
+                metrics.observe_message(message.msgtype, 'receive', start - self._receive_start)
+                metrics.observe_message(message.msgtype, 'parse', self._parse_seconds)
+                self._receive_start = None
+                self._parse_seconds = 0
 
                 #log.debug("Received message: %r", message)
+                start = now()
                 work = yield self._handle(message)
+                metrics.observe_message(message.msgtype, 'handle', now() - start)
 
                 #log.debug("work from message %r was %r", message, work)
 
@@ -178,18 +210,39 @@ class WSHandler(WebSocketHandler):
             message (Message) : a message to send
 
         '''
+        metrics = self.application.metrics
+
+        start = now()
+        if message.encode():
+            metrics.observe_message(message.msgtype, 'serialize', now() - start)
+
+        metrics.write_queue_depth.observe(self.pending_writes)
+        metrics.pending_writes.inc()
+        self.pending_writes += 1
         try:
-            yield message.send(self)
+            start = now()
+            sent = yield message.send(self)
+            metrics.observe_message(message.msgtype, 'send', now() - start)
+            metrics.sent_bytes.inc(sent)
+            self.bytes_sent += sent
         except WebSocketClosedError:
             # on_close() is / will be called anyway
             log.warn("Failed sending message as connection was closed")
+        finally:
+            metrics.pending_writes.dec()
+            self.pending_writes -= 1
         raise gen.Return(None)
 
     @gen.coroutine
     def write_message(self, message, binary=False, locked=True):
         ''' Override parent write_message with a version that consistently returns Future across Tornado versions '''
         def write_message_unlocked():
-            future = super(WSHandler, self).write_message(message, binary)
+            if self.ws_connection is None:
+                # let the parent raise WebSocketClosedError
+                future = super(WSHandler, self).write_message(message, binary)
+            else:
+                future = write_websocket_message(self.ws_connection, message, binary,
+                                                 self.application.websocket_compression_min_bytes)
             if future is None:
                 # tornado >= 4.3 gives us a Future, simulate that
                 # with this fake Future on < 4.3
@@ -210,6 +263,7 @@ class WSHandler(WebSocketHandler):
         '''
         log.info('WebSocket connection closed: code=%s, reason=%r',
                  self.close_code, self.close_reason)
+        self.application.metrics.connection_sent_bytes.observe(self.bytes_sent)
         if self.connection is not None:
             self.application.client_lost(self.connection)
 
@@ -181,6 +181,15 @@ class Settings(object):
         '''
         return self._get_bool("VALIDATE_DOC", default)
 
+    def validate_all_models(self, default=False):
+        ''' Set whether Bokeh should check the models it keeps track of in each
+        document against a full traversal of the document after every change.
+
+        This is slow, and only intended for debugging.
+
+        '''
+        return self._get_bool("VALIDATE_ALL_MODELS", default)
+
     # Server settings go here:
 
     def bokehjssrcdir(self):
@@ -229,6 +238,13 @@ class Settings(object):
     def nodejs_path(self, default=None):
         return self._get_str("NODEJS_PATH", default)
 
+    def compilation_cache_dir(self, default=None):
+        ''' A directory in which to keep compiled implementations of custom
+        models between runs, or None to only keep them in memory.
+
+        '''
+        return self._get_str("COMPILATION_CACHE_DIR", default)
+
     def phantomjs_path(self, default=None):
         return self._get_str("PHANTOMJS_PATH", default)
 
@@ -240,6 +256,13 @@ class Settings(object):
 #:   Valid values are any of the browser names understood by the python
 #:   standard library webbrowser_ module.
 #:
+#: ``BOKEH_COMPILATION_CACHE_DIR`` --- Where to keep compiled custom models.
+#:
+#:   Compiled implementations of custom models are always kept in memory for
+#:   the rest of the process. If this is set to a directory, they are also
+#:   saved there and reused by later processes, so that Node.js only needs
+#:   to be run when an implementation changes.
+#:
 #: ``BOKEH_DEV`` --- Whether to use development mode.
 #:
 #:   This uses absolute paths to development (non-minified) BokehJS components,
@@ -233,6 +233,46 @@ class TestClientServer(unittest.TestCase):
             session.loop_until_closed()
             assert not session.connected
 
+    def test_websocket_compression(self):
+        application = Application()
+        with ManagedServerLoop(application, websocket_compression_level=6) as server:
+            doc = document.Document()
+            doc.add_root(DictModel(values=dict(text="abc" * 2000)))
+
+            client_session = push_session(doc,
+                                          session_id='test_websocket_compression',
+                                          url=url(server),
+                                          io_loop=server.io_loop,
+                                          websocket_compression=True)
+            pulled_session = pull_session(session_id='test_websocket_compression',
+                                          url=url(server),
+                                          io_loop=server.io_loop,
+                                          websocket_compression=True)
+            assert pulled_session.document.roots[0].values == dict(text="abc" * 2000)
+
+            # the server accepted the compression offered by the clients
+            for session in (client_session, pulled_session):
+                headers = session._connection._socket._socket.headers
+                assert 'permessage-deflate' in headers.get('Sec-WebSocket-Extensions', '')
+
+            client_session.close()
+            client_session.loop_until_closed()
+            pulled_session.close()
+            pulled_session.loop_until_closed()
+
+    def test_websocket_compression_disabled_on_server(self):
+        application = Application()
+        with ManagedServerLoop(application) as server:
+            session = ClientSession(session_id='test_websocket_compression_disabled_on_server',
+                                    websocket_url=ws_url(server),
+                                    io_loop=server.io_loop,
+                                    websocket_compression=True)
+            session.connect()
+            assert session.connected
+            assert 'Sec-WebSocket-Extensions' not in session._connection._socket._socket.headers
+            session.close()
+            session.loop_until_closed()
+
     def test_ping(self):
         application = Application()
         with ManagedServerLoop(application, keep_alive_milliseconds=0) as server:
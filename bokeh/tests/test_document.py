@@ -1,5 +1,6 @@
 from __future__ import absolute_import, print_function
 
+import json
 import pytest
 import unittest
 
@@ -10,8 +11,9 @@ from bokeh.io import curdoc
 from bokeh.model import Model
 from bokeh.models import ColumnDataSource
 from bokeh.core.properties import Int, Instance, String, DistanceSpec
-from bokeh.server.events import (ColumnsPatchedEvent, ColumnsStreamedEvent, ModelChangedEvent, RootAddedEvent,
-                                 RootRemovedEvent, SessionCallbackAdded, SessionCallbackRemoved, TitleChangedEvent)
+from bokeh.server.events import (ColumnDataChangedEvent, ColumnsPatchedEvent, ColumnsStreamedEvent, ModelChangedEvent,
+                                 RootAddedEvent, RootRemovedEvent, SessionCallbackAdded, SessionCallbackRemoved,
+                                 TitleChangedEvent)
 
 class AnotherModelInTestDocument(Model):
     bar = Int(1)
@@ -293,6 +295,56 @@ class TestDocument(unittest.TestCase):
         d.remove_root(root2)
         assert len(d._all_models) == 0
 
+    def test_all_models_with_unreachable_cycle(self):
+        d = document.Document()
+        root1 = SomeModelInTestDocument()
+        child1 = SomeModelInTestDocument()
+        child2 = SomeModelInTestDocument(name="child2")
+        root1.child = child1
+        child1.child = child2
+        child2.child = child1
+        d.add_root(root1)
+        assert len(d._all_models) == 3
+        assert d.get_model_by_name("child2") is child2
+        root1.child = None
+        assert len(d._all_models) == 1
+        assert child1.document is None
+        assert child2.document is None
+        assert d.get_model_by_name("child2") is None
+        root1.child = child2
+        assert len(d._all_models) == 3
+        d._check_all_models()
+
+    def test_all_models_updates_incrementally(self):
+        from mock import patch
+        d = document.Document()
+        root1 = SomeModelInTestDocument()
+        d.add_root(root1)
+        # the BOKEH_VALIDATE_ALL_MODELS check recomputes all models with collect_models
+        with patch('bokeh.document.settings.validate_all_models', return_value=False), \
+             patch('bokeh.document.collect_models') as collect:
+            root1.child = SomeModelInTestDocument(child=AnotherModelInTestDocument())
+            assert len(d._all_models) == 3
+            root1.child = None
+            assert len(d._all_models) == 1
+        assert not collect.called
+
+    def test_check_all_models(self):
+        from mock import patch
+        d = document.Document()
+        root1 = SomeModelInTestDocument()
+        d.add_root(root1)
+        d._check_all_models()
+        child1 = AnotherModelInTestDocument()
+        d._all_models[child1._id] = child1
+        with pytest.raises(RuntimeError):
+            d._check_all_models()
+        del d._all_models[child1._id]
+        with patch('bokeh.document.settings.validate_all_models', return_value=True):
+            with patch.object(document.Document, '_check_all_models') as check:
+                root1.child = child1
+        assert check.called
+
     def test_change_notification(self):
         d = document.Document()
         assert not d.roots
@@ -379,6 +431,122 @@ class TestDocument(unittest.TestCase):
         assert curdoc_from_listener[0] is d
 
 
+    def test_batch_notification(self):
+        d = document.Document()
+        m1 = AnotherModelInTestDocument()
+        m2 = AnotherModelInTestDocument()
+        d.add_root(m1)
+        d.add_root(m2)
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+        model_changes = []
+        m1.on_change('bar', lambda attr, old, new: model_changes.append(new))
+        with d.batch() as doc:
+            assert doc is d
+            m1.bar = 2
+            m2.bar = 5
+            d.title = "new title"
+            m1.bar = 3
+            with d.batch():
+                m1.bar = 4
+            assert events == []
+            # model callbacks are not deferred
+            assert model_changes == [2, 3, 4]
+        assert [type(event) for event in events] == [ModelChangedEvent, TitleChangedEvent, ModelChangedEvent]
+        assert [(event.model, event.old, event.new, event.serializable_new) for event in events[::2]] == \
+            [(m2, 1, 5, 5), (m1, 1, 4, 4)]
+
+    def test_batch_decorator(self):
+        d = document.Document()
+        m = AnotherModelInTestDocument()
+        d.add_root(m)
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+        @d.batch()
+        def update(value):
+            for i in range(value):
+                m.bar = i
+            assert events == []
+            return value
+        assert update(10) == 10
+        assert len(events) == 1
+        assert events[0].new == 9
+
+    def test_batch_notification_with_stream(self):
+        d = document.Document()
+        m = ColumnDataSource(data=dict(a=[10]))
+        d.add_root(m)
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+        with d.batch():
+            m.data = dict(a=[1])
+            m.stream(dict(a=[2]))
+            m.data = dict(a=[3])
+            m.data = dict(a=[4])
+        assert [event.hint.__class__ for event in events] == [type(None), ColumnsStreamedEvent, type(None)]
+        assert events[2].old == dict(a=[1, 2])
+        assert events[2].new == dict(a=[4])
+
+    def test_batch_moves_combined_change_to_last_change(self):
+        d = document.Document()
+        root = SomeModelInTestDocument()
+        d.add_root(root)
+        copy = document.Document.from_json(d.to_json())
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+        m1 = SomeModelInTestDocument()
+        m2 = SomeModelInTestDocument()
+        with d.batch():
+            root.child = m1
+            m1.foo = 50
+            root.child = m2
+        assert [(event.model, event.attr) for event in events] == [(m1, 'foo'), (root, 'child')]
+        assert events[1].new is m2
+
+        # m1 is no longer in the document, so its change is not sent
+        patch = json.loads(d.create_json_patch_string(events))
+        assert [e['model'] for e in patch['events']] == [root.ref]
+        copy.apply_json_patch(patch)
+        assert copy.roots[0].child._id == m2._id
+
+    def test_batch_notification_with_exception(self):
+        d = document.Document()
+        m = AnotherModelInTestDocument()
+        d.add_root(m)
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+        with pytest.raises(RuntimeError):
+            with d.batch():
+                m.bar = 42
+                raise RuntimeError("failed")
+        assert len(events) == 1
+        assert d._batch_events is None
+        m.bar = 43
+        assert len(events) == 2
+
+    def test_batch_removes_unreachable_models_once(self):
+        from mock import patch
+        d = document.Document()
+        root1 = SomeModelInTestDocument()
+        d.add_root(root1)
+        with patch.object(document.Document, '_remove_unreachable_models') as remove:
+            with d.batch():
+                for i in range(10):
+                    root1.child = SomeModelInTestDocument(child=AnotherModelInTestDocument())
+                assert remove.call_count == 0
+        assert remove.call_count == 1
+        assert len(d._all_models) == 3
+
     def test_change_notification_removal(self):
         d = document.Document()
         assert not d.roots
@@ -643,6 +811,77 @@ class TestDocument(unittest.TestCase):
         some_root = next(iter(copy.roots))
         assert some_root.child.foo == 44
 
+    def test_clone(self):
+        d = document.Document(title="Foo")
+        root1 = SomeModelInTestDocument(foo=42, tags=["a"])
+        root2 = SomeModelInTestDocument(foo=43)
+        child1 = SomeModelInTestDocument(foo=44)
+        root1.child = child1
+        root2.child = child1
+        d.add_root(root1)
+        d.add_root(root2)
+        d.template_variables["bar"] = 1
+
+        copy = d.clone()
+
+        assert copy.title == "Foo"
+        assert copy.template_variables == {"bar": 1}
+        assert len(copy.roots) == 2
+        assert len(copy._all_models) == 3
+        copy1, copy2 = copy.roots
+        assert [copy1.foo, copy2.foo] == [42, 43]
+        assert copy1.child is copy2.child
+        assert copy1.child.foo == 44
+        assert copy1.child.document is copy
+        assert not set(copy._all_models) & set(d._all_models)
+
+        copy1.tags.append("b")
+        assert root1.tags == ["a"]
+        assert copy1.tags == ["a", "b"]
+
+        copy1.child = None
+        assert len(copy._all_models) == 3
+        copy2.child = None
+        assert len(copy._all_models) == 2
+        assert len(d._all_models) == 3
+
+    def test_clone_column_data_source(self):
+        import numpy as np
+        d = document.Document()
+        source = ColumnDataSource(data=dict(a=np.arange(3), b=[1, 2, 3]))
+        d.add_root(source)
+
+        copy = d.clone()
+        copied = next(iter(copy.roots))
+        assert copied.data["a"] is not source.data["a"]
+        assert list(copied.data["a"]) == [0, 1, 2]
+        copied.data["a"][0] = 10
+        copied.data["b"].append(4)
+        assert list(source.data["a"]) == [0, 1, 2]
+        assert source.data["b"] == [1, 2, 3]
+
+        events = []
+        copy.on_change(lambda event: events.append(event))
+        copied.stream(dict(a=[3], b=[5]))
+        assert len(events) == 1
+        assert list(copied.data["a"]) == [10, 1, 2, 3]
+
+    def test_clone_share_arrays(self):
+        import numpy as np
+        d = document.Document()
+        source = ColumnDataSource(data=dict(a=np.arange(3)))
+        d.add_root(source)
+
+        copy = d.clone(share_arrays=True)
+        copied = next(iter(copy.roots))
+        assert np.shares_memory(copied.data["a"], source.data["a"])
+        with pytest.raises(ValueError):
+            copied.data["a"][0] = 10
+
+        copied.patch(dict(a=[(0, 10)]))
+        assert list(copied.data["a"]) == [10, 1, 2]
+        assert list(source.data["a"]) == [0, 1, 2]
+
     def test_serialization_has_version(self):
         from bokeh import __version__
         d = document.Document()
@@ -791,6 +1030,200 @@ class TestDocument(unittest.TestCase):
         assert root1.foo == 57
         assert root1.child.foo == 44
 
+    def test_patch_only_sends_last_change_to_property(self):
+        d = document.Document()
+        root1 = SomeModelInTestDocument(foo=42)
+        d.add_root(root1)
+
+        event1 = ModelChangedEvent(d, root1, 'foo', 42, 57, 57)
+        event2 = ModelChangedEvent(d, root1, 'foo', 57, 58, 58)
+        event3 = TitleChangedEvent(d, "first")
+        event4 = TitleChangedEvent(d, "second")
+        patch = json.loads(d.create_json_patch_string([event1, event3, event2, event4]))
+
+        assert patch['events'] == [{ 'kind' : 'ModelChanged', 'model' : root1.ref, 'attr' : 'foo', 'new' : 58 },
+                                   { 'kind' : 'TitleChanged', 'title' : 'second' }]
+
+    def test_patch_omits_stream_included_in_data(self):
+        d = document.Document()
+        source1 = ColumnDataSource(data=dict(a=[1, 2]))
+        source2 = ColumnDataSource(data=dict(a=[1, 2]))
+        d.add_root(source1)
+        d.add_root(source2)
+
+        source1.data = dict(a=[3, 4])
+        source1.stream(dict(a=[5]))
+        source2.stream(dict(a=[5]))
+
+        event1 = ModelChangedEvent(d, source1, 'data', None, source1.data, None)
+        event2 = ModelChangedEvent(d, source1, 'data', None, None, None, hint=ColumnsStreamedEvent(d, source1, dict(a=[5]), None))
+        event3 = ModelChangedEvent(d, source2, 'data', None, None, None, hint=ColumnsStreamedEvent(d, source2, dict(a=[5]), None))
+        patch = json.loads(d.create_json_patch_string([event1, event2, event3]))
+
+        assert [e['kind'] for e in patch['events']] == ['ModelChanged', 'ColumnsStreamed']
+        assert patch['events'][0]['new'] == dict(a=[3, 4, 5])
+        assert patch['events'][1]['column_source'] == source2.ref
+
+    def test_patch_sends_stream_to_source_already_in_remote_doc(self):
+        d = document.Document()
+        source = ColumnDataSource(data=dict(a=[1, 2]))
+        root1 = SomeModelInTestDocument(child=source)
+        root2 = SomeModelInTestDocument()
+        d.add_root(root1)
+        d.add_root(root2)
+        copy = document.Document.from_json(d.to_json())
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+
+        # the source is in the references of the change, but not new
+        root2.child = source
+        source.stream(dict(a=[3]))
+        patch = json.loads(d.create_json_patch_string(events))
+
+        assert [e['kind'] for e in patch['events']] == ['ModelChanged', 'ColumnsStreamed']
+        copy.apply_json_patch(patch)
+        assert copy.get_model_by_id(source._id).data == dict(a=[1, 2, 3])
+
+        # nor are changed columns
+        del events[:]
+        root1.child = None
+        source.data = dict(source.data, b=[4, 5, 6])
+        patch = json.loads(d.create_json_patch_string(events))
+
+        assert [e['kind'] for e in patch['events']] == ['ModelChanged', 'ColumnDataChanged']
+        copy.apply_json_patch(patch)
+        assert copy.get_model_by_id(source._id).data == dict(a=[1, 2, 3], b=[4, 5, 6])
+
+    def test_patch_omits_stream_to_new_source(self):
+        d = document.Document()
+        root = SomeModelInTestDocument()
+        d.add_root(root)
+        copy = document.Document.from_json(d.to_json())
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+
+        source = ColumnDataSource(data=dict(a=[1, 2]))
+        root.child = source
+        source.stream(dict(a=[3]))
+        patch = json.loads(d.create_json_patch_string(events))
+
+        assert [e['kind'] for e in patch['events']] == ['ModelChanged']
+        copy.apply_json_patch(patch)
+        assert copy.get_model_by_id(source._id).data == dict(a=[1, 2, 3])
+
+    def test_column_data_change_notification(self):
+        import numpy as np
+        d = document.Document()
+        a, b = np.arange(10), np.arange(10)
+        source = ColumnDataSource(data=dict(a=a, b=b, c=[1] * 10))
+        d.add_root(source)
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+
+        source.data = dict(a=a, b=np.arange(10), c=[2] * 10, d=[3] * 10)
+        source.data['a'] = np.ones(10)
+        source.add([4] * 10, name='e')
+        source.remove('b')
+        source.data = dict(x=[1], y=[2])
+
+        hints = [event.hint for event in events if event.attr == 'data']
+        assert [type(hint) for hint in hints] == [ColumnDataChangedEvent] * 4 + [type(None)]
+        assert [sorted(hint.cols) for hint in hints[:4]] == [['c', 'd'], ['a'], ['e'], []]
+        assert all(hint.column_source is source for hint in hints[:4])
+        assert events[-1].serializable_new == dict(x=[1], y=[2])
+
+    def test_patch_sends_changed_columns(self):
+        import numpy as np
+        d = document.Document()
+        source = ColumnDataSource(data=dict(a=np.arange(3), b=[1, 2, 3], c=[4, 5, 6]))
+        d.add_root(source)
+        copy = document.Document.from_json(d.to_json())
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+
+        source.data['b'] = [7, 8, 9]
+        source.add(np.zeros(3), name='d')
+        source.remove('c')
+        patch = json.loads(d.create_json_patch_string(events))
+
+        json_events = [event for event in patch['events'] if event['kind'] != 'ModelChanged']
+        assert len(json_events) == 1
+        assert json_events[0]['kind'] == 'ColumnDataChanged'
+        assert json_events[0]['column_source'] == source.ref
+        assert sorted(json_events[0]['new']) == ['b', 'd']
+        assert sorted(json_events[0]['cols']) == ['a', 'b', 'd']
+
+        copy.apply_json_patch(patch)
+        copy_source = copy.get_model_by_id(source._id)
+        assert sorted(copy_source.data) == ['a', 'b', 'd']
+        assert list(copy_source.data['a']) == [0, 1, 2]
+        assert copy_source.data['b'] == [7, 8, 9]
+        assert list(copy_source.data['d']) == [0, 0, 0]
+
+    def test_patch_sends_column_data_changed_in_place(self):
+        d = document.Document()
+        source = ColumnDataSource(data=dict(a=[1, 2], b=[3, 4]))
+        d.add_root(source)
+        copy = document.Document.from_json(d.to_json())
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+
+        source.data['a'][0] = 99
+        source.trigger('data', source.data, source.data)
+        with d.batch():
+            source.data['b'] = [5, 6]
+            source.data['b'][0] = 7
+            source.trigger('data', source.data, source.data)
+        assert [type(event.hint) for event in events] == [type(None), ColumnDataChangedEvent, type(None)]
+        patch = json.loads(d.create_json_patch_string(events))
+
+        assert [e['kind'] for e in patch['events']] == ['ModelChanged']
+        copy.apply_json_patch(patch)
+        assert copy.get_model_by_id(source._id).data == dict(a=[99, 2], b=[7, 6])
+
+    def test_patch_sends_streamed_source_with_changed_columns_in_full(self):
+        d = document.Document()
+        source = ColumnDataSource(data=dict(a=[1, 2], b=[3, 4]))
+        d.add_root(source)
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+
+        source.stream(dict(a=[0], b=[0]))
+        source.data['a'] = [5, 6, 7]
+        source.stream(dict(a=[8], b=[9]))
+        patch = json.loads(d.create_json_patch_string(events))
+
+        assert [e['kind'] for e in patch['events']] == ['ModelChanged']
+        assert patch['events'][0]['new'] == dict(a=[5, 6, 7, 8], b=[3, 4, 0, 9])
+
+    def test_batch_column_data_changes(self):
+        d = document.Document()
+        source = ColumnDataSource(data=dict(a=[1, 2], b=[3, 4], c=[5, 6]))
+        d.add_root(source)
+        events = []
+        def listener(event):
+            events.append(event)
+        d.on_change(listener)
+        with d.batch():
+            source.data['a'] = [7, 8]
+            source.data = dict(source.data, b=[9, 10])
+            source.data['a'] = [1, 2]
+        assert len(events) == 1
+        assert isinstance(events[0].hint, ColumnDataChangedEvent)
+        assert events[0].hint.cols == ['b']
+
     # a more realistic set of models instead of fake models
     def test_scatter(self):
         from bokeh.io import set_curdoc
@@ -1,11 +1,15 @@
 from __future__ import absolute_import
 
+import io
 import mock
 import unittest
 
 import bs4
+import numpy as np
 
 import bokeh.embed as embed
+from bokeh.document import Document
+from bokeh.models import ColumnDataSource
 from bokeh.plotting import figure, curdoc
 from bokeh.resources import CDN, JSResources, CSSResources
 from bokeh.util.string import encode_utf8
@@ -217,6 +221,35 @@ def test_file_html_title_is_escaped():
     assert "<title>&amp;&lt;</title>" in r
 
 
+def _plot_with_data():
+    source = ColumnDataSource(data=dict(x=np.arange(10.0),
+                                        y=list(range(25)),
+                                        z=[np.arange(4), np.arange(5.0)],
+                                        xs=[[1.5, 2.0], [3.0]],
+                                        im=[np.zeros((2, 2)), np.ones(3)]))
+    plot = figure()
+    plot.circle('x', 'x', source=source)
+    return plot
+
+@mock.patch('bokeh.embed._LIST_CHUNK_SIZE', 4)
+@mock.patch('bokeh.embed._BASE64_CHUNK_SIZE', 6)
+def test_doc_json_chunks():
+    doc = Document()
+    doc.add_root(_plot_with_data())
+    chunks = list(embed._doc_json_chunks(doc))
+    assert len(chunks) > 20
+    assert "".join(chunks) == doc.to_json_string()
+
+@mock.patch('bokeh.embed._LIST_CHUNK_SIZE', 4)
+@mock.patch('bokeh.embed._BASE64_CHUNK_SIZE', 6)
+@mock.patch('bokeh.embed.make_id', new_callable=lambda: _stable_id)
+def test_file_html_writes_to_fileobj(mock_make_id):
+    plot = _plot_with_data()
+    html = embed.file_html(plot, CDN, "title")
+    f = io.StringIO()
+    assert embed.file_html(plot, CDN, "title", fileobj=f) is None
+    assert f.getvalue() == html
+
 class TestAutoloadStatic(unittest.TestCase):
 
     def test_return_type(self):
@@ -1,5 +1,8 @@
+import json
+
 import pytest
 
+from bokeh.document import Document
 from bokeh.models import Plot, Button, Div
 from bokeh import events
 
@@ -246,3 +249,57 @@ def test_pinch_callbacks():
     plot._trigger_event(events.Pinch(plot, **payload))
     assert test_callback.event_name == events.Pinch.event_name
     assert test_callback.payload == payload
+
+# Testing event dispatch by a document
+
+def _event_json(event_name, model_id, **values):
+    values['model_id'] = model_id
+    return json.dumps(dict(event_name=event_name, event_values=values))
+
+def test_apply_json_event_dispatches_to_model():
+    doc = Document()
+    buttons = [Button() for i in range(3)]
+    callbacks = [EventCallback() for button in buttons]
+    for button, callback in zip(buttons, callbacks):
+        button.on_event(events.ButtonClick, callback)
+        doc.add_root(button)
+    doc.apply_json_event(_event_json('button_click', buttons[1]._id))
+    assert [callback.event_name for callback in callbacks] == [None, events.ButtonClick.event_name, None]
+
+def test_apply_json_event_decodes_once(monkeypatch):
+    doc = Document()
+    plots = [Plot() for i in range(10)]
+    for plot in plots:
+        plot.on_event(events.Tap, EventCallback())
+        doc.add_root(plot)
+    decoded = []
+    decode_json = events.Event.decode_json
+    def counting_decode_json(dct):
+        decoded.append(dct)
+        return decode_json(dct)
+    monkeypatch.setattr(events.Event, 'decode_json', counting_decode_json)
+    doc.apply_json_event(_event_json('tap', plots[0]._id, sx=3, sy=-2, x=10, y=100))
+    assert len(decoded) == 2 # the event and its values
+
+def test_apply_json_event_callback_added_after_attach():
+    doc = Document()
+    plot = Plot()
+    doc.add_root(plot)
+    test_callback = EventCallback(['x', 'y'])
+    plot.on_event(events.Tap, test_callback)
+    doc.apply_json_event(_event_json('pan', plot._id, sx=3, sy=-2, x=10, y=100, delta_x=1, delta_y=1))
+    assert test_callback.event_name == None
+    doc.apply_json_event(_event_json('tap', plot._id, sx=3, sy=-2, x=10, y=100))
+    assert test_callback.event_name == events.Tap.event_name
+    assert test_callback.payload == dict(x=10, y=100)
+
+def test_apply_json_event_detached_model():
+    doc = Document()
+    button = Button()
+    test_callback = EventCallback()
+    button.on_event(events.ButtonClick, test_callback)
+    doc.add_root(button)
+    doc.remove_root(button)
+    assert button not in doc.event_manager.subscribed_models
+    doc.apply_json_event(_event_json('button_click', button._id))
+    assert test_callback.event_name == None
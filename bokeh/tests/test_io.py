@@ -168,7 +168,7 @@ class Test_SaveHelper(DefaultStateTester):
 
         self._check_func_called(mock_file_html,
                                 (obj, resources),
-                                {"title": "title"})
+                                {"title": "title", "fileobj": mock_io_open.return_value.__enter__.return_value})
         self._check_func_called(mock_io_open,
                                 (filename,),
                                 {"mode":"w", "encoding":"utf-8"})
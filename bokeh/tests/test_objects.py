@@ -106,6 +106,31 @@ class TestCollectModels(unittest.TestCase):
             parent = model
         self.assertEqual(set(root.references()), objects)
 
+    def test_collect_models_deeply_nested_containers(self):
+        from bokeh.model import collect_models
+        model = DeepModel()
+        value = [model]
+        for i in xrange(5000):
+            value = [1, dict(a=value)]
+        self.assertEqual(collect_models(value), [model])
+
+    def test_collect_models_order(self):
+        from bokeh.model import collect_models
+        models = [DeepModel() for i in xrange(4)]
+        models[0].child = models[3]
+        value = [models[0], dict(a=models[1]), (models[2],)]
+        self.assertEqual(collect_models(value), models)
+
+    def test_trigger_skips_properties_without_refs(self):
+        from mock import patch
+        from bokeh.models import ColumnDataSource
+        doc = Document()
+        source = ColumnDataSource(data=dict(a=[1, 2, 3]))
+        doc.add_root(source)
+        with patch('bokeh.model._visit_value_and_its_immediate_references') as visit:
+            source.data = dict(a=list(range(1000)))
+        self.assertFalse(visit.called)
+
 class SomeModelToJson(Model):
     child = Instance(Model)
     foo = Int()
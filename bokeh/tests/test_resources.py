@@ -227,6 +227,26 @@ class TestResources(unittest.TestCase):
             self.assertRaises(ValueError, resources.Resources, mode, root_url="foo")
 
 
+def test_inline_rereads_modified_files(tmpdir):
+    path = tmpdir.join("some.js")
+    path.write("var a;")
+    r = resources.Resources(mode="inline")
+
+    assert r._inline(str(path)) == "/* BEGIN some.js */\nvar a;\n/* END some.js */"
+    assert r._inline(str(path)) is r._inline(str(path))
+
+    path.write("var b;")
+    os.utime(str(path), (0, 0))
+    assert r._inline(str(path)) == "/* BEGIN some.js */\nvar b;\n/* END some.js */"
+
+def test_render_js_is_cached():
+    r = resources.Resources(mode="inline")
+    assert r.render_js() is r.render_js()
+    assert r.render_css() is r.render_css()
+
+    r.log_level = "debug"
+    assert 'Bokeh.set_log_level("debug");' in r.render_js()
+
 ## Test external resources
 
 def test_external_js_and_css_resource_embedding():
@@ -280,3 +300,13 @@ def test_external_js_and_css_resource_ordering():
     # The files should be in the order defined by the lists in CustomModel2 and CustomModel3
     assert r.css_files.index("external_css_3") > r.css_files.index("external_css_2")
     assert r.js_files.index("external_js_3") > r.js_files.index("external_js_2")
+
+
+def test_external_resources_of_new_models():
+    r = resources.Resources()
+    assert "new_class" not in r.js_files
+
+    class NewClass(Model):
+        __javascript__ = "new_class"
+
+    assert "new_class" in r.js_files
@@ -8,7 +8,7 @@ import tempfile
 from bokeh.document import Document
 from bokeh.model import Model
 from bokeh.core.property_mixins import FillProps, LineProps, TextProps
-from bokeh.core.properties import Int, String
+from bokeh.core.properties import Int, List, String
 from bokeh.themes import Theme
 
 class ThemedModel(Model):
@@ -18,6 +18,9 @@ class ThemedModel(Model):
 class SubOfThemedModel(ThemedModel):
     another_string = String("world")
 
+class ThemedListModel(Model):
+    values = List(Int)
+
 FILE_CONTENTS = """
 attrs:
     ThemedModel:
@@ -207,6 +210,54 @@ class TestThemes(unittest.TestCase):
         self.assertEqual([('string', 'hello', 'w00t'),
                           ('string', 'w00t', 'hello')], changes['calls'])
 
+    def test_switching_document_theme_without_callbacks(self):
+        theme1 = Theme(json={'attrs' : { 'ThemedModel' : { 'string' : 'w00t' } } })
+        theme2 = Theme(json={'attrs' : { 'ThemedModel' : { 'number' : 57 } } })
+        obj1 = ThemedModel()
+        obj2 = SubOfThemedModel(string="set")
+        doc = Document()
+        doc.add_root(obj1)
+        doc.add_root(obj2)
+        doc.theme = theme1
+        self.assertEqual(('w00t', 42), (obj1.string, obj1.number))
+        self.assertEqual(('set', 42), (obj2.string, obj2.number))
+        doc.theme = theme2
+        self.assertEqual(('hello', 57), (obj1.string, obj1.number))
+        self.assertEqual(('set', 57), (obj2.string, obj2.number))
+        self.assertEqual(57, obj1.to_json(include_defaults=False)['number'])
+        doc.remove_root(obj1)
+        self.assertEqual(('hello', 42), (obj1.string, obj1.number))
+        doc.theme = theme1
+        self.assertEqual(('hello', 42), (obj1.string, obj1.number))
+        self.assertEqual(('set', 42), (obj2.string, obj2.number))
+
+    def test_switching_document_theme_with_container_values(self):
+        theme1 = Theme(json={'attrs' : { 'ThemedListModel' : { 'values' : [1, 2] } } })
+        theme2 = Theme(json={'attrs' : { 'ThemedListModel' : { 'values' : [3] } } })
+        obj = ThemedListModel()
+        doc = Document()
+        doc.add_root(obj)
+        doc.theme = theme1
+        self.assertEqual([1, 2], obj.values)
+        self.assertIs(obj.values, obj.values)
+        doc.theme = theme2
+        self.assertEqual([3], obj.values)
+        doc.theme = None
+        self.assertEqual([], obj.values)
+
+    def test_switching_document_theme_triggers_document_callbacks(self):
+        theme = Theme(json={'attrs' : { 'ThemedModel' : { 'string' : 'w00t' } } })
+        obj = ThemedModel()
+        doc = Document()
+        doc.add_root(obj)
+        events = []
+        def record_event(event):
+            events.append(event)
+        doc.on_change(record_event)
+        doc.theme = theme
+        self.assertEqual([(obj, 'string', 'hello', 'w00t')],
+                         [(e.model, e.attr, e.old, e.new) for e in events])
+
     def _compare_dict_to_model_class_defaults(self, props, model_class):
         model = model_class()
         for name, value in props.items():
@@ -4,6 +4,8 @@ interfaces to classes.
 '''
 from __future__ import absolute_import
 
+import time
+
 from ..events import Event
 from ..util.future import get_param_info, format_signature, signature
 
@@ -42,6 +44,10 @@ class EventCallbackManager(object):
         if event not in self.subscribed_events:
             self.subscribed_events.append(event)
 
+        document = getattr(self, 'document', None)
+        if document is not None:
+            document.event_manager.subscribe(self, event)
+
     def _trigger_event(self, event):
         for callback in self._event_callbacks.get(event.event_name,[]):
             if event._model_id is not None and self._id == event._model_id:
@@ -51,9 +57,97 @@ class EventCallbackManager(object):
         if self.document is None:
             return
 
-        if self._event_callbacks.keys():
-            self.document.event_manager.subscribed_models.add(self)
+        for event in self._event_callbacks:
+            self.document.event_manager.subscribe(self, event)
+
+
+# seconds of a monotonic clock, if available
+_now = getattr(time, 'monotonic', time.time)
+
+class _DelayedCallback(object):
+    ''' Wraps an ``on_change`` callback to deliver only some of the changes
+    of an attribute, using timeout callbacks of the Bokeh server session of
+    the model's document.
+
+    In "debounce" mode, changes are delivered once no further change has
+    happened for ``delay`` milliseconds. In "throttle" mode, a change is
+    delivered immediately, and any further changes at most once every
+    ``delay`` milliseconds. Either way, only the latest value is delivered,
+    together with the value before the first change that was not delivered.
+
+    Outside of a Bokeh server session, every change is delivered.
+
+    '''
+
+    def __init__(self, obj, callback, delay, leading):
+        self.obj = obj
+        self.callback = callback
+        self.delay = delay
+        self.leading = leading
+        self._pending = None
+        self._timeout = None
+        self._last_change = None
+
+    def __eq__(self, other):
+        if isinstance(other, _DelayedCallback):
+            other = other.callback
+        return self.callback == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.callback)
+
+    def __call__(self, attr, old, new):
+        document = getattr(self.obj, 'document', None)
+        if document is None or document.session_context is None:
+            self.callback(attr, old, new)
+            return
+
+        self._last_change = _now()
+        if self._timeout is not None:
+            if self._pending is not None:
+                old = self._pending[1]
+            self._pending = (attr, old, new)
+            return
 
+        if self.leading:
+            self.callback(attr, old, new)
+        else:
+            self._pending = (attr, old, new)
+        self._schedule(document, self.delay)
+
+    def cancel(self):
+        ''' Cancel any pending call of the callback. '''
+        self._pending = None
+        if self._timeout is not None:
+            self._timeout = None
+            document = self.obj.document
+            if document is not None:
+                document.remove_timeout_callback(self._on_timeout)
+
+    def _schedule(self, document, delay):
+        self._timeout = document.add_timeout_callback(self._on_timeout, delay)
+
+    def _on_timeout(self):
+        self._timeout = None
+        document = self.obj.document
+        if not self.leading:
+            remaining = self.delay - (_now() - self._last_change) * 1000
+            # a millisecond early is close enough
+            if remaining > 1 and document is not None:
+                self._schedule(document, remaining)
+                return
+
+        if self._pending is None:
+            return
+        attr, old, new = self._pending
+        self._pending = None
+        self.callback(attr, old, new)
+        if self.leading and document is not None:
+            # the delivered change starts another interval
+            self._schedule(document, self.delay)
 
 class PropertyCallbackManager(object):
     ''' A mixin class to provide an interface for registering and
@@ -65,13 +159,29 @@ class PropertyCallbackManager(object):
         super(PropertyCallbackManager, self).__init__(*args, **kw)
         self._callbacks = dict()
 
-    def on_change(self, attr, *callbacks):
+    def on_change(self, attr, *callbacks, **kwargs):
         ''' Add a callback on this object to trigger when ``attr`` changes.
 
         Args:
             attr (str) : an attribute name on this object
             callback (callable) : a callback function to register
 
+        Keyword Args:
+            debounce (int, optional) :
+                If given, only call the callbacks once ``attr`` has not
+                changed for this many milliseconds (default: None)
+
+            throttle (int, optional) :
+                If given, call the callbacks as soon as ``attr`` changes, and
+                then at most once every this many milliseconds (default: None)
+
+        When debounced or throttled, the callbacks are only called with the
+        latest value of ``attr``, and the value it had before the earliest
+        of the changes they were not called for. This only applies to
+        models in a Bokeh server session, whose timeout callbacks are used
+        to call them later. Any calls that are still pending when the
+        session is destroyed are cancelled.
+
         Returns:
             None
 
@@ -79,6 +189,16 @@ class PropertyCallbackManager(object):
         if len(callbacks) == 0:
             raise ValueError("on_change takes an attribute name and one or more callbacks, got only one parameter")
 
+        debounce = kwargs.pop('debounce', None)
+        throttle = kwargs.pop('throttle', None)
+        if kwargs:
+            raise TypeError("on_change got unexpected keyword arguments: %s" % ", ".join(sorted(kwargs)))
+        if debounce is not None and throttle is not None:
+            raise ValueError("on_change takes either debounce or throttle, not both")
+        delay = debounce if debounce is not None else throttle
+        if delay is not None and delay <= 0:
+            raise ValueError("on_change debounce and throttle must be > 0, got %r" % delay)
+
         _callbacks = self._callbacks.setdefault(attr, [])
         for callback in callbacks:
 
@@ -87,6 +207,9 @@ class PropertyCallbackManager(object):
 
             _check_callback(callback, ('attr', 'old', 'new'))
 
+            if delay is not None:
+                callback = _DelayedCallback(self, callback, delay, leading=throttle is not None)
+
             _callbacks.append(callback)
 
     def remove_on_change(self, attr, *callbacks):
@@ -95,7 +218,9 @@ class PropertyCallbackManager(object):
             raise ValueError("remove_on_change takes an attribute name and one or more callbacks, got only one parameter")
         _callbacks = self._callbacks.setdefault(attr, [])
         for callback in callbacks:
-            _callbacks.remove(callback)
+            removed = _callbacks.pop(_callbacks.index(callback))
+            if isinstance(removed, _DelayedCallback):
+                removed.cancel()
 
     def trigger(self, attr, old, new, hint=None, setter=None):
         ''' Trigger callbacks for ``attr`` on this object.
@@ -12,12 +12,16 @@ import sys
 import six
 import json
 import hashlib
+import tempfile
+from multiprocessing import cpu_count
+from multiprocessing.pool import ThreadPool
 from os.path import dirname, join, abspath, exists, isabs
 from subprocess import Popen, PIPE
 
 from ..model import Model
 from ..settings import settings
 from .string import snakify
+from .version import __version__
 
 _plugin_umd = \
 """\
@@ -176,6 +180,107 @@ def nodejs_compile(code, lang="javascript", file=None):
     output = _run_nodejs([compilejs_script], dict(code=code, lang=lang, file=file))
     return AttrDict(json.loads(output))
 
+_compilation_cache = {}
+_installed_dependencies = set()
+
+def _compilation_key(impl, dependencies):
+    ''' Return a key for the compiled form of an implementation, which changes
+    when its code, language or file, the version of BokehJS, or the npm
+    dependencies it is compiled with change.
+
+    '''
+    key = json.dumps([impl.code, impl.lang, impl.file, __version__, sorted(dependencies)])
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+def _cached_compilation(key):
+    compiled = _compilation_cache.get(key)
+    if compiled is not None:
+        return compiled
+
+    cache_dir = settings.compilation_cache_dir()
+    if cache_dir is None:
+        return None
+
+    try:
+        with io.open(join(cache_dir, key + ".json"), encoding="utf-8") as f:
+            compiled = AttrDict(json.loads(f.read()))
+    except (IOError, ValueError):
+        return None
+
+    _compilation_cache[key] = compiled
+    return compiled
+
+def _cache_compilation(key, compiled):
+    # errors are not cached, so that they are reported again
+    if "error" in compiled:
+        return
+
+    _compilation_cache[key] = compiled
+
+    cache_dir = settings.compilation_cache_dir()
+    if cache_dir is None:
+        return
+
+    try:
+        if not exists(cache_dir):
+            os.makedirs(cache_dir)
+        # write to a temporary file first, so that concurrent processes
+        # never read a partially written file
+        fd, path = tempfile.mkstemp(suffix=".tmp", dir=cache_dir)
+        with io.open(fd, "w", encoding="utf-8") as f:
+            f.write(six.text_type(json.dumps(compiled)))
+        os.rename(path, join(cache_dir, key + ".json"))
+    except (IOError, OSError) as e:
+        logger.warning("Unable to save compiled model to cache directory %r: %s", cache_dir, e)
+
+def _compile(impls, dependencies=()):
+    ''' Compile implementations of custom models, reusing earlier results from
+    memory or from ``BOKEH_COMPILATION_CACHE_DIR`` where possible. Node.js
+    is only run for the implementations that have not been compiled before,
+    in parallel if there are several of them.
+
+    Args:
+        impls (seq[Implementation]) : the implementations to compile
+
+        dependencies (seq[(str, str)], optional) :
+            npm packages, as pairs of names and versions, to install before
+            compiling (default: ())
+
+    Returns:
+        list[AttrDict] : the compiled implementations, in the same order
+
+    '''
+    keys = [ _compilation_key(impl, dependencies) for impl in impls ]
+    results = [ _cached_compilation(key) for key in keys ]
+    misses = [ i for (i, compiled) in enumerate(results) if compiled is None ]
+
+    if not misses:
+        return results
+
+    dependencies = tuple(sorted(dependencies))
+    if dependencies and dependencies not in _installed_dependencies:
+        _run_npmjs(["install", "--no-progress"] + [ name + "@" + version for (name, version) in dependencies ])
+        _installed_dependencies.add(dependencies)
+
+    def compile_one(i):
+        impl = impls[i]
+        return nodejs_compile(impl.code, lang=impl.lang, file=impl.file)
+
+    if len(misses) == 1:
+        compiled = [ compile_one(misses[0]) ]
+    else:
+        pool = ThreadPool(min(len(misses), cpu_count()))
+        try:
+            compiled = pool.map(compile_one, misses)
+        finally:
+            pool.close()
+
+    for i, result in zip(misses, compiled):
+        _cache_compilation(keys[i], result)
+        results[i] = result
+
+    return results
+
 class Implementation(object):
 
     file = None
@@ -319,14 +424,8 @@ def bundle_models(models):
     for model in ordered_models:
         dependencies.extend(list(model.dependencies.items()))
 
-    if dependencies:
-        dependencies = sorted(dependencies, key=lambda name_version: name_version[0])
-        _run_npmjs(["install", "--no-progress"] + [ name + "@" + version for (name, version) in dependencies ])
-
-    for model in ordered_models:
-        impl = model.implementation
-        compiled = nodejs_compile(impl.code, lang=impl.lang, file=impl.file)
-
+    impls = [ model.implementation for model in ordered_models ]
+    for model, compiled in zip(ordered_models, _compile(impls, dependencies)):
         if "error" in compiled:
             raise CompilationError(compiled.error)
 
@@ -354,7 +453,7 @@ def bundle_models(models):
                         raise RuntimeError("no such module: %s" % module)
 
                 impl = FromFile(path)
-                compiled = nodejs_compile(impl.code, lang=impl.lang, file=impl.file)
+                compiled = _compile([impl], dependencies)[0]
 
                 if "error" in compiled:
                     raise CompilationError(compiled.error)
@@ -409,5 +508,13 @@ def bundle_models(models):
     content = _plugin_template % dict(prelude=_plugin_prelude, exports=exports, modules=modules)
     return _plugin_umd % dict(content=content)
 
+_bundle_cache = {}
+
 def bundle_all_models():
-    return bundle_models(Model.model_class_reverse_map.values()) or ""
+    """Create a bundle of all models, reusing the last bundle if no models
+    have been defined since it was created. """
+    key = (id(Model.model_class_reverse_map), Model.model_class_generation)
+    if key not in _bundle_cache:
+        _bundle_cache.clear()
+        _bundle_cache[key] = bundle_models(Model.model_class_reverse_map.values()) or ""
+    return _bundle_cache[key]
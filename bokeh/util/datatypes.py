@@ -2,6 +2,8 @@
 
 '''
 
+import numpy as np
+
 class MultiValuedDict(object):
     ''' Store a mapping from keys to multiple values with minimal overhead.
 
@@ -77,3 +79,133 @@ class MultiValuedDict(object):
             del self._dict[key]
         else:
             pass
+
+class RingBuffer(object):
+    ''' A one-dimensional array column for ``ColumnDataSource`` that can be
+    streamed to with a rollover without copying the whole column each time.
+
+    Values are stored in a preallocated array with room for twice the
+    capacity. Streamed values are written after the current values, and
+    rolling over only moves the start of the column, so appending ``k``
+    values costs ``O(k)`` amortized. The current values are always available
+    as a contiguous array view, with the ``array`` property or ``np.asarray``.
+
+    .. code-block:: python
+
+        source = ColumnDataSource(data=dict(x=RingBuffer(100000), y=RingBuffer(100000)))
+        source.stream(dict(x=[1, 2], y=[10, 20]), rollover=100000)
+
+    If a stream grows the column past its capacity (for instance, if no
+    rollover is given), the storage is enlarged to fit.
+
+    Args:
+        capacity (int) :
+            The expected maximum length of the column, typically the rollover
+            that will be used when streaming
+
+        dtype (numpy dtype, optional) :
+            The data type of the column values (default: float64)
+
+        data (seq, optional) :
+            Initial values for the column (default: None)
+
+    '''
+
+    def __init__(self, capacity, dtype=np.float64, data=None):
+        if capacity <= 0:
+            raise ValueError("RingBuffer capacity must be > 0")
+        self._capacity = capacity
+        self._data = np.empty(2 * capacity, dtype=dtype)
+        self._start = 0
+        self._end = 0
+        if data is not None:
+            self.extend(data)
+
+    @property
+    def capacity(self):
+        return self._capacity
+
+    @property
+    def dtype(self):
+        return self._data.dtype
+
+    @property
+    def array(self):
+        ''' A contiguous array view of the current values.
+
+        Streaming to the column later does not modify the values seen by
+        previously returned views.
+
+        '''
+        return self._data[self._start:self._end]
+
+    def extend(self, values, rollover=None):
+        ''' Append values to the end of the column.
+
+        Args:
+            values (seq) : the values to append
+
+            rollover (int, optional) :
+                A maximum column length, above which values from the start
+                of the column are discarded. If None, the column continues to
+                grow (default: None)
+
+        Returns:
+            None
+
+        '''
+        # converted first, so that values that do not fit leave the column
+        # as it was
+        values = np.asarray(values, dtype=self._data.dtype)
+        if values.ndim != 1:
+            raise ValueError("RingBuffer values must be one dimensional, got shape %r" % (values.shape,))
+        length = self._end - self._start + len(values)
+        if rollover is not None:
+            length = min(length, rollover)
+
+        values = values[len(values) - min(length, len(values)):]
+        start = self._end - (length - len(values))
+
+        if start + length > len(self._data):
+            # move the values that are kept into new storage, rather than
+            # overwriting values that existing views may still refer to
+            data = np.empty(max(len(self._data), 2 * length), dtype=self._data.dtype)
+            kept = self._end - start
+            data[:kept] = self._data[start:self._end]
+            self._data = data
+            start = 0
+            self._end = kept
+
+        self._data[self._end:self._end + len(values)] = values
+        self._start = start
+        self._end += len(values)
+
+    def __array__(self, dtype=None):
+        if dtype is None:
+            return self.array
+        return self.array.astype(dtype, copy=False)
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __iter__(self):
+        return iter(self.array)
+
+    def __getitem__(self, index):
+        return self.array[index]
+
+    def __setitem__(self, index, value):
+        self.array[index] = value
+
+    def __eq__(self, other):
+        if not isinstance(other, RingBuffer):
+            return False
+        return np.array_equal(self.array, other.array)
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "RingBuffer(%d, %r)" % (self._capacity, self.array)
@@ -15,12 +15,16 @@ log = logging.getLogger(__name__)
 
 import base64
 import datetime as dt
+from itertools import chain
 import math
+import sys
+import warnings
 
-from six import iterkeys
+from six import integer_types, iterkeys
 
 import numpy as np
 
+from .datatypes import RingBuffer
 from .string import format_docstring
 from .dependencies import import_optional
 
@@ -35,6 +39,7 @@ BINARY_ARRAY_TYPES = set([
     np.dtype(np.int16),
     np.dtype(np.uint32),
     np.dtype(np.int32),
+    np.dtype(np.bool_),
 ])
 
 DATETIME_TYPES = set([
@@ -65,6 +70,24 @@ _simple_id = 1000
 
 _dt_tuple = tuple(DATETIME_TYPES)
 
+_NAT = np.iinfo(np.int64).min
+
+# Check for astype failures (putative Numpy < 1.7)
+try:
+    dt2001 = np.datetime64('2001')
+    _legacy_datetime64 = (dt2001.astype('int64') ==
+                          dt2001.astype('datetime64[ms]').astype('int64'))
+    del dt2001
+except AttributeError as e:
+    if e.args == ("'module' object has no attribute 'datetime64'",):
+        # for compatibility with PyPy that doesn't have datetime64
+        if 'PyPy' in sys.version:
+            _legacy_datetime64 = False
+        else:
+            raise e
+    else:
+        raise e
+
 def is_datetime_type(obj):
     ''' Whether an object is any date, datetime, or time delta type
     recognized by Bokeh.
@@ -169,53 +192,74 @@ array_encoding_disabled.__doc__ = format_docstring(array_encoding_disabled.__doc
                                                    binary_array_types="\n    ".join("* ``np." + str(x) + "``"
                                                                                     for x in BINARY_ARRAY_TYPES))
 
-def transform_array(array, force_list=False):
+def transform_array(array, force_list=False, buffers=None):
     ''' Transform a NumPy arrays into serialized format
 
     Converts un-serializable dtypes and returns JSON serializable
     format
 
+    Datetime and timedelta values are converted to milliseconds, and 64 bit
+    integers to ``float64`` when no precision is lost, so that they can be
+    binary encoded. The encoded integers have an ``original_dtype`` key, and
+    are decoded with their original dtype.
+
     Args:
         array (np.ndarray) : a NumPy array to be transformed
         force_list (bool, optional) : whether to only output to standard lists
             This function can encode some dtypes using a binary encoding, but
             setting this argument to True will override that and cause only
             standard Python lists to be emitted. (default: False)
+        buffers (list, optional) :
+            If binary buffers are desired, the buffers parameter may be
+            provided, and any columns that may be sent as binary buffers
+            will be added to the list. If None, then only base64 encoding
+            will be used (default: None)
 
     Returns:
         JSON
 
     '''
 
-    # Check for astype failures (putative Numpy < 1.7)
-    try:
-        dt2001 = np.datetime64('2001')
-        legacy_datetime64 = (dt2001.astype('int64') ==
-                             dt2001.astype('datetime64[ms]').astype('int64'))
-    except AttributeError as e:
-        if e.args == ("'module' object has no attribute 'datetime64'",):
-            import sys
-            # for compatibility with PyPy that doesn't have datetime64
-            if 'PyPy' in sys.version:
-                legacy_datetime64 = False
-                pass
-            else:
-                raise e
-        else:
-            raise e
+    original_dtype = array.dtype
 
     # not quite correct, truncates to ms..
     if array.dtype.kind == 'M':
-        if legacy_datetime64:
+        if _legacy_datetime64:
             if array.dtype == np.dtype('datetime64[ns]'):
                 array = array.astype('int64') / 10**6.0
         else:
-            array =  array.astype('datetime64[us]').astype('int64') / 1000.
+            array = _datetime_to_ms(array.astype('datetime64[us]'))
 
     elif array.dtype.kind == 'm':
-        array = array.astype('timedelta64[us]').astype('int64') / 1000.
-
-    return serialize_array(array, force_list)
+        array = _datetime_to_ms(array.astype('timedelta64[us]'))
+
+    elif array.dtype.kind in ('i', 'u') and not force_list:
+        array = _binary_integer_array(array)
+        if array.dtype != original_dtype:
+            result = serialize_array(array, buffers=buffers)
+            result['original_dtype'] = original_dtype.name
+            return result
+
+    return serialize_array(array, force_list=force_list, buffers=buffers)
+
+def _datetime_to_ms(array):
+    # microsecond datetime64 or timedelta64 values to float milliseconds,
+    # with NaT as NaN
+    values = array.view('int64')
+    result = values / 1000.
+    result[values == _NAT] = np.nan
+    return result
+
+def _binary_integer_array(array):
+    # 64 bit integer arrays cannot be binary encoded, but their values can
+    # be, as float64, if they are exact. Not as int32, even if they fit: in
+    # BokehJS, an Int32Array column would truncate any values streamed or
+    # patched into it that are not int32, unlike the JS numbers of a list.
+    if array.dtype in BINARY_ARRAY_TYPES:
+        return array
+    if array.size == 0 or (array.min() >= -2**53 and array.max() <= 2**53):
+        return array.astype(np.float64)
+    return array
 
 def transform_array_to_list(array):
     ''' Transforms a NumPy array into a list of values
@@ -227,19 +271,65 @@ def transform_array_to_list(array):
         list or dict
 
     '''
-    if (array.dtype.kind in ('u', 'i', 'f') and (~np.isfinite(array)).any()):
-        transformed = array.astype('object')
-        transformed[np.isnan(array)] = 'NaN'
-        transformed[np.isposinf(array)] = 'Infinity'
-        transformed[np.isneginf(array)] = '-Infinity'
-        return transformed.tolist()
+    if array.dtype.kind == 'f' and array.ndim > 0:
+        # integer arrays are always finite
+        nonfinite = ~np.isfinite(array)
+        if nonfinite.any():
+            return _replace_nonfinite(array.tolist(), array, nonfinite)
     elif (array.dtype.kind == 'O' and pd and pd.isnull(array).any()):
         transformed = array.astype('object')
         transformed[pd.isnull(array)] = 'NaN'
         return transformed.tolist()
     return array.tolist()
 
-def transform_series(series, force_list=False):
+def _replace_nonfinite(values, array, nonfinite):
+    # replace the values that are not finite in the (nested) list of
+    # values of the array by the strings BokehJS expects for them
+    for index in np.argwhere(nonfinite):
+        container = values
+        for i in index[:-1]:
+            container = container[i]
+        value = array[tuple(index)]
+        if np.isnan(value):
+            container[index[-1]] = 'NaN'
+        elif value > 0:
+            container[index[-1]] = 'Infinity'
+        else:
+            container[index[-1]] = '-Infinity'
+    return values
+
+_NUMBER_TYPES = (float,) + integer_types
+
+def _numeric_list_array(obj):
+    # Convert a list, or a rectangular nested list, of floats and ints to
+    # an array, or return None if obj is anything else. Only the first value
+    # is checked before trying, so that other lists are rejected quickly.
+    first = obj
+    while isinstance(first, (list, tuple)):
+        if len(first) == 0:
+            return None
+        first = first[0]
+    if type(first) not in _NUMBER_TYPES:
+        return None
+    with warnings.catch_warnings():
+        # ragged lists make object arrays, which NumPy warns about
+        warnings.simplefilter("ignore")
+        try:
+            array = np.array(obj)
+        except ValueError:
+            return None
+    if array.dtype.kind not in ('i', 'u', 'f'):
+        return None
+    # NumPy also converts e.g. bools and NumPy scalars, which are kept as
+    # they are otherwise
+    values = obj
+    for _ in range(array.ndim - 1):
+        values = chain.from_iterable(values)
+    if not set(map(type, values)).issubset(_NUMBER_TYPES):
+        return None
+    return array
+
+def transform_series(series, force_list=False, buffers=None):
     ''' Transforms a Pandas series into serialized form
 
     Args:
@@ -248,15 +338,20 @@ def transform_series(series, force_list=False):
             This function can encode some dtypes using a binary encoding, but
             setting this argument to True will override that and cause only
             standard Python lists to be emitted. (default: False)
+        buffers (list, optional) :
+            If binary buffers are desired, the buffers parameter may be
+            provided, and any columns that may be sent as binary buffers
+            will be added to the list. If None, then only base64 encoding
+            will be used (default: None)
 
     Returns:
         list or dict
 
     '''
     vals = series.values
-    return transform_array(vals, force_list)
+    return transform_array(vals, force_list=force_list, buffers=buffers)
 
-def serialize_array(array, force_list=False):
+def serialize_array(array, force_list=False, buffers=None):
     ''' Transforms a NumPy array into serialized form.
 
     Args:
@@ -265,6 +360,11 @@ def serialize_array(array, force_list=False):
             This function can encode some dtypes using a binary encoding, but
             setting this argument to True will override that and cause only
             standard Python lists to be emitted. (default: False)
+        buffers (list, optional) :
+            If binary buffers are desired, the buffers parameter may be
+            provided, and any columns that may be sent as binary buffers
+            will be added to the list. If None, then only base64 encoding
+            will be used (default: None)
 
     Returns:
         list or dict
@@ -276,24 +376,39 @@ def serialize_array(array, force_list=False):
         return transform_array_to_list(array)
     if not array.flags['C_CONTIGUOUS']:
         array = np.ascontiguousarray(array)
-    return encode_base64_dict(array)
+    if buffers is None:
+        return encode_base64_dict(array)
+    else:
+        return encode_binary_dict(array, buffers)
 
-def traverse_data(obj, use_numpy=True):
+def traverse_data(obj, use_numpy=True, buffers=None):
     ''' Recursively traverse an object until a flat list is found.
 
     If NumPy is available, the flat list is converted to a numpy array
     and passed to transform_array() to handle ``nan``, ``inf``, and
     ``-inf``.
 
+    Lists (and rectangular nested lists) of numbers are also converted to
+    NumPy arrays, so that ``nan``, ``inf``, and ``-inf`` are found without
+    looking at every item in Python.
+
     Otherwise, iterate through all items, converting non-JSON items
 
     Args:
         obj (list) : a list of values or lists
         use_numpy (bool, optional) toggle NumPy as a dependency for testing
             This argument is only useful for testing (default: True)
+        buffers (list, optional) :
+            If binary buffers are desired, the buffers parameter may be
+            provided, and any lists of arrays that may be sent as binary
+            buffers will be added to the list. (default: None)
     '''
     if use_numpy and all(isinstance(el, np.ndarray) for el in obj):
-        return [transform_array(el) for el in obj]
+        return [transform_array(el, buffers=buffers) for el in obj]
+    if use_numpy:
+        array = _numeric_list_array(obj)
+        if array is not None:
+            return transform_array_to_list(array)
     obj_copy = []
     for item in obj:
         # Check the base/common case first for performance reasons
@@ -308,17 +423,23 @@ def traverse_data(obj, use_numpy=True):
                     item = '-Infinity'
             obj_copy.append(item)
         elif isinstance(item, (list, tuple)):  # check less common type second
-            obj_copy.append(traverse_data(item))
+            obj_copy.append(traverse_data(item, use_numpy=use_numpy))
         else:
             obj_copy.append(item)
     return obj_copy
 
-def transform_column_source_data(data):
+def transform_column_source_data(data, buffers=None):
     ''' Transform ColumnSourceData data to a serialized format
 
     Args:
         data (dict) : the mapping of names to data columns to transform
 
+        buffers (list, optional) :
+            If binary buffers are desired, the buffers parameter may be
+            provided, and any columns that may be sent as binary buffers
+            will be added to the list. If None, then only base64 encoding
+            will be used (default: None)
+
     Returns:
         JSON compatible dict
 
@@ -326,13 +447,230 @@ def transform_column_source_data(data):
     data_copy = {}
     for key in iterkeys(data):
         if pd and isinstance(data[key], (pd.Series, pd.Index)):
-            data_copy[key] = transform_series(data[key])
+            data_copy[key] = transform_series(data[key], buffers=buffers)
         elif isinstance(data[key], np.ndarray):
-            data_copy[key] = transform_array(data[key])
+            data_copy[key] = transform_array(data[key], buffers=buffers)
+        elif isinstance(data[key], RingBuffer):
+            data_copy[key] = transform_array(data[key].array, buffers=buffers)
         else:
-            data_copy[key] = traverse_data(data[key])
+            ragged = ragged_list_arrays(data[key])
+            if ragged is not None:
+                data_copy[key] = encode_ragged_dict(*ragged, buffers=buffers)
+            else:
+                data_copy[key] = traverse_data(data[key], buffers=buffers)
     return data_copy
 
+def ragged_list_arrays(obj):
+    ''' Flatten a list of lists of numbers, such as the ``xs`` column of
+    a ``patches`` glyph, or a list of NumPy arrays, such as the ``image``
+    column of an ``image`` glyph, into an array of all the values and an
+    array of offsets into it.
+
+    The lists may have different lengths. The values of the ``i``-th list
+    are ``values[offsets[i]:offsets[i+1]]``.
+
+    Args:
+        obj (list) : a list of lists of numbers, or of arrays of one dtype
+
+    Returns:
+        tuple(np.ndarray, np.ndarray, list) or None :
+            the values, the offsets and the shapes of the arrays (None for
+            lists), or None if obj is anything else
+
+    '''
+    if not isinstance(obj, (list, tuple)) or len(obj) == 0:
+        return None
+
+    if all(isinstance(item, np.ndarray) for item in obj):
+        return _ragged_ndarrays(obj)
+
+    if not all(isinstance(item, (list, tuple)) for item in obj):
+        return None
+
+    values = _numeric_list_array(list(chain.from_iterable(obj)))
+    if values is None or values.ndim != 1 or len(values) >= 2**31:
+        return None
+
+    # integers are sent as float64, like the numbers of the lists in BokehJS
+    # (see _binary_integer_array), so they are only sent this way if that is
+    # exact. They keep their integer dtype, and are decoded as integers.
+    if values.dtype.kind in ('i', 'u') and _binary_integer_array(values).dtype != np.float64:
+        return None
+
+    offsets = np.zeros(len(obj) + 1, dtype=np.int32)
+    np.cumsum([len(item) for item in obj], out=offsets[1:])
+
+    return values, offsets, None
+
+def _ragged_ndarrays(obj):
+    dtype = obj[0].dtype
+    if dtype.kind not in ('i', 'u', 'f', 'b', 'M', 'm'):
+        return None
+    if any(item.dtype != dtype or isinstance(item, np.ma.MaskedArray) for item in obj):
+        return None
+
+    sizes = [item.size for item in obj]
+    if sum(sizes) >= 2**31:
+        return None
+
+    values = np.concatenate([item.ravel() for item in obj])
+    offsets = np.zeros(len(obj) + 1, dtype=np.int32)
+    np.cumsum(sizes, out=offsets[1:])
+
+    return values, offsets, [item.shape for item in obj]
+
+def encode_ragged_dict(values, offsets, shapes=None, buffers=None):
+    ''' Encode a ragged list from its values and offsets arrays (see
+    :func:`ragged_list_arrays`)
+
+    The encoded format is a dict with the following structure:
+
+    .. code:: python
+
+        {
+            '__ragged__' : << encoded values array >>,
+            'offsets'    : << encoded offsets array >>,
+            'shapes'     : << shapes of the arrays (only for lists of arrays) >>,
+        }
+
+    Args:
+        values (np.ndarray) : the values of all the lists
+
+        offsets (np.ndarray) : the offsets of the lists in values, and the
+            total number of values
+
+        shapes (list, optional) : the shape of each array, if the ragged
+            list is a list of arrays (default: None)
+
+        buffers (list, optional) :
+            If binary buffers are desired, the buffers parameter may be
+            provided, and the arrays will be added to the list. If None,
+            then only base64 encoding will be used (default: None)
+
+    Returns:
+        dict
+
+    '''
+    result = {
+        '__ragged__' : transform_array(values, buffers=buffers),
+        'offsets'    : serialize_array(offsets, buffers=buffers),
+    }
+    if shapes is not None:
+        result['shapes'] = [list(shape) for shape in shapes]
+    return result
+
+def decode_ragged_dict(data):
+    ''' Decode an encoded ragged list into a list of lists, or a list of
+    NumPy arrays if it was encoded from one.
+
+    Args:
+        data (dict) : encoded ragged list to decode
+
+    Data should have the format encoded by :func:`encode_ragged_dict`.
+    Its arrays may be base64 encoded, or already decoded from binary
+    buffers.
+
+    Returns:
+        list
+
+    '''
+    values = _decode_array(data['__ragged__'])
+    offsets = _decode_array(data['offsets']).tolist()
+    spans = zip(offsets[:-1], offsets[1:])
+    if 'shapes' in data:
+        return [values[start:end].reshape(shape) for (start, end), shape in zip(spans, data['shapes'])]
+    values = values.tolist()
+    return [values[start:end] for start, end in spans]
+
+def _decode_array(data):
+    if isinstance(data, dict) and '__ndarray__' in data:
+        return decode_base64_dict(data)
+    return np.asarray(data)
+
+def encode_binary_dict(array, buffers):
+    ''' Send a numpy array as an unencoded binary buffer
+
+    The encoded format is a dict with the following structure:
+
+    .. code:: python
+
+        {
+            '__buffer__' :  << an ID to locate the buffer >>,
+            'shape'      : << array shape >>,
+            'dtype'      : << dtype name >>,
+            'order'      : << byte order at origin (little or big)>>
+        }
+
+    Args:
+        array (np.ndarray) : an array to encode
+
+        buffers (list) :
+            List to add buffers to
+
+            **This is an "out" parameter**. The values it contains will be
+            modified in-place. Each item appended is a ``(header, payload)``
+            tuple, where ``header`` is a dict ``{'id': << buffer ID >>}`` and
+            ``payload`` is a ``memoryview`` of the array data. No copy of the
+            array data is made, so the array should not be modified in-place
+            until the buffers have been sent.
+
+    Returns:
+        dict
+
+    '''
+    buffer_id = make_id()
+    buf = (dict(id=buffer_id), memoryview(array))
+    buffers.append(buf)
+
+    return {
+        '__buffer__'  : buffer_id,
+        'shape'       : array.shape,
+        'dtype'       : array.dtype.name,
+        'order'       : sys.byteorder
+    }
+
+def decode_binary_dict(data, buffers):
+    ''' Decode a binary buffer reference into a NumPy array.
+
+    Args:
+        data (dict) : encoded array data to decode
+
+        buffers (dict) : a mapping of buffer IDs to binary payloads
+
+    Data should have the format encoded by :func:`encode_binary_dict`.
+
+    The array is a view of the buffer if the buffer is writeable (e.g. the
+    ``bytearray`` buffers of messages received by the server or client),
+    and a copy otherwise (e.g. ``bytes``), so that it can be changed in
+    place like any other column. If the data has an ``original_dtype``, the
+    array is converted to it, which copies it unless it is a bool array.
+
+    Returns:
+        np.ndarray
+
+    '''
+    buffer_id = data['__buffer__']
+    if buffer_id not in buffers:
+        raise ValueError("binary buffer %r was not received" % buffer_id)
+    array = np.frombuffer(buffers[buffer_id], dtype=data['dtype'])
+    if data.get('order', sys.byteorder) != sys.byteorder:
+        array = array.byteswap()
+    if 'original_dtype' in data:
+        array = _original_dtype_array(array, data['original_dtype'])
+    if not array.flags.writeable:
+        array = array.copy()
+    if len(data['shape']) > 1:
+        array = array.reshape(data['shape'])
+    return array
+
+def _original_dtype_array(array, dtype):
+    dtype = np.dtype(dtype)
+    if dtype == np.bool_ and array.dtype == np.uint8:
+        # BokehJS sends bool arrays as uint8 0s and 1s, which are the same
+        # bytes as NumPy bools
+        return array.view(dtype)
+    return array.astype(dtype)
+
 def encode_base64_dict(array):
     ''' Encode a NumPy array using base64:
 
@@ -367,13 +705,22 @@ def decode_base64_dict(data):
         data (dict) : encoded array data to decode
 
     Data should have the format encoded by :func:`encode_base64_dict`.
+    If it has an ``original_dtype``, the array is converted to it.
+
+    The base64 data is decoded to immutable bytes, so unlike arrays decoded
+    from binary buffers, the array is always a copy of them, so that it
+    can be changed in place like any other column.
 
     Returns:
         np.ndarray
 
     '''
     b64 = base64.b64decode(data['__ndarray__'])
-    array = np.fromstring(b64, dtype=data['dtype'])
+    array = np.frombuffer(b64, dtype=data['dtype'])
+    if 'original_dtype' in data:
+        array = _original_dtype_array(array, data['original_dtype'])
+    if not array.flags.writeable:
+        array = array.copy()
     if len(data['shape']) > 1:
         array = array.reshape(data['shape'])
     return array
@@ -206,6 +206,117 @@ def test_property_trigger_with_two_callbacks():
     assert good2.last_old == 42
     assert good2.last_new == 43
 
+class _SessionDocument(object):
+    ''' Stands in for the document of a Bokeh server session, and runs
+    timeout callbacks when told to.
+
+    '''
+    session_context = object()
+
+    def __init__(self):
+        self.timeouts = []
+
+    def add_timeout_callback(self, callback, timeout_milliseconds):
+        self.timeouts.append((callback, timeout_milliseconds))
+        return callback
+
+    def remove_timeout_callback(self, callback):
+        self.timeouts = [t for t in self.timeouts if t[0] != callback]
+
+    def run_timeouts(self):
+        timeouts, self.timeouts = self.timeouts, []
+        for callback, timeout in timeouts:
+            callback()
+
+class _Changes(object):
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, attr, old, new):
+        self.calls.append((attr, old, new))
+
+def _delayed_manager(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(cbm, '_now', lambda: clock[0])
+    m = cbm.PropertyCallbackManager()
+    m.document = _SessionDocument()
+    return m, clock
+
+def test_property_on_change_debounce_and_throttle():
+    m = cbm.PropertyCallbackManager()
+    with pytest.raises(ValueError):
+        m.on_change('foo', _good_property, debounce=100, throttle=100)
+    with pytest.raises(ValueError):
+        m.on_change('foo', _good_property, debounce=0)
+    with pytest.raises(TypeError):
+        m.on_change('foo', _good_property, delay=100)
+    with pytest.raises(ValueError):
+        m.on_change('foo', _bad_property, debounce=100)
+    assert m._callbacks['foo'] == []
+
+def test_property_on_change_debounce(monkeypatch):
+    m, clock = _delayed_manager(monkeypatch)
+    changes = _Changes()
+    m.on_change('foo', changes, debounce=100)
+    m.trigger('foo', 1, 2)
+    m.trigger('foo', 2, 3)
+    assert changes.calls == []
+    assert [t[1] for t in m.document.timeouts] == [100]
+
+    # another change was made 50ms later, so wait for another 50ms
+    clock[0] = 0.05
+    m.trigger('foo', 3, 4)
+    clock[0] = 0.1
+    m.document.run_timeouts()
+    assert changes.calls == []
+    assert [t[1] for t in m.document.timeouts] == [pytest.approx(50)]
+
+    clock[0] = 0.15
+    m.document.run_timeouts()
+    assert changes.calls == [('foo', 1, 4)]
+    assert m.document.timeouts == []
+
+def test_property_on_change_throttle(monkeypatch):
+    m, clock = _delayed_manager(monkeypatch)
+    changes = _Changes()
+    m.on_change('foo', changes, throttle=100)
+    m.trigger('foo', 1, 2)
+    assert changes.calls == [('foo', 1, 2)]
+    m.trigger('foo', 2, 3)
+    m.trigger('foo', 3, 4)
+    assert changes.calls == [('foo', 1, 2)]
+
+    m.document.run_timeouts()
+    assert changes.calls == [('foo', 1, 2), ('foo', 2, 4)]
+    assert len(m.document.timeouts) == 1
+
+    # no change in the last interval, so the next one is called immediately
+    m.document.run_timeouts()
+    assert m.document.timeouts == []
+    m.trigger('foo', 4, 5)
+    assert changes.calls == [('foo', 1, 2), ('foo', 2, 4), ('foo', 4, 5)]
+
+def test_property_on_change_debounce_without_session():
+    m = cbm.PropertyCallbackManager()
+    changes = _Changes()
+    m.on_change('foo', changes, debounce=100)
+    m.trigger('foo', 1, 2)
+    m.trigger('foo', 2, 3)
+    assert changes.calls == [('foo', 1, 2), ('foo', 2, 3)]
+
+def test_property_remove_on_change_debounce(monkeypatch):
+    m, clock = _delayed_manager(monkeypatch)
+    changes = _Changes()
+    m.on_change('foo', changes, debounce=100)
+    m.on_change('foo', changes)
+    assert len(m._callbacks['foo']) == 1
+    m.trigger('foo', 1, 2)
+    m.remove_on_change('foo', changes)
+    assert m._callbacks['foo'] == []
+    assert m.document.timeouts == []
+    assert changes.calls == []
+
 # Tests for the EventCallbackManager
 
 class _GoodEventCallback(object):
@@ -85,3 +85,65 @@ def test__detect_nodejs_calls_wait():
     buc._detect_nodejs()
     assert m.wait.called
     buc.Popen = old_Popen
+
+def _mock_nodejs_compile(monkeypatch):
+    m = Mock(side_effect=lambda code, lang, file: buc.AttrDict(code=code.upper(), deps=[]))
+    monkeypatch.setattr(buc, "nodejs_compile", m)
+    monkeypatch.setattr(buc, "_compilation_cache", {})
+    return m
+
+def test__compile_caches_in_memory(monkeypatch):
+    monkeypatch.delenv("BOKEH_COMPILATION_CACHE_DIR", raising=False)
+    m = _mock_nodejs_compile(monkeypatch)
+    impls = [buc.JavaScript("var a;", "a.js"), buc.JavaScript("var b;", "b.js")]
+
+    assert buc._compile(impls) == [dict(code="VAR A;", deps=[]), dict(code="VAR B;", deps=[])]
+    assert m.call_count == 2
+
+    assert buc._compile(impls) == [dict(code="VAR A;", deps=[]), dict(code="VAR B;", deps=[])]
+    assert m.call_count == 2
+
+    npm = Mock()
+    monkeypatch.setattr(buc, "_run_npmjs", npm)
+    monkeypatch.setattr(buc, "_installed_dependencies", set())
+    buc._compile([buc.JavaScript("var a;", "a.js")], [("some-package", "1.0")])
+    assert m.call_count == 3
+    assert npm.call_count == 1
+
+def test__compile_caches_on_disk(monkeypatch, tmpdir):
+    cache_dir = str(tmpdir.join("cache"))
+    monkeypatch.setenv("BOKEH_COMPILATION_CACHE_DIR", cache_dir)
+    m = _mock_nodejs_compile(monkeypatch)
+
+    assert buc._compile([buc.TypeScript("let a", "a.ts")]) == [dict(code="LET A", deps=[])]
+    assert m.call_count == 1
+    assert len(tmpdir.join("cache").listdir()) == 1
+
+    monkeypatch.setattr(buc, "_compilation_cache", {})
+    assert buc._compile([buc.TypeScript("let a", "a.ts")]) == [dict(code="LET A", deps=[])]
+    assert m.call_count == 1
+
+def test__compile_does_not_cache_errors(monkeypatch):
+    monkeypatch.delenv("BOKEH_COMPILATION_CACHE_DIR", raising=False)
+    m = _mock_nodejs_compile(monkeypatch)
+    m.side_effect = lambda code, lang, file: buc.AttrDict(error=dict(text="bad"))
+
+    buc._compile([buc.JavaScript("var a;", "a.js")])
+    buc._compile([buc.JavaScript("var a;", "a.js")])
+    assert m.call_count == 2
+
+def test_bundle_all_models_is_cached(monkeypatch):
+    from bokeh.model import Model
+    m = Mock(return_value="bundle")
+    monkeypatch.setattr(buc, "bundle_models", m)
+    monkeypatch.setattr(buc, "_bundle_cache", {})
+
+    assert buc.bundle_all_models() == "bundle"
+    assert buc.bundle_all_models() == "bundle"
+    assert m.call_count == 1
+
+    class SomeModelInTestCompiler(Model):
+        pass
+
+    assert buc.bundle_all_models() == "bundle"
+    assert m.call_count == 2
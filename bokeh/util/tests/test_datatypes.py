@@ -0,0 +1,58 @@
+from __future__ import absolute_import
+
+import numpy as np
+import pytest
+
+from bokeh.util.datatypes import RingBuffer
+
+def test_ring_buffer_bad_capacity():
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+def test_ring_buffer_initial_data():
+    r = RingBuffer(4, dtype=np.int64, data=[1, 2, 3])
+    assert len(r) == 3
+    assert r.dtype == np.int64
+    assert list(r) == [1, 2, 3]
+    assert np.array_equal(np.asarray(r), [1, 2, 3])
+
+def test_ring_buffer_extend_rollover():
+    r = RingBuffer(5)
+    storage = r._data
+    for i in range(4):
+        r.extend([i, i + 0.5], rollover=5)
+        assert r._data is storage
+    assert list(r) == [1.5, 2, 2.5, 3, 3.5]
+    r.extend(range(10), rollover=5)
+    assert list(r) == [5, 6, 7, 8, 9]
+    assert r.array.flags['C_CONTIGUOUS']
+
+def test_ring_buffer_extend_grows_without_rollover():
+    r = RingBuffer(2)
+    r.extend(range(7))
+    assert list(r) == list(range(7))
+    r.extend([7], rollover=3)
+    assert list(r) == [5, 6, 7]
+
+def test_ring_buffer_views_are_not_modified():
+    r = RingBuffer(3, data=[0, 1, 2])
+    view = r.array
+    for i in range(10):
+        r.extend([i], rollover=3)
+    assert list(view) == [0, 1, 2]
+    assert list(r) == [7, 8, 9]
+
+def test_ring_buffer_setitem():
+    r = RingBuffer(3, data=[0, 1, 2])
+    r[1] = 10
+    r[1:] = [5, 6]
+    assert list(r) == [0, 5, 6]
+    assert r[-1] == 6
+
+def test_ring_buffer_extend_bad_values():
+    rb = RingBuffer(2, data=[1.0])
+    with pytest.raises(ValueError):
+        rb.extend(["x", "y"])
+    with pytest.raises(ValueError):
+        rb.extend([[1.0, 2.0]])
+    assert list(rb) == [1.0]
@@ -1,7 +1,9 @@
 from __future__ import absolute_import
 
 import datetime
+import json
 import base64
+import sys
 
 import pytest
 import numpy as np
@@ -26,7 +28,7 @@ def test_np_consts():
     assert bus.NP_MS_DELTA == np.timedelta64(1, 'ms')
 
 def test_binary_array_types():
-    assert len(bus.BINARY_ARRAY_TYPES) == 8
+    assert len(bus.BINARY_ARRAY_TYPES) == 9
     for typ in [np.dtype(np.float32),
                 np.dtype(np.float64),
                 np.dtype(np.uint8),
@@ -34,7 +36,8 @@ def test_binary_array_types():
                 np.dtype(np.uint16),
                 np.dtype(np.int16),
                 np.dtype(np.uint32),
-                np.dtype(np.int32)]:
+                np.dtype(np.int32),
+                np.dtype(np.bool_)]:
         assert typ in bus.BINARY_ARRAY_TYPES
 
 def test_datetime_types():
@@ -79,6 +82,165 @@ def test_traverse_with_numpy():
 def test_traverse_without_numpy():
     assert bus.traverse_data(testing, False) == expected
 
+def test_traverse_numeric_lists():
+    assert bus.traverse_data([1.5, float('nan'), 3, float('-inf')]) == [1.5, 'NaN', 3.0, '-Infinity']
+    assert bus.traverse_data([[1.5, float('inf')], [2, 3]]) == [[1.5, 'Infinity'], [2.0, 3.0]]
+    assert bus.traverse_data([1, 2, 3]) == [1, 2, 3]
+    assert bus.traverse_data([True, 2.5]) == [True, 2.5]
+    # values that NumPy would convert are kept as they are
+    out = bus.traverse_data([1, True])
+    assert out == [1, True] and type(out[1]) is bool
+    out = bus.traverse_data([[1, 2], [3, True]])
+    assert out == [[1, 2], [3, True]] and type(out[1][1]) is bool
+    out = bus.traverse_data([0.5, np.float32(0.1)])
+    assert type(out[1]) is np.float32
+    assert bus.traverse_data([1.5, 'NaN', None]) == [1.5, 'NaN', None]
+
+def test_transform_array_to_list_nonfinite():
+    a = np.array([[1.5, np.nan], [np.inf, -np.inf]])
+    assert bus.transform_array_to_list(a) == [[1.5, 'NaN'], ['Infinity', '-Infinity']]
+
+def test_ragged_list_arrays():
+    values, offsets, shapes = bus.ragged_list_arrays([[1.5, 2], [], [3, float('nan'), 4]])
+    assert values.dtype == np.float64
+    np.testing.assert_array_equal(values, [1.5, 2, 3, np.nan, 4])
+    assert offsets.tolist() == [0, 2, 2, 5]
+    assert shapes is None
+
+    values, offsets, shapes = bus.ragged_list_arrays([[1, 2], [3]])
+    assert values.dtype.kind == 'i'
+    assert values.tolist() == [1, 2, 3]
+
+    # integers that are not exact as float64 are kept as lists
+    assert bus.ragged_list_arrays([[2**60], [1]]) is None
+
+    values, offsets, shapes = bus.ragged_list_arrays([np.arange(4.0).reshape(2, 2), np.arange(3.0)])
+    assert values.tolist() == [0, 1, 2, 3, 0, 1, 2]
+    assert offsets.tolist() == [0, 4, 7]
+    assert shapes == [(2, 2), (3,)]
+
+    assert bus.ragged_list_arrays([np.arange(2), np.arange(2.0)]) is None
+    assert bus.ragged_list_arrays([np.array(["a"]), np.array(["b"])]) is None
+
+    assert bus.ragged_list_arrays([1, 2]) is None
+    assert bus.ragged_list_arrays([["a"], ["b", "c"]]) is None
+    assert bus.ragged_list_arrays([[1, [2]], [3]]) is None
+    assert bus.ragged_list_arrays([[], []]) is None
+
+def test_encode_decode_ragged_dict():
+    data = [[1.5, 2.0], [], [3.0, 4.0, 5.0]]
+    encoded = bus.encode_ragged_dict(*bus.ragged_list_arrays(data))
+    assert '__ndarray__' in encoded['__ragged__']
+    assert '__ndarray__' in encoded['offsets']
+    assert bus.decode_ragged_dict(encoded) == data
+
+    buffers = []
+    encoded = bus.encode_ragged_dict(*bus.ragged_list_arrays(data), buffers=buffers)
+    assert len(buffers) == 2
+    arrays = dict((header['id'], payload) for header, payload in buffers)
+    encoded = dict((k, bus.decode_binary_dict(v, arrays)) for k, v in encoded.items())
+    assert bus.decode_ragged_dict(encoded) == data
+
+def test_encode_decode_ragged_dict_ints():
+    data = [[1, 2], [], [3]]
+    encoded = bus.encode_ragged_dict(*bus.ragged_list_arrays(data))
+    assert encoded['__ragged__']['dtype'] == 'float64'
+    decoded = bus.decode_ragged_dict(encoded)
+    assert decoded == data
+    assert all(type(x) is int for item in decoded for x in item)
+
+def test_column_data_roundtrip_int_lists():
+    from bokeh.core.properties import ColumnData, Any
+    prop = ColumnData(Any, Any)
+    for data in [[[1, 2], [3]], [[2**60], [1]]]:
+        encoded = prop.serialize_value({'xs': data})
+        decoded = prop.from_json(json.loads(json.dumps(encoded)))
+        assert decoded['xs'] == data
+        assert all(type(x) is int for item in decoded['xs'] for x in item)
+
+def test_encode_decode_ragged_dict_arrays():
+    data = [np.arange(6, dtype=np.int64).reshape(2, 3), np.arange(2, dtype=np.int64)]
+    encoded = bus.encode_ragged_dict(*bus.ragged_list_arrays(data))
+    assert encoded['__ragged__']['dtype'] == 'float64'
+    assert encoded['shapes'] == [[2, 3], [2]]
+    decoded = bus.decode_ragged_dict(encoded)
+    assert len(decoded) == 2
+    for a, aa in zip(data, decoded):
+        assert aa.shape == a.shape
+        assert aa.dtype == a.dtype
+        assert np.array_equal(a, aa)
+
+def test_transform_array_int64():
+    # as float64, so that BokehJS does not truncate other values streamed
+    # to or patched into the column
+    out = bus.transform_array(np.array([1, -2, 3], dtype=np.int64))
+    assert out['dtype'] == 'float64'
+    assert out['original_dtype'] == 'int64'
+    decoded = bus.decode_base64_dict(out)
+    assert decoded.dtype == np.int64
+    assert decoded.tolist() == [1, -2, 3]
+
+    bufs = []
+    out = bus.transform_array(np.array([1, 2**40], dtype=np.uint64), buffers=bufs)
+    assert out['dtype'] == 'float64'
+    assert out['original_dtype'] == 'uint64'
+    decoded = bus.decode_binary_dict(out, {h['id'] : p.tobytes() for h, p in bufs})
+    assert decoded.dtype == np.uint64
+    assert decoded.tolist() == [1, 2**40]
+
+    # values that would lose precision as floats are sent as lists
+    assert bus.transform_array(np.array([1, 2**60], dtype=np.int64)) == [1, 2**60]
+    assert bus.transform_array(np.array([1, 2], dtype=np.int64), force_list=True) == [1, 2]
+
+def test_transform_array_bool():
+    out = bus.transform_array(np.array([True, False, True]))
+    assert out['dtype'] == 'bool'
+    assert 'original_dtype' not in out
+    assert bus.decode_base64_dict(out).tolist() == [True, False, True]
+
+def test_decode_original_dtype():
+    # BokehJS sends bool arrays back as uint8, with their original dtype
+    a = np.array([1, 0, 1], dtype=np.uint8)
+    out = bus.encode_base64_dict(a)
+    out['original_dtype'] = 'bool'
+    decoded = bus.decode_base64_dict(out)
+    assert decoded.dtype == np.bool_
+    assert decoded.tolist() == [True, False, True]
+
+    bufs = []
+    out = bus.encode_binary_dict(a, bufs)
+    out['original_dtype'] = 'bool'
+    decoded = bus.decode_binary_dict(out, {h['id'] : p.tobytes() for h, p in bufs})
+    assert decoded.dtype == np.bool_
+    assert decoded.flags.writeable
+    assert decoded.tolist() == [True, False, True]
+
+    # a view, if the buffer is writeable
+    payload = bytearray(a.tobytes())
+    decoded = bus.decode_binary_dict(out, {bufs[0][0]['id'] : payload})
+    assert decoded.dtype == np.bool_
+    assert np.shares_memory(decoded, np.frombuffer(payload, dtype=np.uint8))
+
+def test_transform_array_datetime():
+    a = np.array(['2016-05-11T00:00:00.5', 'NaT'], dtype='datetime64[ms]')
+    out = bus.transform_array(a)
+    assert out['dtype'] == 'float64'
+    np.testing.assert_array_equal(bus.decode_base64_dict(out), [1462924800500.0, np.nan])
+
+    a = np.array([1500, 'NaT'], dtype='timedelta64[us]')
+    out = bus.transform_array(a)
+    np.testing.assert_array_equal(bus.decode_base64_dict(out), [1.5, np.nan])
+
+def test_transform_column_source_data_ragged():
+    out = bus.transform_column_source_data(dict(xs=[[1.5, 2.0], [3.0]], names=[["a"], ["b"]]))
+    assert '__ragged__' in out['xs']
+    assert out['names'] == [["a"], ["b"]]
+
+    buffers = []
+    out = bus.transform_column_source_data(dict(image=[np.zeros((2, 2)), np.ones((3, 3))]), buffers=buffers)
+    assert out['image']['shapes'] == [[2, 2], [3, 3]]
+    assert len(buffers) == 2
+
 def test_transform_array_force_list_default():
     dt_ok = bus.BINARY_ARRAY_TYPES
     for dt in dt_ok:
@@ -95,10 +257,11 @@ def test_transform_array_force_list_true():
 
 def test_transform_series_force_list_default():
 
-    # default int seems to be int64
+    # default int seems to be int64, which is sent as float64 when exact
     df = pd.Series([1, 3, 5, 6, 8])
     out = bus.transform_series(df)
-    assert isinstance(out, list)
+    assert isinstance(out, dict)
+    assert out['dtype'] == 'float64'
 
     df = pd.Series([1, 3, 5, 6, 8], dtype=np.int32)
     out = bus.transform_series(df)
@@ -204,3 +367,101 @@ def test_encode_decode_roundtrip():
             d = bus.encode_base64_dict(a)
             aa = bus.decode_base64_dict(d)
             assert np.array_equal(a, aa)
+
+def test_encode_binary_dict():
+    for dt in [np.float32, np.float64, np.int32]:
+        for shape in [(12,), (2, 6), (2,2,3)]:
+            a = np.arange(12, dtype=dt).reshape(shape)
+            bufs = []
+            d = bus.encode_binary_dict(a, bufs)
+
+            assert len(bufs) == 1
+            assert bufs[0][0] == dict(id=d['__buffer__'])
+            assert bufs[0][1].tobytes() == a.tobytes()
+
+            assert d['shape'] == a.shape
+            assert d['dtype'] == a.dtype.name
+            assert d['order'] == sys.byteorder
+
+def test_decode_binary_dict():
+    a = np.arange(12, dtype=np.float64).reshape((2, 6))
+    d = {
+        '__buffer__' : 'bufid',
+        'dtype'      : a.dtype.name,
+        'shape'      : a.shape,
+        'order'      : sys.byteorder,
+    }
+    aa = bus.decode_binary_dict(d, {'bufid' : a.tobytes()})
+    assert aa.shape == a.shape
+    assert aa.dtype == a.dtype
+    assert np.array_equal(a, aa)
+
+def test_decode_binary_dict_swaps_byteorder():
+    a = np.arange(12, dtype=np.int32)
+    other = 'big' if sys.byteorder == 'little' else 'little'
+    d = {
+        '__buffer__' : 'bufid',
+        'dtype'      : a.dtype.name,
+        'shape'      : a.shape,
+        'order'      : other,
+    }
+    aa = bus.decode_binary_dict(d, {'bufid' : a.byteswap().tobytes()})
+    assert np.array_equal(a, aa)
+
+def test_decode_binary_dict_missing_buffer():
+    with pytest.raises(ValueError):
+        bus.decode_binary_dict({'__buffer__' : 'bufid', 'dtype' : 'float64', 'shape' : (1,)}, {})
+
+def test_encode_binary_decode_roundtrip():
+    for dt in [np.float32, np.float64, np.int32]:
+        a = np.arange(12, dtype=dt)
+        bufs = []
+        d = bus.encode_binary_dict(a, bufs)
+        aa = bus.decode_binary_dict(d, {h['id'] : p for h, p in bufs})
+        assert np.array_equal(a, aa)
+
+def test_decode_binary_dict_view():
+    a = np.arange(4, dtype=np.float64)
+    bufs = []
+    d = bus.encode_binary_dict(a, bufs)
+    payload = bytearray(a.tobytes())
+    aa = bus.decode_binary_dict(d, {bufs[0][0]['id'] : payload})
+    assert np.shares_memory(aa, np.frombuffer(payload, dtype=np.uint8))
+    assert aa.flags.writeable
+    assert np.array_equal(a, aa)
+
+    # read-only buffers are copied, so that the array can be changed
+    payload = a.tobytes()
+    aa = bus.decode_binary_dict(d, {bufs[0][0]['id'] : payload})
+    assert not np.shares_memory(aa, np.frombuffer(payload, dtype=np.uint8))
+    aa[0] = 10
+    assert aa.tolist() == [10, 1, 2, 3]
+
+    d['order'] = 'big' if sys.byteorder == 'little' else 'little'
+    aa = bus.decode_binary_dict(d, {bufs[0][0]['id'] : a.byteswap().tobytes()})
+    assert np.array_equal(a, aa)
+
+def test_decode_base64_dict_writeable():
+    aa = bus.decode_base64_dict(bus.encode_base64_dict(np.arange(3.0)))
+    aa[0] = 10
+    assert aa.tolist() == [10, 1, 2]
+
+def test_transform_column_source_data_with_buffers():
+    data = {
+        'a' : np.arange(3, dtype=np.float64),
+        'b' : [1, 2, 3],
+        'c' : pd.Series([1.0, 2.0]),
+        'd' : [np.arange(2, dtype=np.int32), np.arange(3, dtype=np.int32)],
+    }
+    bufs = []
+    out = bus.transform_column_source_data(data, buffers=bufs)
+    assert len(bufs) == 4
+    assert '__buffer__' in out['a']
+    assert out['b'] == [1, 2, 3]
+    assert '__buffer__' in out['c']
+    assert '__buffer__' in out['d']['__ragged__']
+    assert '__buffer__' in out['d']['offsets']
+
+def test_transform_column_source_data_without_buffers():
+    out = bus.transform_column_source_data({'a' : np.arange(3, dtype=np.float64)})
+    assert '__ndarray__' in out['a']
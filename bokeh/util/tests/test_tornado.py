@@ -1,9 +1,14 @@
 from __future__ import absolute_import, print_function
 
+import struct
+
+import mock
+import pytest
 from tornado import gen
 from tornado.ioloop import IOLoop
+from tornado.websocket import WebSocketProtocol13
 
-from bokeh.util.tornado import yield_for_all_futures
+from bokeh.util.tornado import write_websocket_message, yield_for_all_futures
 
 @gen.coroutine
 def async_value(value):
@@ -38,3 +43,67 @@ def test__yield_for_all_futures():
     assert 6 == result['value']
 
     loop.close()
+
+def _protocol(compression=True):
+    handler = mock.Mock()
+    protocol = WebSocketProtocol13(handler, compression_options={} if compression else None)
+    if compression:
+        protocol._create_compressors('server', {})
+    return protocol
+
+def _written_frames(protocol):
+    # (RSV1 bit set, i.e. the message is compressed, payload) of each frame
+    frames = []
+    for (data,), _ in protocol.stream.write.call_args_list:
+        data = bytearray(data)
+        length = data[1] & 0x7f
+        offset = 2
+        if length == 126:
+            length, offset = struct.unpack("!H", bytes(data[2:4]))[0], 4
+        frames.append((bool(data[0] & WebSocketProtocol13.RSV1), bytes(data[offset:offset + length])))
+    return frames
+
+def test_write_websocket_message():
+    protocol = _protocol()
+    compressor = protocol._compressor
+    write_websocket_message(protocol, "x" * 10, compression_min_bytes=100)
+    write_websocket_message(protocol, b"x" * 100, binary=True, compression_min_bytes=100)
+    frames = _written_frames(protocol)
+    assert frames[0] == (False, b"x" * 10)
+    assert frames[1][0] is True
+    assert len(frames[1][1]) < 100
+    assert protocol._compressor is compressor
+
+def test_write_websocket_message_restores_compressor_on_error():
+    protocol = _protocol()
+    compressor = protocol._compressor
+    protocol.stream.write.side_effect = IOError()
+    with pytest.raises(IOError):
+        write_websocket_message(protocol, "x", compression_min_bytes=100)
+    assert protocol._compressor is compressor
+
+def test_write_websocket_message_measures_encoded_text():
+    protocol = _protocol()
+    # 60 characters, but 120 bytes
+    write_websocket_message(protocol, u"\u00e9" * 60, compression_min_bytes=100)
+    [(compressed, _)] = _written_frames(protocol)
+    assert compressed
+
+def test_write_websocket_message_without_compression():
+    protocol = _protocol(compression=False)
+    write_websocket_message(protocol, "x", compression_min_bytes=100)
+    write_websocket_message(protocol, "x" * 100, compression_min_bytes=100)
+    assert _written_frames(protocol) == [(False, b"x"), (False, b"x" * 100)]
+
+def test_write_websocket_message_other_protocol():
+    protocol = mock.Mock(_compressor="compressor")
+    write_websocket_message(protocol, "x", compression_min_bytes=100)
+    protocol.write_message.assert_called_once_with("x", False)
+    assert protocol._compressor == "compressor"
+
+def test_write_websocket_message_other_tornado_version():
+    protocol = _protocol()
+    with mock.patch('bokeh.util.tornado._PRIVATE_COMPRESSOR_VERSIONS', ((4, 3), (4, 3))):
+        write_websocket_message(protocol, "x", compression_min_bytes=100)
+    [(compressed, _)] = _written_frames(protocol)
+    assert compressed
@@ -6,7 +6,10 @@ from __future__ import absolute_import, print_function
 import logging
 log = logging.getLogger(__name__)
 
+import tornado
 from tornado import gen
+from tornado.escape import utf8
+from tornado.websocket import WebSocketProtocol13
 
 @gen.coroutine
 def yield_for_all_futures(result):
@@ -32,6 +35,50 @@ def yield_for_all_futures(result):
 
     raise gen.Return(result)
 
+def write_websocket_message(protocol, message, binary=False, compression_min_bytes=0):
+    """ Writes a message with a Tornado websocket protocol object, without
+    per-message compression if the message is shorter than
+    compression_min_bytes.
+
+    Compressing small messages costs more time than it saves bandwidth, and
+    RFC 7692 allows any message to be sent uncompressed (it is then sent
+    without the RSV1 bit, and left out of the compression context).
+
+    Whether a connection uses compression at all is negotiated with the
+    supported Tornado options, but Tornado has no public way to send one
+    message uncompressed. With the Tornado versions known to keep the
+    compressor of a ``WebSocketProtocol13`` in its private ``_compressor``
+    attribute, a small message is written while that attribute is unset.
+    With any other Tornado version or protocol class, all messages are
+    written as usual, i.e. compressed if compression was negotiated.
+    """
+    if compression_min_bytes > 0 and _can_skip_compression(protocol) and \
+       _is_shorter(message, compression_min_bytes):
+        compressor = protocol._compressor
+        protocol._compressor = None
+        try:
+            return protocol.write_message(message, binary)
+        finally:
+            protocol._compressor = compressor
+    return protocol.write_message(message, binary)
+
+# the Tornado versions in which WebSocketProtocol13.write_message compresses
+# the message with self._compressor, if it is set
+_PRIVATE_COMPRESSOR_VERSIONS = ((4, 3), (7, 0))
+
+def _can_skip_compression(protocol):
+    first, last = _PRIVATE_COMPRESSOR_VERSIONS
+    if not first <= tornado.version_info[:2] < last:
+        return False
+    return isinstance(protocol, WebSocketProtocol13) and getattr(protocol, '_compressor', None) is not None
+
+def _is_shorter(message, size):
+    # the length of a text message is a lower bound of the length of its
+    # UTF-8 encoding, so that large messages are not encoded to measure them
+    if len(message) >= size:
+        return False
+    return isinstance(message, bytes) or len(utf8(message)) < size
+
 class _AsyncPeriodic(object):
     """Like ioloop.PeriodicCallback except the 'func' can be async and
         return a Future, and we wait for func to finish each time
@@ -0,0 +1,78 @@
+''' Run the Bokeh benchmarks.
+
+Run all benchmarks from the top of the repository with:
+
+.. code-block:: sh
+
+    python -m tests.benchmarks
+
+Results may be saved, and compared with saved results, e.g. those of the
+previous commit, or the stored baselines in ``tests/benchmarks/baselines``:
+
+.. code-block:: sh
+
+    python -m tests.benchmarks --save before.json
+    python -m tests.benchmarks --compare before.json
+
+When comparing, the exit status is 1 if any benchmark is slower, or uses
+more memory, than the ``--threshold`` ratio allows. Baselines are only
+comparable between runs on the same machine.
+
+'''
+from __future__ import absolute_import, print_function
+
+import argparse
+import importlib
+import sys
+from collections import OrderedDict
+
+from . import runner
+
+BENCHMARK_MODULES = [
+    "bench_serialization",
+    "bench_document",
+    "bench_embed",
+    "bench_server",
+]
+
+def main(argv):
+    parser = argparse.ArgumentParser(prog="python -m tests.benchmarks", description="Run the Bokeh benchmarks")
+    parser.add_argument("-k", dest="pattern", default=None, help="only run benchmarks whose names match this regular expression")
+    parser.add_argument("--save", metavar="PATH", default=None, help="save the results as JSON to this file")
+    parser.add_argument("--compare", metavar="PATH", default=None, help="compare the results with those saved in this file")
+    parser.add_argument("--threshold", type=float, default=1.5, help="ratio to the compared results above which a result is a regression")
+    parser.add_argument("--min-time", type=float, default=0.2, help="minimum time in seconds of each repeat of a benchmark")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repeats of each benchmark")
+    args = parser.parse_args(argv)
+
+    for name in BENCHMARK_MODULES:
+        importlib.import_module("." + name, __package__)
+
+    baseline = runner.load(args.compare) if args.compare else None
+
+    runner.report_header(baseline)
+    results = OrderedDict()
+    for name, func, kwargs in runner.collect(args.pattern):
+        results[name] = runner.measure(func, kwargs, min_time=args.min_time, repeat=args.repeat)
+        runner.report(name, results[name], baseline)
+
+    if args.save:
+        runner.save(results, args.save)
+
+    if baseline is not None:
+        missing = [name for name in results if name not in baseline]
+        if missing:
+            print("\n%d benchmark(s) not compared, missing from %s:" % (len(missing), args.compare))
+            for name in missing:
+                print("  " + name)
+        regressions = runner.compare(results, baseline, args.threshold)
+        if regressions:
+            print("\n%d regression(s) above %sx:" % (len(regressions), args.threshold))
+            for name in regressions:
+                print("  " + name)
+            return 1
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,124 @@
+from __future__ import absolute_import
+
+import numpy as np
+
+from bokeh.document import Document
+from bokeh.layouts import column, row
+from bokeh.model import collect_models
+from bokeh.models import ColumnDataSource, Div, GlyphRenderer
+from bokeh.plotting import figure
+from bokeh.themes import Theme
+
+from .runner import benchmark
+
+def _document(renderers, size):
+    # one plot with the given number of glyph renderers, each with its own
+    # data source of the given size
+    plot = figure()
+    for i in range(renderers):
+        source = ColumnDataSource(data=dict(x=np.random.random(size), y=np.random.random(size)))
+        plot.circle('x', 'y', source=source)
+    doc = Document()
+    doc.add_root(plot)
+    return doc
+
+def _deep_layout(depth):
+    layout = Div(text="leaf")
+    for i in range(depth):
+        layout = (row if i % 2 else column)(layout, Div(text=str(i)))
+    return layout
+
+@benchmark(renderers=[1, 100], size=[10, 100000])
+def document_to_json(renderers, size):
+    doc = _document(renderers, size)
+    return lambda: doc.to_json()
+
+@benchmark(renderers=[1, 100], size=[10, 100000])
+def document_from_json(renderers, size):
+    json = _document(renderers, size).to_json()
+    return lambda: Document.from_json(json)
+
+@benchmark(depth=[10, 200])
+def collect_models_deep(depth):
+    layout = _deep_layout(depth)
+    return lambda: collect_models(layout)
+
+@benchmark(size=[1000, 1000000], rows=[10, 1000])
+def column_data_source_stream(size, rows):
+    doc = _document(1, size)
+    source = doc.select_one(dict(type=ColumnDataSource))
+    new_data = dict(x=np.random.random(rows), y=np.random.random(rows))
+    # the rollover keeps the size of the columns constant
+    return lambda: source.stream(new_data, rollover=size)
+
+@benchmark(size=[1000, 1000000], patches=[10, 1000])
+def column_data_source_patch(size, patches):
+    doc = _document(1, size)
+    source = doc.select_one(dict(type=ColumnDataSource))
+    indices = np.random.randint(0, size, patches).tolist()
+    patch = dict(x=[(i, 0.5) for i in indices])
+    return lambda: source.patch(patch)
+
+@benchmark(renderers=[10, 100])
+def create_json_patch_string(renderers):
+    doc = _document(renderers, 10)
+    events = []
+    def record(event):
+        events.append(event)
+    doc.on_change(record)
+    for renderer in doc.select(dict(type=GlyphRenderer)):
+        renderer.visible = False
+        renderer.glyph.size = 20
+    return lambda: doc.create_json_patch_string(events)
+
+@benchmark(renderers=[10, 100])
+def apply_theme(renderers):
+    doc = _document(renderers, 10)
+    themes = [
+        Theme(json={'attrs': {'Circle': {'size': 20}, 'Plot': {'background_fill_color': 'gray'}}}),
+        Theme(json={'attrs': {'Circle': {'size': 5}, 'Axis': {'major_label_text_font_size': '8pt'}}}),
+    ]
+    def switch_themes():
+        for theme in themes:
+            doc.theme = theme
+    return switch_themes
+
+@benchmark(renderers=[10, 100], batch=[False, True])
+def update_renderers(renderers, batch):
+    # e.g. a callback that changes the same glyph properties several times,
+    # and the patch then sent by a server session
+    doc = _document(renderers, 10)
+    glyphs = [renderer.glyph for renderer in doc.select(dict(type=GlyphRenderer))]
+    events = []
+    def record(event):
+        events.append(event)
+    doc.on_change(record)
+    def update():
+        del events[:]
+        for step in range(10):
+            for glyph in glyphs:
+                glyph.size = step
+                glyph.fill_alpha = step / 10.0
+        doc.create_json_patch_string(events)
+    if batch:
+        return doc.batch()(update)
+    return update
+
+@benchmark(columns=[30], size=[1000, 100000])
+def replace_one_column(columns, size):
+    # e.g. switching the metric shown from a wide source
+    data = dict(("c%d" % i, np.random.random(size)) for i in range(columns))
+    source = ColumnDataSource(data=data)
+    doc = Document()
+    doc.add_root(source)
+    metrics = [np.random.random(size) for i in range(2)]
+    events = []
+    def record(event):
+        events.append(event)
+    doc.on_change(record)
+    def replace():
+        del events[:]
+        for metric in metrics:
+            source.data = dict(data, c0=metric)
+        doc.create_json_patch_string(events, buffers=[])
+    return replace
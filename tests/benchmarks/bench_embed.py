@@ -0,0 +1,28 @@
+from __future__ import absolute_import
+
+import io
+
+import numpy as np
+
+from bokeh.embed import file_html
+from bokeh.models import ColumnDataSource
+from bokeh.plotting import figure
+from bokeh.resources import CDN
+
+from .runner import benchmark
+
+def _plot(size):
+    source = ColumnDataSource(data=dict(x=np.random.random(size), y=np.random.random(size)))
+    plot = figure()
+    plot.circle('x', 'y', source=source)
+    return plot
+
+@benchmark(size=[1000, 1000000])
+def file_html_string(size):
+    plot = _plot(size)
+    return lambda: file_html(plot, CDN, "benchmark")
+
+@benchmark(size=[1000, 1000000])
+def file_html_fileobj(size):
+    plot = _plot(size)
+    return lambda: file_html(plot, CDN, "benchmark", fileobj=io.StringIO())
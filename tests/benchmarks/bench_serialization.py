@@ -0,0 +1,38 @@
+from __future__ import absolute_import
+
+import numpy as np
+
+from bokeh.core.json_encoder import serialize_json
+from bokeh.util.serialization import transform_column_source_data
+
+from .runner import benchmark
+
+def _column(dtype, size):
+    if dtype == "datetime64":
+        return np.arange(size).astype("datetime64[ms]")
+    if dtype == "bool":
+        return np.arange(size) % 2 == 0
+    if dtype == "str":
+        return ["item%d" % i for i in range(size)]
+    if dtype == "list":
+        values = np.random.random(size).tolist()
+        values[::10] = [float("nan")] * len(values[::10])
+        return values
+    if dtype == "ragged":
+        # e.g. the xs of a patches glyph, 10 values per patch
+        return [np.random.random(10).tolist() for _ in range(size // 10)]
+    return np.arange(size).astype(dtype)
+
+@benchmark(dtype=["float64", "int64", "int32", "bool", "datetime64", "str", "list", "ragged"],
+           size=[1000, 1000000],
+           binary=[False, True])
+def transform_column_source_data_column(dtype, size, binary):
+    data = dict(x=_column(dtype, size))
+    if binary:
+        return lambda: transform_column_source_data(data, buffers=[])
+    return lambda: transform_column_source_data(data)
+
+@benchmark(dtype=["float64", "str", "list"], size=[1000, 1000000])
+def serialize_json_column(dtype, size):
+    data = transform_column_source_data(dict(x=_column(dtype, size)))
+    return lambda: serialize_json(data)
@@ -0,0 +1,40 @@
+from __future__ import absolute_import
+
+import numpy as np
+
+from tornado.ioloop import IOLoop
+
+from bokeh.application import Application
+from bokeh.application.handlers import FunctionHandler
+from bokeh.client import pull_session
+from bokeh.models import ColumnDataSource
+from bokeh.plotting import figure
+from bokeh.server.server import Server
+
+from .runner import benchmark
+
+@benchmark(size=[10, 100000])
+def pull_session_round_trip(size):
+    def make_document(doc):
+        source = ColumnDataSource(data=dict(x=np.random.random(size), y=np.random.random(size)))
+        plot = figure()
+        plot.circle('x', 'y', source=source)
+        doc.add_root(plot)
+
+    io_loop = IOLoop()
+    io_loop.make_current()
+    server = Server(Application(FunctionHandler(make_document)), io_loop=io_loop, port=0)
+    server.start()
+    url = "http://localhost:%d/" % server.port
+
+    def round_trip():
+        session = pull_session(url=url, io_loop=io_loop)
+        session.close()
+        session.loop_until_closed()
+
+    try:
+        yield round_trip
+    finally:
+        server.unlisten()
+        server.stop()
+        io_loop.close()
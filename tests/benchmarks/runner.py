@@ -0,0 +1,219 @@
+''' Define, run and compare performance benchmarks.
+
+A benchmark is a function that prepares everything that should not be
+measured, and returns a function without arguments that runs the code
+to measure:
+
+.. code-block:: python
+
+    @benchmark(size=[1000, 1000000])
+    def transform_array(size):
+        array = np.random.random(size)
+        return lambda: bus.transform_array(array)
+
+Benchmarks that need to clean up afterwards, e.g. to stop a server, may
+instead be generators that yield the function to measure once, and clean
+up when they are resumed.
+
+Every combination of the given parameters is a separate benchmark. For
+each of them, the best time per call out of several repeats is reported,
+together with the peak memory allocated by one call (with Python 3).
+
+'''
+from __future__ import absolute_import, division, print_function
+
+import gc
+import inspect
+import itertools
+import json
+import platform
+import re
+import sys
+import time
+from collections import OrderedDict
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+_timer = getattr(time, 'perf_counter', time.time)
+
+_benchmarks = []
+
+def benchmark(**params):
+    ''' Register a benchmark function, to be run with every combination of
+    the given parameter values.
+
+    Args:
+        params (dict[str, list]) : values of the parameters of the function
+
+    '''
+    def decorator(func):
+        _benchmarks.append((func, OrderedDict(sorted(params.items()))))
+        return func
+    return decorator
+
+def collect(pattern=None):
+    ''' Return the registered benchmarks, with their parameters, as a list
+    of ``(name, func, kwargs)`` tuples.
+
+    Args:
+        pattern (str, optional) : a regular expression the names of the
+            benchmarks to return must contain (default: None)
+
+    '''
+    result = []
+    for func, params in _benchmarks:
+        for values in itertools.product(*params.values()):
+            kwargs = OrderedDict(zip(params.keys(), values))
+            name = "%s.%s" % (func.__module__.split(".")[-1], func.__name__)
+            if kwargs:
+                name += "[%s]" % ",".join("%s=%s" % item for item in kwargs.items())
+            if pattern is None or re.search(pattern, name):
+                result.append((name, func, kwargs))
+    return result
+
+def measure(func, kwargs, min_time=0.2, repeat=5):
+    ''' Measure the time and peak memory of one call of the function
+    returned by ``func(**kwargs)``.
+
+    Returns:
+        dict : ``time`` (seconds), ``peak_memory`` (bytes, or None if it
+        cannot be measured) and ``number`` of calls per repeat
+
+    '''
+    prepared = func(**kwargs)
+    stmt = next(prepared) if inspect.isgenerator(prepared) else prepared
+    try:
+        return _measure(stmt, min_time, repeat)
+    finally:
+        if inspect.isgenerator(prepared):
+            prepared.close()
+
+def _measure(stmt, min_time, repeat):
+    peak_memory = None
+    if tracemalloc is not None:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            start, _ = tracemalloc.get_traced_memory()
+            stmt()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        peak_memory = peak - start
+
+    # find how many calls take at least min_time, like timeit does
+    number = 1
+    while True:
+        elapsed = _time(stmt, number)
+        if elapsed >= min_time or number >= 10**6:
+            break
+        number *= 10 if elapsed * 10 < min_time else 2
+
+    best = min([elapsed] + [_time(stmt, number) for _ in range(repeat - 1)])
+    return dict(time=best / number, peak_memory=peak_memory, number=number)
+
+def _time(stmt, number):
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = _timer()
+        for _ in range(number):
+            stmt()
+        end = _timer()
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return end - start
+
+def machine_info():
+    ''' Describe the machine and software the benchmarks run with, to
+    store with the results.
+
+    '''
+    import bokeh
+    import numpy
+    import tornado
+    return OrderedDict([
+        ('bokeh', bokeh.__version__),
+        ('python', platform.python_version()),
+        ('numpy', numpy.__version__),
+        ('tornado', tornado.version),
+        ('platform', platform.platform()),
+        ('processor', platform.processor() or platform.machine()),
+    ])
+
+def save(results, path):
+    ''' Save results, with the machine info, as JSON. '''
+    with open(path, "w") as f:
+        json.dump(OrderedDict([('machine', machine_info()), ('results', results)]), f, indent=2)
+        f.write("\n")
+
+def load(path):
+    ''' Load results saved with :func:`save`. '''
+    with open(path) as f:
+        return json.load(f, object_pairs_hook=OrderedDict)['results']
+
+def compare(results, baseline, threshold=1.5):
+    ''' Compare results with baseline results.
+
+    Args:
+        results (dict) : results by benchmark name
+
+        baseline (dict) : baseline results by benchmark name
+
+        threshold (float, optional) : the ratio of time or peak memory to
+            the baseline above which a result is a regression (default: 1.5)
+
+    Benchmarks that are not in the baseline are not compared.
+
+    Returns:
+        list(str) : the names of the benchmarks that regressed
+
+    '''
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key in ('time', 'peak_memory'):
+            old, new = baseline[name].get(key), result.get(key)
+            if old and new and new / old > threshold:
+                regressions.append(name)
+                break
+    return regressions
+
+def format_time(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return "%.3g%s" % (seconds / scale, unit)
+    return "%.3gns" % (seconds / 1e-9)
+
+def format_memory(size):
+    if size is None:
+        return "-"
+    for unit, scale in (("GB", 2**30), ("MB", 2**20), ("kB", 2**10)):
+        if size >= scale:
+            return "%.3g%s" % (size / scale, unit)
+    return "%dB" % size
+
+def format_ratio(new, old):
+    if not old or not new:
+        return ""
+    return "%.2fx" % (new / old)
+
+def report_header(baseline=None, out=sys.stdout):
+    line = "%-100s %10s %10s" % ("benchmark", "time", "memory")
+    if baseline is not None:
+        line += " %8s %8s" % ("time", "memory")
+    print(line, file=out)
+
+def report(name, result, baseline=None, out=sys.stdout):
+    old = baseline.get(name, {}) if baseline else {}
+    line = "%-100s %10s %10s" % (name, format_time(result['time']), format_memory(result['peak_memory']))
+    if baseline is not None:
+        line += " %8s %8s" % (format_ratio(result['time'], old.get('time')),
+                              format_ratio(result['peak_memory'], old.get('peak_memory')))
+    print(line, file=out)
+    out.flush()